@@ -1,4 +1,16 @@
+import gc
 import os
+import signal
+import tempfile
+from pathlib import Path
+
+from backend.mysite.runtime import (
+    available_cpus,
+    cgroup_memory_limit,
+    current_rss,
+    plan_workers,
+    start_rss_watchdog,
+)
 
 host = os.environ.get("HOST", "0.0.0.0")
 port = os.environ.get("PORT", "80")
@@ -6,4 +18,103 @@ port = os.environ.get("PORT", "80")
 print(f"host: {host}, port: {port}")
 
 bind = f"{host}:{port}"
-workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+
+# SERVER_MODE=asgi serves the ASGI application on uvicorn workers, whose
+# event loop keeps handling requests while async views await the database.
+server_mode = os.environ.get("SERVER_MODE", "wsgi")
+if server_mode == "asgi":
+    wsgi_app = "backend.mysite.asgi:application"
+else:
+    wsgi_app = "backend.mysite.wsgi:application"
+
+
+def env_int(name, scale=1):
+    value = os.environ.get(name)
+    return int(value) * scale if value else None
+
+
+# Size the server from the container's cgroup limits (see nopo.yml runtime).
+# WEB_CONCURRENCY and MAX_WORKER_RSS_MB override the derived values.
+cpus = available_cpus()
+memory_limit = cgroup_memory_limit()
+plan = plan_workers(
+    cpus,
+    memory_limit,
+    server_mode,
+    workers=env_int("WEB_CONCURRENCY"),
+    max_worker_rss=env_int("MAX_WORKER_RSS_MB", scale=1024 * 1024),
+)
+worker_class = plan.worker_class
+workers = plan.workers
+threads = plan.threads
+max_requests = plan.max_requests
+max_requests_jitter = plan.max_requests_jitter
+
+print(
+    f"cpus: {cpus}, memory: {memory_limit or 'unlimited'}, "
+    f"workers: {workers} x {worker_class} ({threads} threads), "
+    f"max worker rss: {plan.max_worker_rss or 'unlimited'}"
+)
+
+# Every worker writes its Prometheus samples to memory-mapped files in this
+# directory, which the metrics endpoint aggregates (backend.mysite.metrics).
+# It has to be set before the application imports prometheus_client.
+metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or tempfile.mkdtemp(
+    prefix="prometheus-"
+)
+os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+
+
+def on_starting(server):
+    # Samples left by a previous run would be added to this one's.
+    for path in Path(metrics_dir).glob("*.db"):
+        path.unlink()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    # Drop the live gauges (in-flight requests, open connections) of the
+    # dead worker; its counters and histograms are kept.
+    multiprocess.mark_process_dead(worker.pid, metrics_dir)
+
+
+# Load the application once in the master so workers share its memory
+# copy-on-write.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+
+def when_ready(server):
+    # Move everything allocated while preloading out of the collector's
+    # reach, so collections in the workers do not touch (and copy) the
+    # pages shared with the master.
+    if preload_app:
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    limit = plan.max_worker_rss
+    if not limit:
+        return
+    if current_rss() > limit:
+        # Recycling would only replace it with another worker of the same
+        # size; warn instead of restarting workers in a loop.
+        worker.log.warning(
+            "Worker %s starts above MAX_WORKER_RSS (%d MiB), not recycling on RSS",
+            worker.pid,
+            limit >> 20,
+        )
+        return
+
+    def recycle(rss):
+        worker.log.info(
+            "Worker %s RSS %d MiB exceeds %d MiB, restarting it gracefully",
+            worker.pid,
+            rss >> 20,
+            limit >> 20,
+        )
+        # TERM is a graceful shutdown for every worker class; the master
+        # replaces the worker once it has finished its in-flight requests.
+        os.kill(worker.pid, signal.SIGTERM)
+
+    start_rss_watchdog(limit, recycle)
@@ -14,6 +14,7 @@ from pathlib import Path
 import os
 from typing import Any, cast
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 from urllib.parse import urlparse
 
 SERVICE_COMMAND = os.environ.get("SERVICE_COMMAND")
@@ -91,6 +92,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Answers health checks before any other middleware runs.
+    "backend.mysite.health.health_check_middleware",
+    # Serves METRICS_PATH and records request metrics, unless METRICS is off.
+    "backend.mysite.metrics.MetricsMiddleware",
+    # Removes itself unless SERVER_TIMING is set.
+    "backend.mysite.timing.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -206,6 +213,33 @@ STATIC_URL = os.environ.get("STATIC_URL", "/static/")
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# API wire formats
+# API_JSON_BACKEND picks the JSON renderer/parser: "orjson" (default) or
+# "stdlib" for DRF's json-module classes; both produce identical bytes.
+# API_MSGPACK=false turns off application/msgpack content negotiation.
+API_JSON_BACKEND = os.environ.get("API_JSON_BACKEND", "orjson")
+_JSON_BACKENDS = {
+    "orjson": (
+        "backend.mysite.renderers.ORJSONRenderer",
+        "backend.mysite.renderers.ORJSONParser",
+    ),
+    "stdlib": (
+        "rest_framework.renderers.JSONRenderer",
+        "rest_framework.parsers.JSONParser",
+    ),
+}
+if API_JSON_BACKEND not in _JSON_BACKENDS:
+    raise ImproperlyConfigured(
+        f"API_JSON_BACKEND must be one of {', '.join(_JSON_BACKENDS)}, "
+        f"not {API_JSON_BACKEND!r}."
+    )
+_JSON_RENDERER, _JSON_PARSER = _JSON_BACKENDS[API_JSON_BACKEND]
+API_MSGPACK = os.environ.get("API_MSGPACK", "true").lower() == "true"
+_MSGPACK_RENDERERS = (
+    ["backend.mysite.renderers.MessagePackRenderer"] if API_MSGPACK else []
+)
+_MSGPACK_PARSERS = ["backend.mysite.renderers.MessagePackParser"] if API_MSGPACK else []
+
 # Django REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
@@ -216,14 +250,145 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
-    "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
-    ],
-    "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
-    ],
+    "DEFAULT_RENDERER_CLASSES": [_JSON_RENDERER, *_MSGPACK_RENDERERS],
+    "DEFAULT_PARSER_CLASSES": [_JSON_PARSER, *_MSGPACK_PARSERS],
 }
 
+# Cache
+# Defaults to a per-process local-memory cache. Set REDIS_URL to share it
+# between workers.
+CACHES: dict[str, dict[str, Any]] = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+if os.environ.get("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["REDIS_URL"],
+    }
+
+# Jinja2
+# Outside DEBUG templates are not re-checked on disk, and their compiled
+# bytecode is cached in JINJA2_BYTECODE_CACHE_DIR, which the build fills with
+# `manage.py compile_templates`. {% cache %} fragments are stored in the
+# JINJA2_FRAGMENT_CACHE_ALIAS cache.
+JINJA2_BYTECODE_CACHE_DIR: Path | None = (
+    None
+    if DEBUG
+    else Path(os.environ.get("JINJA2_BYTECODE_CACHE_DIR", BUILD_DIR / "jinja2"))
+)
+JINJA2_FRAGMENT_CACHE_ALIAS = os.environ.get("JINJA2_FRAGMENT_CACHE_ALIAS", "default")
+
+# Todo response cache
+# Seconds to cache the responses of each read action; 0 disables caching for
+# that action. Any todo write invalidates every entry, so the TTL only bounds
+# how stale is_overdue/overdue can get.
+TODO_RESPONSE_CACHE_ALIAS = os.environ.get("TODO_RESPONSE_CACHE_ALIAS", "default")
+TODO_RESPONSE_CACHE_TTLS = {
+    "list": int(os.environ.get("TODO_CACHE_LIST_TTL", "0")),
+    "retrieve": int(os.environ.get("TODO_CACHE_RETRIEVE_TTL", "0")),
+    "stats": int(os.environ.get("TODO_CACHE_STATS_TTL", "0")),
+    "autocomplete": int(os.environ.get("TODO_CACHE_AUTOCOMPLETE_TTL", "0")),
+}
+# Writes invalidate entries through a generation number kept in the cache. A
+# per-process cache would only invalidate the writing worker's entries, and
+# the other workers would serve stale responses until the TTL ran out.
+if (
+    any(TODO_RESPONSE_CACHE_TTLS.values())
+    and CACHES.get(TODO_RESPONSE_CACHE_ALIAS, {}).get("BACKEND")
+    == "django.core.cache.backends.locmem.LocMemCache"
+):
+    raise ImproperlyConfigured(
+        "TODO_CACHE_*_TTL needs a cache shared by every worker process: set "
+        "REDIS_URL or point TODO_RESPONSE_CACHE_ALIAS at a shared cache."
+    )
+
+# Server mode
+# SERVER_MODE=asgi makes gunicorn run the ASGI application on uvicorn workers
+# (see gunicorn.conf.py) and, unless TODO_ASYNC_VIEWS says otherwise, serves
+# todo list/retrieve/stats with the async views in backend.todo.async_views.
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi")
+TODO_ASYNC_VIEWS = (
+    os.environ.get("TODO_ASYNC_VIEWS", str(SERVER_MODE == "asgi")).lower() == "true"
+)
+
+# Todo fast read path
+# Serialize list and retrieve responses from values() rows with
+# TodoItemRowSerializer instead of TodoItemSerializer. The output is identical.
+TODO_FAST_SERIALIZER = os.environ.get("TODO_FAST_SERIALIZER", "false").lower() == "true"
+
+# Todo full-text search backend
+# Dotted path to a backend.todo.search.SearchBackend subclass. When unset the
+# backend is chosen from the database vendor (tsvector on PostgreSQL, FTS5 on
+# SQLite, substring matching elsewhere).
+TODO_SEARCH_BACKEND = os.environ.get("TODO_SEARCH_BACKEND") or None
+
+# Todo title autocomplete
+# Suggestions are capped at TODO_AUTOCOMPLETE_MAX_LIMIT, queries shorter than
+# TODO_AUTOCOMPLETE_MIN_LENGTH return nothing, and a lookup running past
+# TODO_AUTOCOMPLETE_TIMEOUT_MS is cancelled and answered with no suggestions.
+TODO_AUTOCOMPLETE_LIMIT = int(os.environ.get("TODO_AUTOCOMPLETE_LIMIT", "10"))
+TODO_AUTOCOMPLETE_MAX_LIMIT = int(os.environ.get("TODO_AUTOCOMPLETE_MAX_LIMIT", "25"))
+TODO_AUTOCOMPLETE_MIN_LENGTH = int(os.environ.get("TODO_AUTOCOMPLETE_MIN_LENGTH", "2"))
+TODO_AUTOCOMPLETE_TIMEOUT_MS = int(os.environ.get("TODO_AUTOCOMPLETE_TIMEOUT_MS", "50"))
+
+# Todo bulk endpoints
+# Maximum number of items accepted by one bulk request, and the number of rows
+# written per multi-row statement.
+TODO_BULK_MAX_ITEMS = int(os.environ.get("TODO_BULK_MAX_ITEMS", "10000"))
+TODO_BULK_BATCH_SIZE = int(os.environ.get("TODO_BULK_BATCH_SIZE", "1000"))
+
+# Todo export
+# Rows fetched per server-side cursor round trip and encoded per streamed chunk.
+TODO_EXPORT_CHUNK_SIZE = int(os.environ.get("TODO_EXPORT_CHUNK_SIZE", "2000"))
+
+# Todo import
+# Rows written per COPY/INSERT batch (and so per transaction), and the number
+# of rejected rows reported back in detail.
+TODO_IMPORT_BATCH_SIZE = int(os.environ.get("TODO_IMPORT_BATCH_SIZE", "5000"))
+TODO_IMPORT_MAX_ERRORS = int(os.environ.get("TODO_IMPORT_MAX_ERRORS", "100"))
+
+# Todo archival
+# Completed items removed per batch (and so per transaction) by archive and
+# purge runs, and the seconds the archive_todos command sleeps between batches.
+TODO_ARCHIVE_BATCH_SIZE = int(os.environ.get("TODO_ARCHIVE_BATCH_SIZE", "1000"))
+TODO_ARCHIVE_DELAY = float(os.environ.get("TODO_ARCHIVE_DELAY", "0.1"))
+
+# Metrics
+# Prometheus metrics (backend.mysite.metrics), served at METRICS_PATH and
+# aggregated across gunicorn workers. Off unless METRICS=true; outside DEBUG
+# METRICS_TOKEN must then be set, and scrapes must send
+# "Authorization: Bearer <token>".
+METRICS = os.environ.get("METRICS", "false").lower() == "true"
+METRICS_PATH = os.environ.get("METRICS_PATH", "/__metrics__")
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+if METRICS and not DEBUG and not METRICS_TOKEN:
+    raise ImproperlyConfigured("METRICS requires METRICS_TOKEN when DEBUG is off.")
+
+# Server timing
+# SERVER_TIMING=true adds a Server-Timing header (total, view, db, serialize
+# and render durations, and the query count) to every response and logs the
+# same breakdown; see backend.mysite.timing.
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "false").lower() == "true"
+
+# Health checks
+# /__live__ and /__version__ do no I/O; /__ready__ also checks the database,
+# waiting at most HEALTH_READY_TIMEOUT_MS and reusing the result for
+# HEALTH_READY_CACHE_SECONDS. BUILD_INFO_PATH is written into the image by
+# the build and read once at startup.
+BUILD_INFO_PATH = os.environ.get("BUILD_INFO_PATH", "/build-info.json")
+HEALTH_READY_TIMEOUT_MS = int(os.environ.get("HEALTH_READY_TIMEOUT_MS", "1000"))
+HEALTH_READY_CACHE_SECONDS = float(os.environ.get("HEALTH_READY_CACHE_SECONDS", "2"))
+
+# OpenAPI schema artifact
+# Directory holding openapi.yaml and openapi.json written by the build (see
+# nopo.yml). /api/schema serves them when present and generates the schema
+# per request otherwise; development always generates it.
+API_SCHEMA_DIR: Path | None = (
+    None
+    if IS_DEV_MODE
+    else Path(os.environ.get("API_SCHEMA_DIR", BUILD_DIR / "schema"))
+)
+
 # drf-spectacular settings
 SPECTACULAR_SETTINGS = {
     "TITLE": "API",
@@ -1,17 +1,10 @@
 from django.urls import re_path, include
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-    SpectacularRedocView,
-)
+
+from backend.mysite.schema import redoc, schema, swagger_ui
 
 urlpatterns = [
     re_path(r"^todo/", include("backend.todo.urls")),
-    re_path(r"^schema$", SpectacularAPIView.as_view(), name="schema"),
-    re_path(
-        r"^docs$",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui-no-slash",
-    ),
-    re_path(r"^redoc$", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
+    re_path(r"^schema$", schema, name="schema"),
+    re_path(r"^docs$", swagger_ui, name="swagger-ui-no-slash"),
+    re_path(r"^redoc$", redoc, name="redoc"),
 ]
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class MySiteConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "backend.mysite"
+
+    def ready(self):
+        from pathlib import Path
+
+        from django.conf import settings
+
+        from backend.mysite.health import load_build_info
+
+        # Read the build info once, at startup, rather than on a probe.
+        load_build_info(Path(settings.BUILD_INFO_PATH))
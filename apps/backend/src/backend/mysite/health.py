@@ -0,0 +1,161 @@
+"""
+Health check endpoints.
+
+Probes hit every instance every few seconds, so they are answered by
+``health_check_middleware``, installed first, before sessions, CSRF,
+authentication or URL resolution run:
+
+- ``/__live__`` (liveness) returns a constant response and does no I/O.
+- ``/__ready__`` (readiness) also checks that the database answers. The check
+  runs in a background thread and the probe waits at most
+  ``HEALTH_READY_TIMEOUT_MS`` for it, so a hung database fails the probe
+  instead of hanging it; the result is reused for
+  ``HEALTH_READY_CACHE_SECONDS``.
+- ``/__version__`` returns the build info, read once at startup.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.http import HttpRequest, HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+
+LIVENESS_PATH = "/__live__"
+READINESS_PATH = "/__ready__"
+VERSION_PATH = "/__version__"
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readiness")
+
+
+def json_response(data: dict[str, Any], status: int = 200) -> HttpResponse:
+    """Return an uncacheable JSON response without going through DRF."""
+    response = HttpResponse(
+        json.dumps(data), content_type="application/json", status=status
+    )
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+@cache
+def load_build_info(path: Path) -> bytes | None:
+    """Return the build info file as JSON bytes, or None if there is none."""
+    try:
+        return json.dumps(json.loads(path.read_bytes())).encode()
+    except FileNotFoundError:
+        return None
+
+
+def version_response() -> HttpResponse:
+    """Return the build info written into the image by the build."""
+    build_info = load_build_info(Path(settings.BUILD_INFO_PATH))
+    if build_info is None:
+        return json_response({"detail": "No build info."}, status=404)
+    return HttpResponse(build_info, content_type="application/json")
+
+
+def check_database(alias: str = "default") -> str | None:
+    """
+    Run ``SELECT 1`` on ``alias``; return None or the error.
+
+    Runs on the readiness thread, which serves no requests, so the
+    connection it opens is closed again afterwards rather than left idle
+    for the lifetime of the worker.
+    """
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except DatabaseError as exc:
+        return f"{type(exc).__name__}: {exc}"
+    finally:
+        connection.close()
+    return None
+
+
+class ReadinessCheck:
+    """Database readiness, checked off-thread and cached briefly."""
+
+    def __init__(self, timeout: float, ttl: float) -> None:
+        self.timeout = timeout
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.pending: Future[str | None] | None = None
+        self.result: dict[str, str] = {}
+        self.expires = 0.0
+
+    def __call__(self) -> dict[str, str]:
+        """Return ``{check name: "ok" or error}``."""
+        with self.lock:
+            if time.monotonic() < self.expires:
+                return self.result
+            # Concurrent probes share one check rather than queueing more.
+            if self.pending is None or self.pending.done():
+                self.pending = _executor.submit(check_database)
+            pending = self.pending
+
+        try:
+            error = pending.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            error = f"No answer within {self.timeout * 1000:.0f}ms."
+        result = {"database": error or "ok"}
+        with self.lock:
+            self.result = result
+            self.expires = time.monotonic() + self.ttl
+        return result
+
+    def response(self) -> HttpResponse:
+        """Return 200 when every check passed and 503 otherwise."""
+        checks = self()
+        ready = all(value == "ok" for value in checks.values())
+        return json_response(
+            {"status": "ok" if ready else "unavailable", "checks": checks},
+            status=200 if ready else 503,
+        )
+
+
+@sync_and_async_middleware
+def health_check_middleware(
+    get_response: Callable[[HttpRequest], Any],
+) -> Callable[[HttpRequest], Any]:
+    """Answer health checks before the rest of the middleware runs."""
+    readiness = ReadinessCheck(
+        timeout=settings.HEALTH_READY_TIMEOUT_MS / 1000,
+        ttl=settings.HEALTH_READY_CACHE_SECONDS,
+    )
+    handlers: dict[str, Callable[[], HttpResponse]] = {
+        LIVENESS_PATH: lambda: json_response({"status": "ok"}),
+        VERSION_PATH: version_response,
+    }
+
+    if iscoroutinefunction(get_response):
+
+        async def amiddleware(request: HttpRequest) -> Any:
+            if request.path_info == READINESS_PATH:
+                return await sync_to_async(readiness.response, thread_sensitive=False)()
+            handler = handlers.get(request.path_info)
+            if handler is not None:
+                return handler()
+            return await get_response(request)
+
+        return amiddleware
+
+    def middleware(request: HttpRequest) -> Any:
+        if request.path_info == READINESS_PATH:
+            return readiness.response()
+        handler = handlers.get(request.path_info)
+        if handler is not None:
+            return handler()
+        return get_response(request)
+
+    return middleware
@@ -1,8 +1,11 @@
+from functools import lru_cache
 from urllib.parse import urljoin
 from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
 from django.utils.safestring import mark_safe
 from django.contrib.staticfiles.storage import staticfiles_storage
-from django.urls import reverse
+from django.urls import get_script_prefix, get_urlconf, reverse
 from django_vite.core.tag_generator import TagGenerator
 from django_vite.templatetags.django_vite import (
     vite_asset as _vite_asset,
@@ -10,7 +13,48 @@ from django_vite.templatetags.django_vite import (
     vite_legacy_polyfills,
     vite_legacy_asset,
 )
-from jinja2 import Environment
+from jinja2 import Environment, FileSystemBytecodeCache, nodes
+from jinja2.ext import Extension
+
+
+@lru_cache(maxsize=1024)
+def _cached_url(viewname, args, kwargs, current_app, urlconf, script_prefix):
+    return reverse(
+        viewname,
+        urlconf=urlconf,
+        args=args,
+        kwargs=dict(kwargs),
+        current_app=current_app,
+    )
+
+
+def url(viewname, urlconf=None, args=None, kwargs=None, current_app=None):
+    """
+    Reverse a URL, memoized.
+
+    Templates reverse the same few names on every render. The result only
+    depends on the arguments, the active URLconf and the script prefix, so
+    all of them are part of the cache key.
+    """
+    try:
+        return _cached_url(
+            viewname,
+            tuple(args or ()),
+            tuple(sorted((kwargs or {}).items())),
+            current_app,
+            urlconf or get_urlconf(),
+            get_script_prefix(),
+        )
+    except TypeError:
+        # Unhashable arguments: reverse without the cache.
+        return reverse(
+            viewname, urlconf=urlconf, args=args, kwargs=kwargs, current_app=current_app
+        )
+
+
+@lru_cache(maxsize=256)
+def _cached_vite_asset(name, args, kwargs):
+    return _vite_asset(name, *args, **dict(kwargs))
 
 
 def vite_asset(name, *args, **kwargs):
@@ -18,7 +62,8 @@ def vite_asset(name, *args, **kwargs):
     Get the Vite asset URL for a given name.
 
     This function is a wrapper around the `vite_asset` template tag to be used
-    in Jinja2 templates.
+    in Jinja2 templates. Outside dev mode the manifest is fixed for the life of
+    the process, so the generated tags are memoized.
     """
     django_vite = settings.DJANGO_VITE["default"]
     if django_vite["dev_mode"]:
@@ -32,7 +77,62 @@ def vite_asset(name, *args, **kwargs):
             )
         )
 
-    return _vite_asset(name, *args, **kwargs)
+    return _cached_vite_asset(name, args, tuple(sorted(kwargs.items())))
+
+
+class FragmentCacheExtension(Extension):
+    """
+    Cache a rendered template fragment in Django's cache.
+
+    The Jinja2 counterpart of Django's ``{% cache %}`` tag, with the same
+    arguments and cache keys, so ``make_template_fragment_key`` can be used to
+    invalidate a fragment::
+
+        {% cache 300, "home_user_info", user.pk %}...{% endcache %}
+
+    A timeout of ``None`` caches the fragment forever. The cache is
+    ``JINJA2_FRAGMENT_CACHE_ALIAS``.
+    """
+
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        parser.stream.expect("comma")
+        args.append(parser.parse_expression())
+        vary_on = []
+        while parser.stream.skip_if("comma"):
+            vary_on.append(parser.parse_expression())
+        args.append(nodes.List(vary_on))
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method("_cache", args), [], [], body
+        ).set_lineno(lineno)
+
+    def _cache(self, timeout, fragment_name, vary_on, caller):
+        cache = caches[settings.JINJA2_FRAGMENT_CACHE_ALIAS]
+        key = make_template_fragment_key(fragment_name, vary_on)
+        value = cache.get(key)
+        if value is None:
+            value = caller()
+            cache.set(key, value, timeout)
+        return value
+
+
+class BuildBytecodeCache(FileSystemBytecodeCache):
+    """
+    Bytecode cache filled at build time by ``manage.py compile_templates``.
+
+    The build directory may be read-only at runtime; a template that cannot
+    be written back is simply compiled again by the next process.
+    """
+
+    def dump_bytecode(self, bucket):
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
 
 
 def environment(**options):
@@ -40,17 +140,26 @@ def environment(**options):
     Create and configure a Jinja2 environment for Django.
 
     This function provides Django-specific functionality to Jinja2 templates
-    including access to static files and URL reversing.
+    including access to static files and URL reversing. Templates are only
+    checked for changes on disk when ``DEBUG`` is on (Django's default for
+    ``auto_reload``), and compiled templates are cached in
+    ``JINJA2_BYTECODE_CACHE_DIR`` when it is set.
     """
+    bytecode_cache = None
+    if settings.JINJA2_BYTECODE_CACHE_DIR:
+        bytecode_cache = BuildBytecodeCache(str(settings.JINJA2_BYTECODE_CACHE_DIR))
+
     env = Environment(
         loader=options["loader"],
         autoescape=options["autoescape"],
-        auto_reload=True,
+        auto_reload=options["auto_reload"],
+        bytecode_cache=bytecode_cache,
+        extensions=[FragmentCacheExtension],
     )
     env.globals.update(
         {
             "static": staticfiles_storage.url,
-            "url": reverse,
+            "url": url,
             "vite_asset": vite_asset,
             "vite_hmr_client": vite_hmr_client,
             "vite_legacy_polyfills": vite_legacy_polyfills,
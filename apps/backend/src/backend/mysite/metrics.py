@@ -0,0 +1,240 @@
+"""
+Prometheus metrics.
+
+``MetricsMiddleware`` records request latency per URL name and viewset
+action, in-flight requests and queries per request; an execute wrapper on
+every database connection records query latency; the todo response cache
+counts hits and misses. The middleware serves everything in the Prometheus
+text format at ``METRICS_PATH``, ahead of the rest of the stack.
+
+Under gunicorn each worker is a separate process. ``gunicorn.conf.py`` points
+``PROMETHEUS_MULTIPROC_DIR`` at a directory where every worker's metrics are
+kept in memory-mapped files, and the endpoint aggregates all of them, so a
+scrape sees the whole instance whichever worker answers it.
+"""
+
+import hmac
+import os
+import weakref
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, by URL name and viewset action.",
+    ["view", "action", "method"],
+)
+REQUESTS = Counter(
+    "http_requests",
+    "Requests served, by URL name, viewset action and status code.",
+    ["view", "action", "method", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries run per request, by URL name and viewset action.",
+    ["view", "action"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests being served.",
+    multiprocess_mode="livesum",
+)
+QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Time to execute a database query.",
+    ["alias"],
+    buckets=QUERY_BUCKETS,
+)
+CONNECTIONS_OPENED = Counter(
+    "db_connections_opened",
+    "Database connections opened; persistent connections keep this flat.",
+    ["alias"],
+)
+CONNECTIONS_OPEN = Gauge(
+    "db_connections_open",
+    "Database connections currently open.",
+    ["alias"],
+    multiprocess_mode="livesum",
+)
+RESPONSE_CACHE = Counter(
+    "todo_response_cache_lookups",
+    "Todo response cache lookups, by action and outcome (hits or misses).",
+    ["action", "outcome"],
+)
+
+UNRESOLVED = "<unresolved>"
+# The ``method`` label values; any other method is counted as ``OTHER_METHOD``
+# so clients cannot create series at will.
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+OTHER_METHOD = "other"
+
+# Queries run by the current request, when it is being measured.
+request_queries: ContextVar[list[int] | None] = ContextVar(
+    "request_queries", default=None
+)
+# Every connection wrapper that has connected, to count the open ones.
+_connections: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def observe_query(execute: Any, sql: Any, params: Any, many: bool, context: Any) -> Any:
+    """Database execute wrapper recording query latency."""
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        QUERY_LATENCY.labels(context["connection"].alias).observe(
+            perf_counter() - start
+        )
+        queries = request_queries.get()
+        if queries is not None:
+            queries[0] += 1
+
+
+def instrument_connection(connection: Any) -> None:
+    """Install ``observe_query`` on ``connection`` and track whether it is open."""
+    _connections.add(connection)
+    if observe_query not in connection.execute_wrappers:
+        # Outermost: execute_wrapper() blocks pop the innermost wrapper on exit.
+        connection.execute_wrappers.insert(0, observe_query)
+
+
+def connection_opened(sender: Any, connection: Any, **kwargs: Any) -> None:
+    """``connection_created`` receiver."""
+    CONNECTIONS_OPENED.labels(connection.alias).inc()
+    instrument_connection(connection)
+
+
+def update_connection_gauge() -> None:
+    """Set ``db_connections_open`` from this process's connection wrappers."""
+    open_connections = dict.fromkeys(settings.DATABASES, 0)
+    for connection in list(_connections):
+        if connection.connection is not None:
+            open_connections[connection.alias] += 1
+    for alias, count in open_connections.items():
+        CONNECTIONS_OPEN.labels(alias).set(count)
+
+
+def record_cache_lookup(action: str, outcome: str) -> None:
+    """Count a todo response cache ``"hits"`` or ``"misses"`` outcome."""
+    if not settings.METRICS:
+        return
+    RESPONSE_CACHE.labels(action, outcome).inc()
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Return the registry to expose: every worker's, under gunicorn."""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        return REGISTRY
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry, path=path)
+    return registry
+
+
+def metrics_response(request: HttpRequest) -> HttpResponse:
+    """Render the metrics, if the request carries ``METRICS_TOKEN``."""
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            return HttpResponse(status=401)
+    update_connection_gauge()
+    response = HttpResponse(
+        generate_latest(metrics_registry()), content_type=CONTENT_TYPE_LATEST
+    )
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+def request_labels(request: HttpRequest) -> tuple[str, str]:
+    """Return the URL name and viewset action that served ``request``."""
+    match = request.resolver_match
+    if match is None:
+        # Keep 404s from creating a series per probed path.
+        return UNRESOLVED, ""
+    actions = getattr(match.func, "actions", None) or {}
+    return match.view_name, actions.get((request.method or "").lower(), "")
+
+
+class MetricsMiddleware:
+    """Record request metrics and serve ``METRICS_PATH``."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Any) -> None:
+        if not settings.METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        # Connections are per thread; instrument those opened from now on, too.
+        connection_created.connect(connection_opened)
+        for connection in connections.all(initialized_only=True):
+            instrument_connection(connection)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.path_info == settings.METRICS_PATH:
+            return metrics_response(request)
+        started, token = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            IN_FLIGHT.dec()
+            queries = request_queries.get()
+            request_queries.reset(token)
+        return self.finish(request, response, started, queries)
+
+    async def __acall__(self, request: HttpRequest) -> Any:
+        if request.path_info == settings.METRICS_PATH:
+            return metrics_response(request)
+        started, token = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            IN_FLIGHT.dec()
+            queries = request_queries.get()
+            request_queries.reset(token)
+        return self.finish(request, response, started, queries)
+
+    def start(self) -> tuple[float, Any]:
+        IN_FLIGHT.inc()
+        return perf_counter(), request_queries.set([0])
+
+    def finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponseBase,
+        started: float,
+        queries: list[int] | None,
+    ) -> HttpResponseBase:
+        view, action = request_labels(request)
+        method = request.method if request.method in METHODS else OTHER_METHOD
+        REQUEST_LATENCY.labels(view, action, method).observe(perf_counter() - started)
+        REQUESTS.labels(view, action, method, str(response.status_code)).inc()
+        REQUEST_QUERIES.labels(view, action).observe(queries[0] if queries else 0)
+        update_connection_gauge()
+        return response
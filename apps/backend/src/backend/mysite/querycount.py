@@ -0,0 +1,204 @@
+"""
+Query budgets for tests.
+
+``count_queries`` counts the queries run inside a block and the rows they
+returned to Python. ``QueryBudgetMixin`` runs a set of declared scenarios
+(one per endpoint or service method) against the same data seeded at several
+sizes, and fails when a scenario exceeds its budget or when its queries or
+rows fetched change with the size of the table: an N+1 loop or a query that
+loads every row then fails even if it fits the budget at the smallest size.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from django.db import connections, transaction
+
+
+@dataclass
+class QueryCount:
+    """Queries executed and rows fetched."""
+
+    queries: int = 0
+    rows: int = 0
+
+
+class RowCountingCursor:
+    """DB-API cursor proxy adding the rows fetched through it to a count."""
+
+    def __init__(self, cursor: Any, count: QueryCount) -> None:
+        self.cursor = cursor
+        self.count = count
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.cursor, name)
+
+    def __iter__(self) -> Iterator[Any]:
+        for row in self.cursor:
+            self.count.rows += 1
+            yield row
+
+    def fetchone(self) -> Any:
+        row = self.cursor.fetchone()
+        if row is not None:
+            self.count.rows += 1
+        return row
+
+    def fetchmany(self, *args: Any) -> Any:
+        rows = self.cursor.fetchmany(*args)
+        self.count.rows += len(rows)
+        return rows
+
+    def fetchall(self) -> Any:
+        rows = self.cursor.fetchall()
+        self.count.rows += len(rows)
+        return rows
+
+
+@contextmanager
+def count_queries(using: str = "default") -> Iterator[QueryCount]:
+    """Count the queries run on ``using`` inside the block and their rows."""
+    count = QueryCount()
+
+    def counting(execute: Any, sql: Any, params: Any, many: bool, context: Any) -> Any:
+        wrapper = context["cursor"]
+        if not isinstance(wrapper.cursor, RowCountingCursor):
+            wrapper.cursor = RowCountingCursor(wrapper.cursor, count)
+        count.queries += 1
+        return execute(sql, params, many, context)
+
+    with connections[using].execute_wrapper(counting):
+        yield count
+
+
+# A budget figure, or one per database vendor, e.g. ``{"sqlite": 1,
+# "postgresql": 3}``: backends differ in the statements they need for the same
+# work (savepoints, session settings, ``COPY``).
+Count = int | Mapping[str, int]
+
+
+def for_vendor(value: Count, vendor: str) -> int:
+    """Return the figure of ``value`` for ``vendor``."""
+    return value[vendor] if isinstance(value, Mapping) else value
+
+
+@dataclass(frozen=True)
+class Budget:
+    """
+    At most ``queries`` queries returning at most ``rows`` rows.
+
+    ``run`` receives the test case. ``rows=None`` leaves rows unbounded, for
+    scenarios that return every row by design (exports); their query count is
+    still checked.
+
+    Scenarios that work through the table in batches declare how many
+    batches they will run: ``batches`` receives the test case before the
+    scenario runs and returns that number. Each batch may add up to
+    ``batch_queries`` queries and ``batch_rows`` rows to the fixed budget,
+    and what is left once the batches are taken off must still not change
+    with the size of the table.
+
+    Any of the figures may be given per database vendor (see ``Count``).
+    """
+
+    run: Callable[[Any], Any]
+    queries: Count
+    rows: Count | None
+    batches: Callable[[Any], int] | None = None
+    batch_queries: Count = 0
+    batch_rows: Count = 0
+
+
+class QueryBudgetMixin(ABC):
+    """
+    Test case mixin checking ``budgets`` at every dataset size in ``sizes``.
+
+    Subclasses implement ``seed(count)`` to add ``count`` more rows, and
+    declare ``budgets`` as ``{scenario name: Budget}``. Each scenario runs in
+    a savepoint that is rolled back, so writes do not leak into the next, and
+    its on-commit callbacks run (and are counted) as if it had committed.
+    The mixin is meant for ``django.test.TestCase``.
+    """
+
+    sizes: tuple[int, ...] = (100, 400, 1600)
+    budgets: dict[str, Budget] = {}
+
+    @abstractmethod
+    def seed(self, count: int) -> None:
+        """Add ``count`` more rows to the dataset."""
+
+    def prepare(self) -> None:
+        """Hook run after each seeding, e.g. to look up ids used by scenarios."""
+
+    def test_query_budgets(self) -> None:
+        """Test every scenario's queries and rows against its budget."""
+        test: Any = self
+        measured: dict[str, dict[int, QueryCount]] = {name: {} for name in self.budgets}
+        batches: dict[str, dict[int, int]] = {name: {} for name in self.budgets}
+        seeded = 0
+        for size in sorted(self.sizes):
+            with test.captureOnCommitCallbacks(execute=True):
+                self.seed(size - seeded)
+            seeded = size
+            self.prepare()
+            for name, budget in self.budgets.items():
+                with transaction.atomic():
+                    batches[name][size] = budget.batches(self) if budget.batches else 0
+                    # Run the callbacks a commit would, so that work deferred
+                    # until the scenario's writes commit counts too.
+                    with (
+                        count_queries() as count,
+                        test.captureOnCommitCallbacks(execute=True),
+                    ):
+                        budget.run(self)
+                    transaction.set_rollback(True)
+                measured[name][size] = count
+
+        for name, budget in self.budgets.items():
+            with self.subTest(name):  # type: ignore[attr-defined]
+                self.assertWithinBudget(budget, measured[name], batches[name])
+
+    def assertWithinBudget(
+        self,
+        budget: Budget,
+        counts: dict[int, QueryCount],
+        batches: dict[int, int] | None = None,
+    ) -> None:
+        """
+        Assert that ``counts`` fit ``budget`` and do not vary with size.
+
+        ``batches`` holds the number of batches run at each size, for
+        budgets that declare them; the per-batch allowance is taken off each
+        count first.
+        """
+        vendor = connections["default"].vendor
+        batch_queries = for_vendor(budget.batch_queries, vendor)
+        batch_rows = for_vendor(budget.batch_rows, vendor)
+        batches = batches or {}
+        queries = {
+            size: count.queries - batch_queries * batches.get(size, 0)
+            for size, count in counts.items()
+        }
+        rows = {
+            size: count.rows - batch_rows * batches.get(size, 0)
+            for size, count in counts.items()
+        }
+        test: Any = self
+        test.assertLessEqual(
+            max(queries.values()),
+            for_vendor(budget.queries, vendor),
+            f"queries by size: {queries}",
+        )
+        test.assertEqual(
+            len(set(queries.values())), 1, f"queries grow with size: {queries}"
+        )
+        if budget.rows is not None:
+            test.assertLessEqual(
+                max(rows.values()),
+                for_vendor(budget.rows, vendor),
+                f"rows by size: {rows}",
+            )
+            test.assertEqual(len(set(rows.values())), 1, f"rows grow with size: {rows}")
@@ -0,0 +1,172 @@
+"""
+Container resource detection and gunicorn worker planning.
+
+``gunicorn.conf.py`` sizes the server from the CPU and memory limits of the
+container's cgroup rather than from the host, so a 1 CPU / 512Mi instance is
+not over-subscribed and a larger one is fully used. This module is imported
+by the gunicorn master before Django is configured, so it must not import
+Django.
+"""
+
+import math
+import os
+import resource
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# Resident memory of one worker after the application is loaded, used to cap
+# the worker count on small instances. Preloading shares part of it.
+WORKER_MEMORY = 96 * 1024 * 1024
+# Share of the memory limit that workers may use; the rest is left to the
+# master process and the page cache.
+MEMORY_HEADROOM = 0.85
+GTHREAD_THREADS = 4
+MAX_REQUESTS = 2000
+
+
+def read_cgroup_file(root: Path, *names: str) -> str | None:
+    """Return the stripped contents of the first existing cgroup file."""
+    for name in names:
+        try:
+            return (root / name).read_text().strip()
+        except OSError:
+            continue
+    return None
+
+
+def cgroup_cpu_limit(root: Path = CGROUP_ROOT) -> float | None:
+    """
+    Return the CPU quota of the cgroup in CPUs, or None if unlimited.
+
+    Reads ``cpu.max`` (cgroup v2) or ``cpu.cfs_quota_us`` and
+    ``cpu.cfs_period_us`` (cgroup v1).
+    """
+    cpu_max = read_cgroup_file(root, "cpu.max")
+    if cpu_max is not None:
+        quota, _, period = cpu_max.partition(" ")
+        if quota == "max":
+            return None
+        return int(quota) / int(period or 100000)
+
+    cfs_quota = read_cgroup_file(root, "cpu/cpu.cfs_quota_us", "cpu.cfs_quota_us")
+    cfs_period = read_cgroup_file(root, "cpu/cpu.cfs_period_us", "cpu.cfs_period_us")
+    if cfs_quota is None or cfs_period is None or int(cfs_quota) <= 0:
+        return None
+    return int(cfs_quota) / int(cfs_period)
+
+
+def cgroup_memory_limit(root: Path = CGROUP_ROOT) -> int | None:
+    """
+    Return the memory limit of the cgroup in bytes, or None if unlimited.
+
+    Reads ``memory.max`` (cgroup v2) or ``memory.limit_in_bytes`` (cgroup
+    v1, where "unlimited" is a value larger than any real machine).
+    """
+    memory_max = read_cgroup_file(root, "memory.max")
+    if memory_max is not None:
+        return None if memory_max == "max" else int(memory_max)
+
+    limit = read_cgroup_file(
+        root, "memory/memory.limit_in_bytes", "memory.limit_in_bytes"
+    )
+    if limit is None or int(limit) >= 1 << 60:
+        return None
+    return int(limit)
+
+
+def available_cpus(root: Path = CGROUP_ROOT) -> int:
+    """Return the whole CPUs this process may use, at least 1."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else 0
+    cpus = cpus or os.cpu_count() or 1
+    quota = cgroup_cpu_limit(root)
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(cpus, 1)
+
+
+def current_rss() -> int:
+    """Return the resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # No procfs (e.g. macOS): fall back to the peak, reported in bytes.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def start_rss_watchdog(
+    limit: int, on_exceeded: Callable[[int], None], interval: float = 5.0
+) -> threading.Thread:
+    """
+    Poll this process's RSS from a daemon thread every ``interval`` seconds.
+
+    ``on_exceeded`` is called once, with the RSS, when it first exceeds
+    ``limit``; the thread then stops.
+    """
+
+    def watch() -> None:
+        while True:
+            rss = current_rss()
+            if rss > limit:
+                on_exceeded(rss)
+                return
+            time.sleep(interval)
+
+    thread = threading.Thread(target=watch, name="rss-watchdog", daemon=True)
+    thread.start()
+    return thread
+
+
+@dataclass(frozen=True)
+class WorkerPlan:
+    """Gunicorn settings derived from the available resources."""
+
+    worker_class: str
+    workers: int
+    threads: int
+    max_requests: int
+    max_requests_jitter: int
+    max_worker_rss: int | None
+
+
+def plan_workers(
+    cpus: int,
+    memory: int | None,
+    server_mode: str = "wsgi",
+    workers: int | None = None,
+    max_worker_rss: int | None = None,
+) -> WorkerPlan:
+    """
+    Size the workers for ``cpus`` CPUs and ``memory`` bytes (None: no limit).
+
+    WSGI uses threaded workers, ``2 * cpus + 1`` of them, so requests waiting
+    on the database do not idle a CPU. ASGI uses one event loop per CPU.
+    Either way the count is capped by what fits in the memory limit, and
+    each worker is recycled when its RSS exceeds its share of the limit.
+    ``workers`` and ``max_worker_rss`` override the derived values.
+    """
+    budget = memory * MEMORY_HEADROOM if memory is not None else None
+    if workers is None:
+        workers = cpus if server_mode == "asgi" else 2 * cpus + 1
+        if budget is not None:
+            workers = min(workers, int(budget // WORKER_MEMORY))
+        workers = max(workers, 1)
+    if max_worker_rss is None and budget is not None:
+        max_worker_rss = int(budget // workers)
+
+    return WorkerPlan(
+        worker_class=(
+            "uvicorn_worker.UvicornWorker" if server_mode == "asgi" else "gthread"
+        ),
+        workers=workers,
+        threads=1 if server_mode == "asgi" else GTHREAD_THREADS,
+        max_requests=MAX_REQUESTS,
+        # Spread restarts so workers are not all recycled at the same time.
+        max_requests_jitter=MAX_REQUESTS // 10,
+        max_worker_rss=max_worker_rss,
+    )
@@ -0,0 +1,171 @@
+"""
+OpenAPI schema and documentation views.
+
+Generating the schema introspects every API view on each request. The build
+writes the schema once instead (``manage.py spectacular``, see ``nopo.yml``)
+to ``API_SCHEMA_DIR``; when those files exist, ``schema`` serves them from
+memory with a strong ETag and a precompressed gzip body, and the schema is
+never regenerated. Without them (in development, or before a build) it falls
+back to drf-spectacular's ``SpectacularAPIView``, imported on first use.
+
+Only the generator and its views are deferred. ``AutoSchema`` and the
+``extend_schema`` decorators on the API views load ``drf_spectacular.openapi``
+and its helpers with the URLconf, in every worker.
+"""
+
+import gzip
+import hashlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cache
+from importlib import import_module
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import conditional_page
+
+# Artifact file, and the media types it is served as, per format. The order
+# is drf-spectacular's renderer order, so negotiation picks the same format.
+SCHEMA_FORMATS = {
+    "yaml": (
+        "openapi.yaml",
+        ("application/vnd.oai.openapi", "application/yaml"),
+    ),
+    "json": (
+        "openapi.json",
+        ("application/vnd.oai.openapi+json", "application/json"),
+    ),
+}
+
+
+@dataclass(frozen=True)
+class SchemaArtifact:
+    """A schema file read into memory, with its gzip encoding and ETag."""
+
+    format: str
+    body: bytes
+    gzipped: bytes
+    etag: str
+
+
+@cache
+def load_artifacts(directory: Path) -> dict[str, SchemaArtifact]:
+    """
+    Read the schema files in ``directory``, once per process.
+
+    Returns an empty dict unless every format has been built.
+    """
+    artifacts = {}
+    for schema_format, (filename, _) in SCHEMA_FORMATS.items():
+        try:
+            body = (directory / filename).read_bytes()
+        except FileNotFoundError:
+            return {}
+        artifacts[schema_format] = SchemaArtifact(
+            format=schema_format,
+            body=body,
+            gzipped=gzip.compress(body, mtime=0),
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        )
+    return artifacts
+
+
+def negotiate(request: HttpRequest) -> tuple[str, str] | None:
+    """
+    Return the ``(format, media type)`` to answer ``request`` with.
+
+    Honours ``?format=`` like DRF's ``URL_FORMAT_OVERRIDE``, then ``Accept``.
+    """
+    requested = request.GET.get("format")
+    if requested:
+        if requested not in SCHEMA_FORMATS:
+            return None
+        return requested, SCHEMA_FORMATS[requested][1][0]
+
+    media_types = [
+        (schema_format, media_type)
+        for schema_format, (_, formats) in SCHEMA_FORMATS.items()
+        for media_type in formats
+    ]
+    preferred = request.get_preferred_type(
+        [media_type for _, media_type in media_types]
+    )
+    for schema_format, media_type in media_types:
+        if media_type == preferred:
+            return schema_format, media_type
+    return None
+
+
+def serve_artifact(
+    request: HttpRequest, artifacts: dict[str, SchemaArtifact]
+) -> HttpResponse:
+    """Answer ``request`` from the prebuilt schema files."""
+    negotiated = negotiate(request)
+    if negotiated is None:
+        return HttpResponse(status=406)
+    schema_format, media_type = negotiated
+    artifact = artifacts[schema_format]
+
+    use_gzip = "gzip" in request.headers.get("Accept-Encoding", "")
+    # Each encoding is a different representation, so it needs its own ETag.
+    etag = artifact.etag[:-1] + '-gzip"' if use_gzip else artifact.etag
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        if schema_format == "yaml":
+            media_type += "; charset=utf-8"
+        response = HttpResponse(
+            artifact.gzipped if use_gzip else artifact.body, content_type=media_type
+        )
+        title = getattr(settings, "SPECTACULAR_SETTINGS", {}).get("TITLE")
+        response["Content-Disposition"] = (
+            f'inline; filename="{title or "schema"}.{schema_format}"'
+        )
+        if use_gzip:
+            response["Content-Encoding"] = "gzip"
+    response["ETag"] = etag
+    patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+    return response
+
+
+def lazy_view(path: str, **initkwargs: Any) -> Callable[..., HttpResponseBase]:
+    """Return a view that imports class-based view ``path`` on first request."""
+
+    @cache
+    def resolve() -> Callable[..., HttpResponseBase]:
+        module, _, name = path.rpartition(".")
+        return getattr(import_module(module), name).as_view(**initkwargs)
+
+    def view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        return resolve()(request, *args, **kwargs)
+
+    return view
+
+
+generate_schema = lazy_view("drf_spectacular.views.SpectacularAPIView")
+
+
+def schema(request: HttpRequest) -> HttpResponseBase:
+    """Serve the OpenAPI schema, from the build artifact when there is one."""
+    if settings.API_SCHEMA_DIR is not None and request.method in ("GET", "HEAD"):
+        artifacts = load_artifacts(Path(settings.API_SCHEMA_DIR))
+        if artifacts:
+            return serve_artifact(request, artifacts)
+    return generate_schema(request)
+
+
+# The documentation pages are small HTML shells that fetch ``schema``; they
+# get ETags and compression from Django's middleware-backed decorators.
+swagger_ui = gzip_page(
+    conditional_page(
+        lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema")
+    )
+)
+redoc = gzip_page(
+    conditional_page(
+        lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema")
+    )
+)
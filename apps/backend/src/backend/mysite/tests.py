@@ -1,9 +1,11 @@
 """Tests for Django settings configuration."""
 
 import os
-from unittest import mock
+from typing import Any
+from unittest import mock, skipUnless
 
-from django.test import TestCase
+from django.conf import settings
+from django.test import TestCase, override_settings
 
 
 class DatabaseConnectionPoolConfigTests(TestCase):
@@ -79,3 +81,797 @@ class DatabaseConnectionPoolConfigTests(TestCase):
         importlib.reload(app_settings)
 
         self.assertTrue(app_settings.DB_CONN_HEALTH_CHECKS)
+
+
+class ResponseCacheConfigTests(TestCase):
+    """Test cases for the todo response cache configuration."""
+
+    def setUp(self) -> None:
+        """Reload the settings with the real environment afterwards."""
+        import importlib
+
+        import settings as app_settings
+
+        self.settings_module = app_settings
+        self.addCleanup(importlib.reload, app_settings)
+
+    def reload(self) -> None:
+        """Re-evaluate the settings module."""
+        import importlib
+
+        importlib.reload(self.settings_module)
+
+    @mock.patch.dict(os.environ, {"TODO_CACHE_LIST_TTL": "60"})
+    def test_ttl_requires_shared_cache(self) -> None:
+        """Test that a TTL is refused with the per-process default cache."""
+        from django.core.exceptions import ImproperlyConfigured
+
+        os.environ.pop("REDIS_URL", None)
+        with self.assertRaises(ImproperlyConfigured):
+            self.reload()
+
+    @mock.patch.dict(
+        os.environ,
+        {"TODO_CACHE_LIST_TTL": "60", "REDIS_URL": "redis://localhost:6379/0"},
+    )
+    def test_ttl_with_redis(self) -> None:
+        """Test that a TTL is accepted with the Redis cache."""
+        self.reload()
+        self.assertEqual(
+            self.settings_module.CACHES["default"]["BACKEND"],
+            "django.core.cache.backends.redis.RedisCache",
+        )
+        self.assertEqual(self.settings_module.TODO_RESPONSE_CACHE_TTLS["list"], 60)
+
+
+class RendererTests(TestCase):
+    """Test cases for the orjson and MessagePack renderers and parsers."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        from datetime import datetime, timedelta, timezone
+        from decimal import Decimal
+        from uuid import UUID
+
+        from django.utils.translation import gettext_lazy
+        from rest_framework.exceptions import ErrorDetail
+
+        self.data = {
+            "aware": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+            "offset": datetime(2024, 5, 1, 12, tzinfo=timezone(timedelta(hours=2))),
+            "naive": datetime(2024, 5, 1, 12, 30),
+            "decimal": Decimal("1.50"),
+            "lazy": gettext_lazy("Not found."),
+            "uuid": UUID("12345678-1234-5678-1234-567812345678"),
+            "errors": {1: [ErrorDetail("Invalid.", code="invalid")]},
+            "text": "caf\u00e9 \u2028\u2029 \U0001f600",
+            "nested": [{"a": None, "b": 1.5, "c": True}],
+        }
+
+    def test_orjson_matches_json_renderer(self) -> None:
+        """Test that ORJSONRenderer produces JSONRenderer's exact bytes."""
+        from rest_framework.renderers import JSONRenderer
+
+        from backend.mysite.renderers import ORJSONRenderer
+
+        self.assertEqual(
+            ORJSONRenderer().render(self.data), JSONRenderer().render(self.data)
+        )
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_orjson_indent_falls_back(self) -> None:
+        """Test that indented output is delegated to JSONRenderer."""
+        from rest_framework.renderers import JSONRenderer
+
+        from backend.mysite.renderers import ORJSONRenderer
+
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            ORJSONRenderer().render(self.data, media_type),
+            JSONRenderer().render(self.data, media_type),
+        )
+
+    def test_orjson_parser(self) -> None:
+        """Test that ORJSONParser parses JSON and rejects invalid input."""
+        from io import BytesIO
+
+        from rest_framework.exceptions import ParseError
+
+        from backend.mysite.renderers import ORJSONParser
+
+        parsed = ORJSONParser().parse(BytesIO(b'{"title": "caf\xc3\xa9", "n": [1]}'))
+        self.assertEqual(parsed, {"title": "café", "n": [1]})
+        for body in (b"{", b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(BytesIO(body))
+
+    def test_msgpack_round_trip(self) -> None:
+        """Test that MessagePack matches the JSON representation."""
+        import json
+        from io import BytesIO
+
+        from rest_framework.exceptions import ParseError
+        from rest_framework.renderers import JSONRenderer
+
+        from backend.mysite.renderers import MessagePackParser, MessagePackRenderer
+
+        data = {key: value for key, value in self.data.items() if key != "errors"}
+        packed = MessagePackRenderer().render(data)
+        self.assertEqual(
+            MessagePackParser().parse(BytesIO(packed)),
+            json.loads(JSONRenderer().render(data)),
+        )
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(BytesIO(packed[:-3]))
+
+    @skipUnless(settings.API_MSGPACK, "MessagePack is disabled")
+    def test_api_content_negotiation(self) -> None:
+        """Test that the API speaks MessagePack when asked to."""
+        import msgpack
+        from rest_framework.test import APIClient
+
+        client = APIClient()
+        response = client.post(
+            "/api/todo/items/",
+            msgpack.packb({"title": "Packed"}),
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content)["title"], "Packed")
+
+        response = client.get("/api/todo/items/")
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.json()["results"][0]["title"], "Packed")
+
+
+class RuntimeTests(TestCase):
+    """Test cases for cgroup detection and gunicorn worker planning."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        import tempfile
+        from pathlib import Path
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+
+    def write(self, name: str, content: str) -> None:
+        """Write a fake cgroup file."""
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content + "\n")
+
+    def test_cgroup_v2_limits(self) -> None:
+        """Test that cpu.max and memory.max are read."""
+        from backend.mysite.runtime import cgroup_cpu_limit, cgroup_memory_limit
+
+        self.write("cpu.max", "150000 100000")
+        self.write("memory.max", str(512 * 1024 * 1024))
+        self.assertEqual(cgroup_cpu_limit(self.root), 1.5)
+        self.assertEqual(cgroup_memory_limit(self.root), 512 * 1024 * 1024)
+
+        self.write("cpu.max", "max 100000")
+        self.write("memory.max", "max")
+        self.assertIsNone(cgroup_cpu_limit(self.root))
+        self.assertIsNone(cgroup_memory_limit(self.root))
+
+    def test_cgroup_v1_limits(self) -> None:
+        """Test that the cgroup v1 CFS quota and memory limit are read."""
+        from backend.mysite.runtime import cgroup_cpu_limit, cgroup_memory_limit
+
+        self.write("cpu/cpu.cfs_quota_us", "50000")
+        self.write("cpu/cpu.cfs_period_us", "100000")
+        self.write("memory/memory.limit_in_bytes", str(2 * 1024**3))
+        self.assertEqual(cgroup_cpu_limit(self.root), 0.5)
+        self.assertEqual(cgroup_memory_limit(self.root), 2 * 1024**3)
+
+        self.write("cpu/cpu.cfs_quota_us", "-1")
+        self.write("memory/memory.limit_in_bytes", "9223372036854771712")
+        self.assertIsNone(cgroup_cpu_limit(self.root))
+        self.assertIsNone(cgroup_memory_limit(self.root))
+
+    def test_no_cgroup(self) -> None:
+        """Test that missing cgroup files mean no limit."""
+        from backend.mysite.runtime import (
+            available_cpus,
+            cgroup_cpu_limit,
+            cgroup_memory_limit,
+        )
+
+        self.assertIsNone(cgroup_cpu_limit(self.root))
+        self.assertIsNone(cgroup_memory_limit(self.root))
+        self.assertGreaterEqual(available_cpus(self.root), 1)
+
+    def test_fractional_quota_rounds_up(self) -> None:
+        """Test that a half-CPU quota still gets one CPU."""
+        from backend.mysite.runtime import available_cpus
+
+        self.write("cpu.max", "50000 100000")
+        self.assertEqual(available_cpus(self.root), 1)
+
+    def test_small_instance_plan(self) -> None:
+        """Test that 1 CPU / 512Mi is capped by memory, not CPU."""
+        from backend.mysite.runtime import plan_workers
+
+        plan = plan_workers(1, 512 * 1024 * 1024)
+        self.assertEqual(plan.worker_class, "gthread")
+        self.assertEqual(plan.workers, 3)
+        self.assertEqual(plan.threads, 4)
+        assert plan.max_worker_rss is not None
+        self.assertLessEqual(plan.workers * plan.max_worker_rss, 512 * 1024 * 1024)
+        self.assertGreater(plan.max_requests_jitter, 0)
+
+        plan = plan_workers(1, 200 * 1024 * 1024)
+        self.assertEqual(plan.workers, 1)
+
+        plan = plan_workers(1, 512 * 1024 * 1024, "asgi")
+        self.assertEqual(plan.worker_class, "uvicorn_worker.UvicornWorker")
+        self.assertEqual(plan.workers, 1)
+
+    def test_large_instance_plan(self) -> None:
+        """Test that a large instance uses every CPU."""
+        from backend.mysite.runtime import plan_workers
+
+        plan = plan_workers(8, 16 * 1024**3)
+        self.assertEqual(plan.workers, 17)
+        plan = plan_workers(8, None, "asgi")
+        self.assertEqual(plan.workers, 8)
+        self.assertIsNone(plan.max_worker_rss)
+
+    def test_overrides(self) -> None:
+        """Test that explicit workers and RSS limits win."""
+        from backend.mysite.runtime import plan_workers
+
+        plan = plan_workers(1, 512 * 1024 * 1024, workers=6, max_worker_rss=123)
+        self.assertEqual(plan.workers, 6)
+        self.assertEqual(plan.max_worker_rss, 123)
+
+    def test_rss_watchdog(self) -> None:
+        """Test that the watchdog reports an RSS above the limit."""
+        from backend.mysite.runtime import current_rss, start_rss_watchdog
+
+        self.assertGreater(current_rss(), 0)
+        reported: list[int] = []
+        start_rss_watchdog(1, reported.append, interval=0.01).join(timeout=5)
+        self.assertEqual(len(reported), 1)
+        self.assertGreater(reported[0], 1)
+
+
+class SchemaArtifactTests(TestCase):
+    """Test cases for serving the prebuilt OpenAPI schema."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        import tempfile
+        from pathlib import Path
+
+        from django.test import override_settings
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = Path(self.tmp.name)
+        (self.directory / "openapi.yaml").write_text("openapi: 3.0.3\n")
+        (self.directory / "openapi.json").write_text('{"openapi": "3.0.3"}')
+        override = override_settings(API_SCHEMA_DIR=self.directory)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_serves_artifact(self) -> None:
+        """Test that the schema is served from the files, not generated."""
+        with mock.patch("backend.mysite.schema.generate_schema") as generate:
+            response = self.client.get("/api/schema")
+            json_response = self.client.get(
+                "/api/schema", headers={"Accept": "application/json"}
+            )
+            format_response = self.client.get("/api/schema?format=json")
+
+        generate.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"openapi: 3.0.3\n")
+        self.assertEqual(
+            response["Content-Type"], "application/vnd.oai.openapi; charset=utf-8"
+        )
+        self.assertEqual(response["Content-Disposition"], 'inline; filename="API.yaml"')
+        self.assertEqual(json_response["Content-Type"], "application/json")
+        self.assertEqual(json_response.content, b'{"openapi": "3.0.3"}')
+        self.assertEqual(format_response.content, b'{"openapi": "3.0.3"}')
+        self.assertNotEqual(response["ETag"], json_response["ETag"])
+
+    def test_serving_artifact_defers_generator(self) -> None:
+        """Test which drf-spectacular modules serving the artifact loads."""
+        import json
+        import subprocess
+        import sys
+
+        script = (
+            "import json, sys, django; django.setup(); "
+            "from django.test import RequestFactory; "
+            "from django.urls import resolve; "
+            "match = resolve('/api/schema'); "
+            "response = match.func(RequestFactory().get('/api/schema')); "
+            "print(json.dumps([response.status_code, sorted(sys.modules)]))"
+        )
+        env = {
+            **os.environ,
+            "API_SCHEMA_DIR": str(self.directory),
+            "SERVICE_COMMAND": "",
+            "DJANGO_SETTINGS_MODULE": "settings",
+            "PYTHONPATH": os.pathsep.join(sys.path),
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        status_code, modules = json.loads(result.stdout.splitlines()[-1])
+
+        self.assertEqual(status_code, 200)
+        self.assertNotIn("drf_spectacular.generators", modules)
+        self.assertNotIn("drf_spectacular.views", modules)
+        # The API views' extend_schema decorators and DEFAULT_SCHEMA_CLASS
+        # load the introspection side with the URLconf regardless.
+        self.assertIn("drf_spectacular.openapi", modules)
+
+    def test_not_modified(self) -> None:
+        """Test that a matching If-None-Match is answered with 304."""
+        etag = self.client.get("/api/schema")["ETag"]
+        response = self.client.get("/api/schema", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_gzip(self) -> None:
+        """Test that gzip-capable clients get the precompressed body."""
+        import gzip
+
+        plain = self.client.get("/api/schema")
+        response = self.client.get("/api/schema", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), b"openapi: 3.0.3\n")
+        self.assertNotEqual(response["ETag"], plain["ETag"])
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_not_acceptable(self) -> None:
+        """Test that an unsupported format is rejected."""
+        response = self.client.get("/api/schema", headers={"Accept": "text/csv"})
+        self.assertEqual(response.status_code, 406)
+
+    def test_falls_back_to_generation(self) -> None:
+        """Test that the schema is generated when no artifact was built."""
+        from django.test import override_settings
+
+        with override_settings(API_SCHEMA_DIR=self.directory / "missing"):
+            response = self.client.get(
+                "/api/schema", headers={"Accept": "application/json"}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("/api/todo/items/", response.json()["paths"])
+
+    def test_docs_pages(self) -> None:
+        """Test that the documentation pages still render, with an ETag."""
+        for url in ("/api/docs", "/api/redoc"):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("ETag", response)
+
+
+class HealthCheckTests(TestCase):
+    """Test cases for the liveness, readiness and version endpoints."""
+
+    def test_liveness_skips_middleware(self) -> None:
+        """Test that liveness answers before any other middleware runs."""
+        response = self.client.get("/__live__")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+        self.assertEqual(response["Cache-Control"], "no-store")
+        # Set by XFrameOptionsMiddleware on every response that reaches it.
+        self.assertNotIn("X-Frame-Options", response)
+
+    def test_liveness_does_no_queries(self) -> None:
+        """Test that liveness does not touch the database."""
+        with self.assertNumQueries(0):
+            self.client.get("/__live__")
+
+    def test_readiness(self) -> None:
+        """Test that readiness checks the database and caches the result."""
+        from backend.mysite import health
+
+        with mock.patch(
+            "backend.mysite.health.check_database", wraps=health.check_database
+        ) as check:
+            first = self.client.get("/__ready__")
+            second = self.client.get("/__ready__")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json(), {"status": "ok", "checks": {"database": "ok"}})
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(check.call_count, 1)
+
+    def test_readiness_closes_its_connection(self) -> None:
+        """Test that the readiness thread does not keep a connection open."""
+        from django.db import connections
+
+        wrapper = type(connections["default"])
+        with mock.patch.object(
+            wrapper, "close", autospec=True, side_effect=wrapper.close
+        ) as close:
+            response = self.client.get("/__ready__")
+        self.assertEqual(response.status_code, 200)
+        close.assert_called_once()
+        self.assertIsNot(close.call_args.args[0], connections["default"])
+
+    def test_readiness_failure(self) -> None:
+        """Test that a failing database check answers 503."""
+        with mock.patch(
+            "backend.mysite.health.check_database",
+            return_value="OperationalError: connection refused",
+        ):
+            response = self.client.get("/__ready__")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "unavailable")
+
+    def test_readiness_timeout(self) -> None:
+        """Test that a hung database check fails the probe within the timeout."""
+        import threading
+
+        from django.test import override_settings
+
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with (
+            override_settings(HEALTH_READY_TIMEOUT_MS=50),
+            mock.patch(
+                "backend.mysite.health.check_database",
+                side_effect=lambda: release.wait(5) and None,
+            ),
+        ):
+            response = self.client.get("/__ready__")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            response.json()["checks"]["database"], "No answer within 50ms."
+        )
+
+    def test_version(self) -> None:
+        """Test that build info is served, and 404s when there is none."""
+        import tempfile
+        from pathlib import Path
+
+        from django.test import override_settings
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "build-info.json"
+            path.write_text('{"version": "1.2.3"}')
+            with override_settings(BUILD_INFO_PATH=str(path)):
+                response = self.client.get("/__version__")
+            with override_settings(BUILD_INFO_PATH=str(path.with_name("missing"))):
+                missing = self.client.get("/__version__")
+        self.assertEqual(response.json(), {"version": "1.2.3"})
+        self.assertEqual(missing.status_code, 404)
+
+    def test_async_middleware(self) -> None:
+        """Test that the middleware also answers under ASGI."""
+        from asgiref.sync import async_to_sync
+        from django.test import RequestFactory
+
+        from backend.mysite.health import health_check_middleware
+
+        async def get_response(request: Any) -> Any:
+            raise AssertionError("Health checks must not reach the view.")
+
+        middleware = health_check_middleware(get_response)
+        factory = RequestFactory()
+        live = async_to_sync(middleware)(factory.get("/__live__"))
+        ready = async_to_sync(middleware)(factory.get("/__ready__"))
+        self.assertEqual(live.status_code, 200)
+        self.assertEqual(ready.status_code, 200)
+
+
+class Jinja2EnvironmentTests(TestCase):
+    """Test cases for the production Jinja2 environment."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        from django.core.cache import cache
+        from django.template import engines
+
+        self.env = engines["jinja2"].env  # type: ignore[attr-defined]
+        cache.clear()
+
+    def test_production_mode(self) -> None:
+        """Test that templates are not re-checked on disk without DEBUG."""
+        from backend.mysite.jinja2 import BuildBytecodeCache
+
+        self.assertFalse(self.env.auto_reload)
+        self.assertIsInstance(self.env.bytecode_cache, BuildBytecodeCache)
+
+    def test_fragment_cache(self) -> None:
+        """Test that {% cache %} fragments are cached per vary-on value."""
+        from django.core.cache import cache
+        from django.core.cache.utils import make_template_fragment_key
+
+        template = self.env.from_string(
+            '{% cache 60, "fragment", owner %}{{ value }}{% endcache %}'
+        )
+        self.assertEqual(template.render(owner=1, value="<a>"), "&lt;a&gt;")
+        self.assertEqual(template.render(owner=1, value="b"), "&lt;a&gt;")
+        self.assertEqual(template.render(owner=2, value="b"), "b")
+
+        cache.delete(make_template_fragment_key("fragment", [1]))
+        self.assertEqual(template.render(owner=1, value="c"), "c")
+
+    def test_url_memoized(self) -> None:
+        """Test that url() returns reverse() results from a cache."""
+        from django.urls import reverse
+
+        from backend.mysite.jinja2 import _cached_url, url
+
+        self.assertEqual(url("schema"), reverse("schema"))
+        hits = _cached_url.cache_info().hits
+        self.assertEqual(url("schema"), reverse("schema"))
+        self.assertEqual(_cached_url.cache_info().hits, hits + 1)
+        self.assertEqual(
+            url("todo:todoitem-detail", kwargs={"pk": 3}), "/api/todo/items/3/"
+        )
+
+    def test_compile_templates(self) -> None:
+        """Test that compile_templates fills the bytecode cache."""
+        import tempfile
+        from io import StringIO
+        from pathlib import Path
+
+        from django.core.management import call_command
+        from django.test import override_settings
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with override_settings(JINJA2_BYTECODE_CACHE_DIR=Path(tmp) / "jinja2"):
+                call_command("compile_templates", stdout=StringIO())
+            compiled = list((Path(tmp) / "jinja2").iterdir())
+        self.assertEqual(len(compiled), len(self.env.list_templates()))
+
+
+@override_settings(METRICS=True)
+class MetricsTests(TestCase):
+    """Test cases for the Prometheus metrics endpoint."""
+
+    def sample(self, name: str, **labels: str) -> float:
+        """Return the current value of a sample, 0 if it does not exist yet."""
+        from prometheus_client import REGISTRY
+
+        return REGISTRY.get_sample_value(name, labels) or 0.0
+
+    def test_request_metrics(self) -> None:
+        """Test that requests are recorded per URL name and action."""
+        labels = {"view": "todo:todoitem-list", "action": "list", "method": "GET"}
+        before = self.sample("http_request_duration_seconds_count", **labels)
+        queries = self.sample("db_query_duration_seconds_count", alias="default")
+        self.client.get("/api/todo/items/")
+        self.client.post("/api/todo/items/complete_all/")
+
+        self.assertEqual(
+            self.sample("http_request_duration_seconds_count", **labels), before + 1
+        )
+        self.assertGreater(
+            self.sample(
+                "http_requests_total",
+                view="todo:todoitem-complete-all",
+                action="complete_all",
+                method="POST",
+                status="200",
+            ),
+            0,
+        )
+        self.assertGreater(
+            self.sample("db_query_duration_seconds_count", alias="default"), queries
+        )
+        self.assertEqual(self.sample("http_requests_in_flight"), 0)
+
+    def test_unresolved_paths_share_a_label(self) -> None:
+        """Test that 404s do not create a series per path."""
+        before = self.sample(
+            "http_requests_total",
+            view="<unresolved>",
+            action="",
+            method="GET",
+            status="404",
+        )
+        self.client.get("/no/such/page")
+        self.client.get("/no/such/other/page")
+        self.assertEqual(
+            self.sample(
+                "http_requests_total",
+                view="<unresolved>",
+                action="",
+                method="GET",
+                status="404",
+            ),
+            before + 2,
+        )
+
+    def test_unknown_methods_share_a_label(self) -> None:
+        """Test that arbitrary request methods do not create series."""
+        labels = {"view": "<unresolved>", "action": "", "status": "404"}
+        before = self.sample("http_requests_total", method="other", **labels)
+        self.client.generic("PROPFIND", "/no/such/page")
+        self.client.generic("X-ANYTHING", "/no/such/page")
+        self.assertEqual(
+            self.sample("http_requests_total", method="other", **labels), before + 2
+        )
+        self.assertEqual(
+            self.sample("http_requests_total", method="PROPFIND", **labels), 0
+        )
+
+    def test_disabled_by_default(self) -> None:
+        """Test that the endpoint is not served unless METRICS is on."""
+        with override_settings(METRICS=False):
+            response = self.client.get("/__metrics__")
+        self.assertEqual(response.status_code, 404)
+
+    @mock.patch.dict(os.environ, {"METRICS": "true", "METRICS_TOKEN": ""})
+    def test_token_required_outside_debug(self) -> None:
+        """Test that metrics cannot be enabled in production without a token."""
+        import importlib
+
+        from django.core.exceptions import ImproperlyConfigured
+
+        import settings as app_settings
+
+        self.addCleanup(importlib.reload, app_settings)
+        with mock.patch.dict(os.environ, {"DEBUG": ""}):
+            with self.assertRaises(ImproperlyConfigured):
+                importlib.reload(app_settings)
+        with mock.patch.dict(os.environ, {"DEBUG": "true"}):
+            importlib.reload(app_settings)
+        with mock.patch.dict(os.environ, {"DEBUG": "", "METRICS_TOKEN": "secret"}):
+            importlib.reload(app_settings)
+        self.assertTrue(app_settings.METRICS)
+
+    def test_response_cache_lookups(self) -> None:
+        """Test that response cache hits and misses are counted."""
+        from django.core.cache import cache
+
+        cache.clear()
+        hits = self.sample(
+            "todo_response_cache_lookups_total", action="stats", outcome="hits"
+        )
+        with override_settings(TODO_RESPONSE_CACHE_TTLS={"stats": 60}):
+            self.client.get("/api/todo/items/stats/")
+            self.client.get("/api/todo/items/stats/")
+        self.assertEqual(
+            self.sample(
+                "todo_response_cache_lookups_total", action="stats", outcome="hits"
+            ),
+            hits + 1,
+        )
+
+        with override_settings(METRICS=False, TODO_RESPONSE_CACHE_TTLS={"stats": 60}):
+            self.client.get("/api/todo/items/stats/")
+        self.assertEqual(
+            self.sample(
+                "todo_response_cache_lookups_total", action="stats", outcome="hits"
+            ),
+            hits + 1,
+        )
+
+    def test_endpoint(self) -> None:
+        """Test that the endpoint serves the Prometheus text format."""
+        self.client.get("/api/todo/items/stats/")
+        response = self.client.get("/__metrics__")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(
+            b'http_request_duration_seconds_bucket{action="stats"', response.content
+        )
+        self.assertIn(b"db_connections_open", response.content)
+
+    def test_token(self) -> None:
+        """Test that METRICS_TOKEN protects the endpoint."""
+        with override_settings(METRICS_TOKEN="secret"):
+            denied = self.client.get("/__metrics__")
+            allowed = self.client.get(
+                "/__metrics__", headers={"Authorization": "Bearer secret"}
+            )
+        self.assertEqual(denied.status_code, 401)
+        self.assertEqual(allowed.status_code, 200)
+
+    def test_aggregates_worker_processes(self) -> None:
+        """Test that samples written by several processes are summed."""
+        import subprocess
+        import sys
+        import tempfile
+
+        from prometheus_client import generate_latest
+
+        from backend.mysite.metrics import metrics_registry
+
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": tmp}
+            for _ in range(2):
+                subprocess.run(
+                    [
+                        sys.executable,
+                        "-c",
+                        "from prometheus_client import Counter; "
+                        "Counter('worker_requests', 'Requests.').inc(3)",
+                    ],
+                    env=env,
+                    check=True,
+                )
+            with mock.patch.dict(os.environ, {"PROMETHEUS_MULTIPROC_DIR": tmp}):
+                output = generate_latest(metrics_registry())
+        self.assertIn(b"worker_requests_total 6.0", output)
+
+    def test_async_views_name_their_actions(self) -> None:
+        """Test that the async routes expose their actions like router views."""
+        from backend.todo import async_views
+
+        self.assertEqual(async_views.item_list.actions["get"], "list")  # type: ignore[attr-defined]
+        self.assertEqual(async_views.item_detail.actions["delete"], "destroy")  # type: ignore[attr-defined]
+
+
+class QueryCountTests(TestCase):
+    """Test cases for the query budget test harness."""
+
+    def test_count_queries(self) -> None:
+        """Test that queries and the rows fetched by each are counted."""
+        from django.db import connection
+
+        from backend.mysite.querycount import count_queries
+
+        with count_queries() as count:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3")
+                cursor.fetchone()
+                cursor.fetchall()
+                cursor.execute("SELECT 1")
+        self.assertEqual((count.queries, count.rows), (2, 3))
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        self.assertEqual(count.queries, 2)
+
+    def test_budget_fails_on_growth(self) -> None:
+        """Test that counts growing with the dataset fail within budget."""
+        from django.db import connection
+
+        from backend.mysite.querycount import Budget, QueryBudgetMixin, QueryCount
+
+        class Scenario(QueryBudgetMixin, TestCase):
+            def seed(self, count: int) -> None:
+                pass
+
+            def runTest(self) -> None:
+                pass
+
+        test = Scenario()
+        budget = Budget(lambda test: None, queries=5, rows=20)
+        test.assertWithinBudget(budget, {10: QueryCount(2, 20), 100: QueryCount(2, 20)})
+        for counts in (
+            {10: QueryCount(2, 10), 100: QueryCount(2, 20)},
+            {10: QueryCount(2, 10), 100: QueryCount(3, 10)},
+            {10: QueryCount(6, 10), 100: QueryCount(6, 10)},
+        ):
+            with self.assertRaises(AssertionError):
+                test.assertWithinBudget(budget, counts)
+        test.assertWithinBudget(
+            Budget(lambda test: None, queries=1, rows=None),
+            {10: QueryCount(1, 10), 100: QueryCount(1, 100)},
+        )
+
+        batched = Budget(
+            lambda test: None, queries=2, rows=1, batch_queries=3, batch_rows=1
+        )
+        counts = {10: QueryCount(5, 2), 100: QueryCount(32, 11)}
+        test.assertWithinBudget(batched, counts, {10: 1, 100: 10})
+        with self.assertRaises(AssertionError):
+            test.assertWithinBudget(batched, counts, {10: 1, 100: 5})
+
+        per_vendor = Budget(
+            lambda test: None, queries={connection.vendor: 2, "other": 1}, rows=20
+        )
+        test.assertWithinBudget(per_vendor, {10: QueryCount(2, 20)})
+        with self.assertRaises(AssertionError):
+            test.assertWithinBudget(per_vendor, {10: QueryCount(3, 20)})
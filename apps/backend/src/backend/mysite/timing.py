@@ -0,0 +1,229 @@
+"""
+Per-request timing breakdown, reported as a ``Server-Timing`` header.
+
+With ``SERVER_TIMING`` on, ``ServerTimingMiddleware`` records for every
+request:
+
+- ``total``: time spent inside the middleware, i.e. the rest of the stack.
+- ``db``: time in ``cursor.execute`` and the number of queries, from an
+  execute wrapper installed on every database connection.
+- ``view``: time in a viewset's ``dispatch`` (including its queries and
+  serialization), with the action as description.
+- ``serialize``: time in serializers using ``TimedSerializerMixin``.
+- ``render``: time from the view returning to the response being rendered.
+
+The same numbers are logged as one line per request. The phases overlap
+(``view`` contains ``db`` and ``serialize``), as ``Server-Timing`` allows.
+With the setting off the middleware removes itself, and the hooks reduce to
+one context variable lookup.
+"""
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponseBase
+
+logger = logging.getLogger(__name__)
+
+# Order of the metrics in the header.
+PHASES = ("view", "db", "serialize", "render")
+
+
+class RequestTiming:
+    """Durations, in seconds, accumulated while serving one request."""
+
+    def __init__(self) -> None:
+        self.started = perf_counter()
+        self.durations: dict[str, float] = {}
+        self.active: set[str] = set()
+        self.queries = 0
+        self.action: str | None = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def time_render(self, response: Any) -> None:
+        """Record the time until ``response`` has been rendered."""
+        if not hasattr(response, "add_post_render_callback"):
+            return
+        returned = perf_counter()
+        response.add_post_render_callback(
+            lambda rendered: self.add("render", perf_counter() - returned)
+        )
+
+    def header(self, total: float) -> str:
+        """Return the ``Server-Timing`` header value."""
+        metrics = [f"total;dur={total * 1000:.1f}"]
+        for name in PHASES:
+            if name == "db":
+                metrics.append(
+                    f"db;dur={self.durations.get('db', 0.0) * 1000:.1f};"
+                    f'desc="{self.queries} queries"'
+                )
+            elif name in self.durations:
+                metric = f"{name};dur={self.durations[name] * 1000:.1f}"
+                if name == "view" and self.action:
+                    metric += f';desc="{self.action}"'
+                metrics.append(metric)
+        return ", ".join(metrics)
+
+
+current_timing: ContextVar[RequestTiming | None] = ContextVar(
+    "current_timing", default=None
+)
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    """
+    Add the time spent in the block to the current request's ``name`` phase.
+
+    Does nothing outside a timed request. Nested blocks of the same phase
+    (a serializer calling another) are only counted once.
+    """
+    timing = current_timing.get()
+    if timing is None or name in timing.active:
+        yield
+        return
+    timing.active.add(name)
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, perf_counter() - start)
+        timing.active.discard(name)
+
+
+def time_query(execute: Any, sql: Any, params: Any, many: bool, context: Any) -> Any:
+    """Database execute wrapper adding each query to the current request."""
+    timing = current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.queries += 1
+        timing.add("db", perf_counter() - start)
+
+
+def install_query_timer(
+    sender: Any = None, connection: Any = None, **kwargs: Any
+) -> None:
+    """Install ``time_query`` on ``connection`` (a ``connection_created`` receiver)."""
+    if time_query not in connection.execute_wrappers:
+        # Outermost: execute_wrapper() blocks pop the innermost wrapper on exit.
+        connection.execute_wrappers.insert(0, time_query)
+
+
+class ServerTimingMiddleware:
+    """Time each request and report it in ``Server-Timing`` and the log."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Any) -> None:
+        if not settings.SERVER_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        # Connections are per thread; time those opened from now on, too.
+        connection_created.connect(install_query_timer)
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection=connection)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        return self.report(request, response, timing)
+
+    async def __acall__(self, request: HttpRequest) -> Any:
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        return self.report(request, response, timing)
+
+    def report(
+        self, request: HttpRequest, response: HttpResponseBase, timing: RequestTiming
+    ) -> HttpResponseBase:
+        total = perf_counter() - timing.started
+        response["Server-Timing"] = timing.header(total)
+        durations = {
+            name: round(timing.durations.get(name, 0.0) * 1000, 1) for name in PHASES
+        }
+        logger.info(
+            "server_timing method=%s path=%s status=%s action=%s total_ms=%.1f "
+            "db_ms=%.1f queries=%d view_ms=%.1f serialize_ms=%.1f render_ms=%.1f",
+            request.method,
+            request.path,
+            response.status_code,
+            timing.action or "-",
+            total * 1000,
+            durations["db"],
+            timing.queries,
+            durations["view"],
+            durations["serialize"],
+            durations["render"],
+            extra={
+                "server_timing": {
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "action": timing.action,
+                    "total_ms": round(total * 1000, 1),
+                    "queries": timing.queries,
+                    **{f"{name}_ms": value for name, value in durations.items()},
+                }
+            },
+        )
+        return response
+
+
+class ServerTimingMixin:
+    """Viewset mixin timing ``dispatch`` as the ``view`` phase."""
+
+    def dispatch(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        timing = current_timing.get()
+        if timing is None:
+            return super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+        with measure("view"):
+            response = super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+        timing.action = getattr(self, "action", None)
+        timing.time_render(response)
+        return response
+
+
+class TimedSerializerMixin:
+    """Serializer mixin timing validation and representation as ``serialize``."""
+
+    # Called once per item of a list, so skip ``measure`` entirely when off.
+    def run_validation(self, *args: Any, **kwargs: Any) -> Any:
+        if current_timing.get() is None:
+            return super().run_validation(*args, **kwargs)  # type: ignore[misc]
+        with measure("serialize"):
+            return super().run_validation(*args, **kwargs)  # type: ignore[misc]
+
+    def to_representation(self, *args: Any, **kwargs: Any) -> Any:
+        if current_timing.get() is None:
+            return super().to_representation(*args, **kwargs)  # type: ignore[misc]
+        with measure("serialize"):
+            return super().to_representation(*args, **kwargs)  # type: ignore[misc]
@@ -1,16 +1,14 @@
 from django.conf import settings
 from django.shortcuts import render
 from django.utils import timezone
-from django.http import JsonResponse
 import django
-from pathlib import Path
-import json
+
+from backend.mysite.health import version_response
 
 
 def version(request):
-    with open(Path("/build-info.json"), "r") as f:
-        build_info = json.load(f)
-    return JsonResponse(build_info)
+    # Normally answered by health_check_middleware before reaching here.
+    return version_response()
 
 
 def home(request):
@@ -7,3 +7,9 @@ class TodoConfig(AppConfig):
     default_auto_field: str = "django.db.models.BigAutoField"
     name: str = "backend.todo"
     verbose_name: str = "Todo Application"
+
+    def ready(self) -> None:
+        from backend.todo.response_cache import invalidate
+        from backend.todo.signals import todo_table_changed
+
+        todo_table_changed.connect(invalidate)
@@ -0,0 +1,226 @@
+"""
+Chunked archival and purge of completed todo items.
+
+A single ``DELETE`` of every completed item locks all of them for as long as
+it runs and, through Django's deletion collector, may load them first.
+``archive_completed`` instead walks the items in primary key order, a batch
+of at most ``batch_size`` at a time, and commits each batch in its own short
+transaction, optionally sleeping between batches so other writers get the
+table. In ``archive`` mode a batch is copied to ``ArchivedTodoItem`` before it
+is deleted; in ``delete`` mode it is only deleted.
+
+Progress is kept in a ``TodoArchiveRun`` row, updated in the transaction of
+each batch, so an interrupted run is resumed with ``process_run`` right after
+the last batch that committed. The API endpoints and services start runs
+with ``persist=False``, which skip the row: a failed call is simply repeated,
+and a row per call would pile up. Every batch propagates its deletions
+through ``record_write``, so the counters, the table version and the response
+cache stay in sync.
+"""
+
+import time
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import ArchivedTodoItem, Bucket, TodoArchiveRun, TodoItem, record_write
+
+# Columns copied from the todo table to the archive table.
+ARCHIVED_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "completed",
+    "priority",
+    "due_date",
+    "created_at",
+    "updated_at",
+)
+
+
+def start_run(
+    mode: str,
+    cutoff: datetime | None = None,
+    *,
+    using: str = "default",
+    persist: bool = True,
+) -> TodoArchiveRun:
+    """
+    Record a run over the completed items last updated before ``cutoff``.
+
+    ``cutoff=None`` covers every completed item. The run is bounded by the
+    ids of the items matching now, so items completed while it runs are left
+    for the next one. With ``persist=False`` the run is not saved, and
+    ``process_run`` never saves it either.
+    """
+    if mode not in dict(TodoArchiveRun.MODE_CHOICES):
+        raise ValueError(f"Unknown archive mode: {mode!r}")
+    run = TodoArchiveRun(mode=mode, cutoff=cutoff)
+    bounds = (
+        TodoItem._base_manager.using(using)
+        .filter(run.items_condition())
+        .aggregate(first=Min("pk"), last=Max("pk"))
+    )
+    run.last_pk = (bounds["first"] or 1) - 1
+    run.max_pk = bounds["last"] or 0
+    if persist:
+        run.save(using=using)
+    else:
+        # Let ``process_run`` find the database, as ``save`` would have.
+        run._state.db = using
+    return run
+
+
+def batch_end(run: TodoArchiveRun, batch_size: int, using: str) -> int:
+    """Return the id of the last item of the next batch of ``run``."""
+    ids = list(
+        TodoItem._base_manager.using(using)
+        .filter(run.items_condition(), pk__gt=run.last_pk, pk__lte=run.max_pk)
+        .order_by("pk")
+        .values_list("pk", flat=True)[batch_size - 1 : batch_size]
+    )
+    return ids[0] if ids else run.max_pk
+
+
+def batch_where(run: TodoArchiveRun, end: int, using: str) -> tuple[str, list[Any]]:
+    """Return the SQL condition and parameters selecting a batch of ``run``."""
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    sql = f"{quote('completed')} = %s AND {quote('id')} > %s AND {quote('id')} <= %s"
+    params: list[Any] = [True, run.last_pk, end]
+    if run.cutoff is not None:
+        sql += f" AND {quote('updated_at')} < %s"
+        params.append(connection.ops.adapt_datetimefield_value(run.cutoff))
+    return sql, params
+
+
+def move_batch_returning(run: TodoArchiveRun, end: int, using: str) -> int:
+    """
+    Archive and delete a batch in one statement; return the items removed.
+
+    PostgreSQL only: the deleted rows feed the archive insert and the
+    per-bucket counts directly, so no row crosses to Python and no other
+    writer can change them in between.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    table = quote(TodoItem._meta.db_table)
+    columns = ", ".join(quote(name) for name in ARCHIVED_COLUMNS)
+    where, params = batch_where(run, end, using)
+    archive = ""
+    if run.mode == TodoArchiveRun.ARCHIVE:
+        archive = (
+            f", archived AS (INSERT INTO {quote(ArchivedTodoItem._meta.db_table)} "
+            f"({columns}, {quote('archived_at')}) "
+            f"SELECT {columns}, %s FROM moved)"
+        )
+        params.append(connection.ops.adapt_datetimefield_value(timezone.now()))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {table} WHERE {where} RETURNING *){archive} "
+            f"SELECT {quote('completed')}, {quote('priority')}, COUNT(*) "
+            f"FROM moved GROUP BY 1, 2",
+            params,
+        )
+        deltas: Counter[Bucket] = Counter()
+        for completed, priority, count in cursor.fetchall():
+            deltas[(completed, priority)] -= count
+    # The DELETE bypasses the ORM, so propagate the write explicitly.
+    record_write(TodoItem.tracked(deltas))
+    return -sum(deltas.values())
+
+
+def move_batch(run: TodoArchiveRun, end: int, using: str) -> int:
+    """
+    Archive and delete a batch; return the items removed.
+
+    The archive copy is an ``INSERT ... SELECT`` and the delete goes through
+    ``TodoItemQuerySet.delete``, which keeps the counters in sync.
+    """
+    if connections[using].vendor == "postgresql":
+        return move_batch_returning(run, end, using)
+    if run.mode == TodoArchiveRun.ARCHIVE:
+        connection = connections[using]
+        quote = connection.ops.quote_name
+        columns = ", ".join(quote(name) for name in ARCHIVED_COLUMNS)
+        where, params = batch_where(run, end, using)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {quote(ArchivedTodoItem._meta.db_table)} "
+                f"({columns}, {quote('archived_at')}) "
+                f"SELECT {columns}, %s FROM {quote(TodoItem._meta.db_table)} "
+                f"WHERE {where}",
+                [connection.ops.adapt_datetimefield_value(timezone.now()), *params],
+            )
+    deleted, _ = (
+        TodoItem.objects.using(using)
+        .filter(run.items_condition(), pk__gt=run.last_pk, pk__lte=end)
+        .delete()
+    )
+    return deleted
+
+
+def process_run(
+    run: TodoArchiveRun,
+    *,
+    batch_size: int | None = None,
+    delay: float = 0.0,
+    progress: Callable[[TodoArchiveRun], None] | None = None,
+) -> TodoArchiveRun:
+    """
+    Process the remaining batches of ``run`` and mark it finished.
+
+    Each batch commits with the run's progress (the last one also marks it
+    finished), then ``progress`` is called and, if more batches remain, the
+    run sleeps ``delay`` seconds. Inside an outer transaction the batches
+    become savepoints and nothing is released until that transaction ends.
+    A run that was never saved is only updated in memory.
+    """
+    batch_size = batch_size or settings.TODO_ARCHIVE_BATCH_SIZE
+    using = run._state.db or "default"
+    persist = run.pk is not None
+    while run.last_pk < run.max_pk:
+        end = batch_end(run, batch_size, using)
+        with transaction.atomic(using=using):
+            run.processed += move_batch(run, end, using)
+            run.last_pk = end
+            if end == run.max_pk:
+                run.finished_at = timezone.now()
+            if persist:
+                run.save(
+                    using=using, update_fields=["processed", "last_pk", "finished_at"]
+                )
+        if progress is not None:
+            progress(run)
+        if delay and run.last_pk < run.max_pk:
+            time.sleep(delay)
+    if run.finished_at is None:
+        run.finished_at = timezone.now()
+        if persist:
+            run.save(using=using, update_fields=["finished_at"])
+    return run
+
+
+def archive_completed(
+    mode: str,
+    cutoff: datetime | None = None,
+    *,
+    using: str = "default",
+    batch_size: int | None = None,
+    delay: float = 0.0,
+    progress: Callable[[TodoArchiveRun], None] | None = None,
+    persist: bool = True,
+) -> TodoArchiveRun:
+    """Start a run over the completed items older than ``cutoff`` and process it."""
+    return process_run(
+        start_run(mode, cutoff, using=using, persist=persist),
+        batch_size=batch_size,
+        delay=delay,
+        progress=progress,
+    )
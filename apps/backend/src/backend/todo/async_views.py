@@ -0,0 +1,177 @@
+"""
+Async read path of the todo API.
+
+Under ASGI a synchronous view occupies a worker thread for as long as its
+queries run. The views here serve ``list``, ``retrieve`` and ``stats`` with
+the async ORM instead (``acount``, ``aget``, ``aaggregate`` and async
+iteration), so a slow query only suspends its own request.
+
+They reuse ``TodoItemViewSet`` for everything that does no I/O: request
+parsing, content negotiation, filtering, serializers, pagination links,
+exception handling and rendering. Responses, ETags and cache entries are
+identical to the synchronous views. Writes need transactions, which the
+async ORM does not support, so every other method on these routes is handed
+to the synchronous viewset in a worker thread.
+
+The routes are installed ahead of the router's when ``TODO_ASYNC_VIEWS`` is
+set; see ``urls.py``.
+"""
+
+from collections.abc import Awaitable, Callable
+from functools import wraps
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from backend.mysite.timing import current_timing, measure
+
+from .conditional import aconditional_get
+from .models import TodoItem
+from .response_cache import acached_response
+from .serializers import TodoItemRowSerializer
+from .stats import aget_stats
+from .views import TodoItemViewSet
+
+Handler = Callable[[Request, TodoItemViewSet], Awaitable[Response]]
+
+
+def delegate_writes(
+    actions: dict[str, Any],
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Any]]:
+    """
+    Serve GET and HEAD with the decorated async view.
+
+    Other methods are answered by ``TodoItemViewSet`` with ``actions``, run
+    in a thread, exactly as the router would.
+    """
+    sync_view = sync_to_async(TodoItemViewSet.as_view(actions, basename="todoitem"))
+
+    def decorator(view: Callable[..., Awaitable[Any]]) -> Callable[..., Any]:
+        @wraps(view)
+        async def wrapper(request: Any, *args: Any, **kwargs: Any) -> Any:
+            if request.method in ("GET", "HEAD"):
+                return await view(request, *args, **kwargs)
+            return await sync_view(request, *args, **kwargs)
+
+        # Like a router view, so metrics can name the action per method.
+        wrapper.actions = actions  # type: ignore[attr-defined]
+        return csrf_exempt(wrapper)
+
+    return decorator
+
+
+async def run_action(
+    request: Any, action: str, handler: Handler, **kwargs: Any
+) -> Response:
+    """
+    Run ``handler`` the way ``APIView.dispatch`` runs a viewset action.
+
+    ``initial`` (negotiation, authentication, permissions, throttling) may
+    read the session, so it runs in a thread like any synchronous code. As
+    in the synchronous views, the response cache and ETag check wrap the
+    handler itself, after ``initial``. Like ``ServerTimingMixin``, it reports
+    the action to the ``Server-Timing`` middleware.
+    """
+    view = TodoItemViewSet(
+        action_map={"get": action, "head": action},
+        basename="todoitem",
+        detail="pk" in kwargs,
+    )
+    view.setup(request, **kwargs)
+    drf_request = view.initialize_request(request, **kwargs)
+    view.request = drf_request
+    view.headers = view.default_response_headers
+    with measure("view"):
+        try:
+            await sync_to_async(view.initial)(drf_request, **kwargs)
+            response = await handler(drf_request, view)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+        view.response = view.finalize_response(drf_request, response, **kwargs)
+    timing = current_timing.get()
+    if timing is not None:
+        timing.action = action
+        timing.time_render(view.response)
+    return view.response
+
+
+@acached_response("list")
+@aconditional_get
+async def alist(request: Request, view: TodoItemViewSet) -> Response:
+    """Async ``ListModelMixin.list``, honouring ``TODO_FAST_SERIALIZER``."""
+    queryset = view.filter_queryset(view.get_queryset())
+    if settings.TODO_FAST_SERIALIZER:
+        queryset = queryset.values(*TodoItemRowSerializer.fields)
+
+    paginator = view.paginator
+    if paginator is None:
+        items = [item async for item in queryset]
+    else:
+        page = await paginator.apaginate_queryset(queryset, request, view=view)
+        items = page if page is not None else [item async for item in queryset]
+
+    if settings.TODO_FAST_SERIALIZER:
+        data = TodoItemRowSerializer().serialize(items)
+    else:
+        data = view.get_serializer(items, many=True).data
+    if paginator is None:
+        return Response(data)
+    return view.get_paginated_response(data)
+
+
+@acached_response("retrieve")
+@aconditional_get
+async def aretrieve(request: Request, view: TodoItemViewSet) -> Response:
+    """Async ``RetrieveModelMixin.retrieve``, honouring ``TODO_FAST_SERIALIZER``."""
+    queryset = view.filter_queryset(view.get_queryset())
+    if settings.TODO_FAST_SERIALIZER:
+        queryset = queryset.values(*TodoItemRowSerializer.fields)
+
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    try:
+        item = await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+    except (TodoItem.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+        raise Http404("No TodoItem matches the given query.")
+    view.check_object_permissions(request, item)
+
+    if settings.TODO_FAST_SERIALIZER:
+        return Response(TodoItemRowSerializer().serialize([item])[0])
+    return Response(view.get_serializer(item).data)
+
+
+@acached_response("stats")
+@aconditional_get
+async def astats(request: Request, view: TodoItemViewSet) -> Response:
+    """Async ``TodoItemViewSet.stats``."""
+    return Response(await aget_stats(view.filter_queryset(view.get_queryset())))
+
+
+@delegate_writes({"get": "list", "post": "create"})
+async def item_list(request: Any, **kwargs: Any) -> Response:
+    """List todo items."""
+    return await run_action(request, "list", alist, **kwargs)
+
+
+@delegate_writes(
+    {
+        "get": "retrieve",
+        "put": "update",
+        "patch": "partial_update",
+        "delete": "destroy",
+    }
+)
+async def item_detail(request: Any, **kwargs: Any) -> Response:
+    """Get a todo item."""
+    return await run_action(request, "retrieve", aretrieve, **kwargs)
+
+
+@delegate_writes({"get": "stats"})
+async def item_stats(request: Any, **kwargs: Any) -> Response:
+    """Get statistics about the todo items matching the filters."""
+    return await run_action(request, "stats", astats, **kwargs)
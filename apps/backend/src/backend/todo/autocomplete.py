@@ -0,0 +1,178 @@
+"""
+Title autocomplete for todo items.
+
+Autocomplete serves keystroke traffic, so it returns only ``id`` and
+``title`` for the best few matches, skips pagination and counting entirely,
+and runs under a hard per-query time budget.
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from django.db import OperationalError, connections, transaction
+from django.db.models import BooleanField, FloatField, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
+
+from .models import TodoItem
+
+logger = logging.getLogger(__name__)
+
+# Sorts after every valid character, so ``value < prefix + SENTINEL`` bounds a
+# prefix range scan.
+PREFIX_SENTINEL = "\U0010ffff"
+
+# SQLSTATE of a statement cancelled by PostgreSQL (e.g. by statement_timeout).
+QUERY_CANCELED = "57014"
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a query runs past its time budget and is cancelled."""
+
+
+def is_query_canceled(exc: OperationalError) -> bool:
+    """Return whether ``exc`` wraps a PostgreSQL query cancellation."""
+    cause = exc.__cause__
+    # psycopg exposes the SQLSTATE as ``sqlstate``, psycopg2 as ``pgcode``.
+    code = getattr(cause, "sqlstate", None) or getattr(cause, "pgcode", None)
+    return code == QUERY_CANCELED
+
+
+@contextmanager
+def query_budget(milliseconds: int, using: str = "default") -> Iterator[None]:
+    """
+    Cancel any query run inside the block that takes longer than the budget.
+
+    PostgreSQL enforces the budget with a transaction-local
+    ``statement_timeout``. SQLite has no statement timeout, so a progress
+    handler aborts the running statement once the deadline has passed.
+    Cancellation is raised as ``QueryBudgetExceeded``; any other database
+    error propagates unchanged.
+    """
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        try:
+            with transaction.atomic(using=using), connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT current_setting('statement_timeout'), "
+                    "set_config('statement_timeout', %s, true)",
+                    [f"{milliseconds}ms"],
+                )
+                previous = cursor.fetchone()[0]
+                yield
+                # SET LOCAL outlives released savepoints; restore it for any
+                # enclosing transaction.
+                cursor.execute(
+                    "SELECT set_config('statement_timeout', %s, true)", [previous]
+                )
+        except OperationalError as exc:
+            if is_query_canceled(exc):
+                raise QueryBudgetExceeded from exc
+            raise
+
+    elif connection.vendor == "sqlite":
+        connection.ensure_connection()
+        raw = connection.connection
+        deadline = time.monotonic() + milliseconds / 1000
+        raw.set_progress_handler(lambda: int(time.monotonic() > deadline), 1000)
+        try:
+            yield
+        except OperationalError as exc:
+            if "interrupted" in str(exc):
+                raise QueryBudgetExceeded from exc
+            raise
+        finally:
+            raw.set_progress_handler(None, 0)
+
+    else:
+        yield
+
+
+class AutocompleteBackend(ABC):
+    """Base class for title autocomplete backends."""
+
+    def suggest(self, query: str, limit: int) -> list[dict[str, Any]]:
+        """Return up to ``limit`` ``{"id", "title"}`` matches for ``query``."""
+        rows = self.get_queryset(query)[:limit].values("id", "title")
+        return [dict(row) for row in rows]
+
+    @abstractmethod
+    def get_queryset(self, query: str) -> QuerySet[TodoItem]:
+        """Return the items matching ``query``, best first."""
+
+
+class TrigramAutocompleteBackend(AutocompleteBackend):
+    """
+    Fuzzy autocomplete backed by a ``pg_trgm`` GIN index on the title.
+
+    Matches titles starting with the query or containing a word similar to
+    it, and ranks prefix matches first, then by word similarity.
+    """
+
+    def get_queryset(self, query: str) -> QuerySet[TodoItem]:
+        table = TodoItem._meta.db_table
+        title = f'"{table}"."title"'
+        pattern = (
+            query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        )
+        return (
+            TodoItem.objects.filter(
+                RawSQL(
+                    f"({title} ILIKE %s OR %s <%% {title})",
+                    (pattern, query),
+                    output_field=BooleanField(),
+                )
+            )
+            .alias(
+                is_prefix=RawSQL(
+                    f"{title} ILIKE %s", (pattern,), output_field=BooleanField()
+                ),
+                similarity=RawSQL(
+                    f"word_similarity(%s, {title})", (query,), output_field=FloatField()
+                ),
+            )
+            .order_by("-is_prefix", "-similarity", "id")
+        )
+
+
+class PrefixAutocompleteBackend(AutocompleteBackend):
+    """
+    Case-insensitive prefix autocomplete.
+
+    Expressed as a range on ``lower(title)`` so it is served by the
+    expression index created for SQLite. The bounds are lowered by the
+    database too, so they are folded exactly like the titles: SQLite's
+    ``lower()`` only folds ASCII letters, so other letters match their own
+    case only.
+    """
+
+    def get_queryset(self, query: str) -> QuerySet[TodoItem]:
+        return (
+            TodoItem.objects.alias(title_lower=Lower("title"))
+            .filter(
+                title_lower__gte=Lower(Value(query)),
+                title_lower__lt=Lower(Value(query + PREFIX_SENTINEL)),
+            )
+            .order_by("title_lower", "id")
+        )
+
+
+def get_autocomplete_backend(using: str = "default") -> AutocompleteBackend:
+    """Return the autocomplete backend for the ``using`` database."""
+    if connections[using].vendor == "postgresql":
+        return TrigramAutocompleteBackend()
+    return PrefixAutocompleteBackend()
+
+
+def autocomplete(query: str, limit: int, budget_ms: int) -> list[dict[str, Any]] | None:
+    """Return title suggestions for ``query``, or ``None`` if over budget."""
+    try:
+        with query_budget(budget_ms):
+            return get_autocomplete_backend().suggest(query, limit)
+    except QueryBudgetExceeded:
+        logger.warning("Autocomplete for %r exceeded %sms budget", query, budget_ms)
+        return None
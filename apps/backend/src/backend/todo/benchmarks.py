@@ -0,0 +1,186 @@
+"""
+Benchmark helpers for the todo API.
+
+Micro-benchmarks run on unsaved, in-memory items so they measure Python-side
+serialization and rendering only, independent of the database. ``drive`` and
+``drive_mix`` load-test a running server over HTTP/1.1.
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from django.utils import timezone
+
+from .models import PRIORITY_CHOICES, TodoItem
+from .serializers import TodoItemRowSerializer
+
+
+def sample_items(count: int) -> list[TodoItem]:
+    """Return ``count`` varied, unsaved items with every field populated."""
+    now = timezone.now()
+    priorities = [choice for choice, _ in PRIORITY_CHOICES]
+    return [
+        TodoItem(
+            id=index + 1,
+            title=f"Todo {index}",
+            description=f"Description of todo {index}" if index % 2 else "",
+            completed=index % 3 == 0,
+            priority=priorities[index % len(priorities)],
+            due_date=now + timedelta(hours=index - count // 2) if index % 4 else None,
+            created_at=now - timedelta(minutes=index),
+            updated_at=now - timedelta(seconds=index),
+        )
+        for index in range(count)
+    ]
+
+
+def as_rows(items: list[TodoItem]) -> list[dict[str, Any]]:
+    """Return the ``values()`` rows the database would return for ``items``."""
+    return [
+        {name: getattr(item, name) for name in TodoItemRowSerializer.fields}
+        for item in items
+    ]
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    """Return the fastest of ``repeat`` timed calls of ``func``, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a load run: completed requests, failures and latencies."""
+
+    elapsed: float = 0.0
+    errors: int = 0
+    latencies: list[float] = field(default_factory=list)
+
+    @property
+    def requests_per_second(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, percent: int) -> float:
+        """Return the ``percent``th latency percentile in seconds."""
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0.0
+        return statistics.quantiles(self.latencies, n=100)[percent - 1]
+
+
+def http_request(
+    host: str, port: int, method: str, path: str, body: Any = None
+) -> bytes:
+    """Return an HTTP/1.1 request accepting JSON, with ``body`` sent as JSON."""
+    head = (
+        f"{method} {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+        "Accept: application/json\r\n"
+    )
+    if body is None:
+        return f"{head}\r\n".encode()
+    payload = json.dumps(body).encode()
+    return (
+        f"{head}Content-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n\r\n"
+    ).encode() + payload
+
+
+async def fetch(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: bytes
+) -> tuple[int, bool]:
+    """Send ``request`` and read the response; return (status, keep-alive)."""
+    writer.write(request)
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip().lower()
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+        keep_alive = headers.get("connection") != "close"
+    else:
+        await reader.read()
+        keep_alive = False
+    return int(status_line.split()[1]), keep_alive
+
+
+async def drive_mix(
+    host: str,
+    port: int,
+    choose: Callable[[random.Random], tuple[str, bytes]],
+    *,
+    connections: int,
+    duration: float,
+    seed: int = 0,
+) -> dict[str, LoadResult]:
+    """
+    Send requests from ``connections`` concurrent clients for ``duration``.
+
+    Before every request a client calls ``choose`` with its own random
+    generator (seeded from ``seed``, so a mix is reproducible) for a name and
+    the raw request. Results are grouped by name. Each client reuses its
+    connection while the server keeps it alive and reconnects otherwise.
+    Non-2xx/3xx responses and I/O failures count as errors.
+    """
+    results: defaultdict[str, LoadResult] = defaultdict(LoadResult)
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def client(rng: random.Random) -> None:
+        connection = None
+        while time.perf_counter() < deadline:
+            name, request = choose(rng)
+            result = results[name]
+            try:
+                if connection is None:
+                    connection = await asyncio.open_connection(host, port)
+                sent = time.perf_counter()
+                status, keep_alive = await fetch(*connection, request)
+                if status >= 400:
+                    result.errors += 1
+                else:
+                    result.latencies.append(time.perf_counter() - sent)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                result.errors += 1
+                keep_alive = False
+            if not keep_alive and connection is not None:
+                connection[1].close()
+                connection = None
+        if connection is not None:
+            connection[1].close()
+
+    await asyncio.gather(
+        *(client(random.Random(seed + index)) for index in range(connections))
+    )
+    elapsed = time.perf_counter() - started
+    for result in results.values():
+        result.elapsed = elapsed
+    return dict(results)
+
+
+async def drive(
+    host: str, port: int, path: str, *, connections: int, duration: float
+) -> LoadResult:
+    """Request ``path`` from ``connections`` concurrent clients for ``duration``."""
+    request = http_request(host, port, "GET", path)
+    results = await drive_mix(
+        host,
+        port,
+        lambda rng: (path, request),
+        connections=connections,
+        duration=duration,
+    )
+    return results.get(path, LoadResult(elapsed=duration))
@@ -0,0 +1,91 @@
+"""
+Streaming export of todo items.
+
+Exports read ``values_list`` rows through ``QuerySet.iterator()``, which uses a
+server-side cursor on PostgreSQL, and encode them one chunk at a time. No
+model instances or serializers are involved, so memory use does not grow with
+the size of the export and the first bytes are sent as soon as the first
+chunk is fetched.
+"""
+
+import csv
+import io
+import json
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from django.db.models import QuerySet
+
+from .models import TodoItem
+from .serializers import format_datetime
+
+EXPORT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "completed",
+    "priority",
+    "due_date",
+    "created_at",
+    "updated_at",
+)
+
+DATETIME_FIELDS = frozenset({"due_date", "created_at", "updated_at"})
+
+
+def iter_rows(
+    queryset: QuerySet[TodoItem], chunk_size: int
+) -> Iterator[list[tuple[Any, ...]]]:
+    """Yield lists of export rows, ``chunk_size`` rows at a time."""
+    datetime_columns = [
+        index for index, field in enumerate(EXPORT_FIELDS) if field in DATETIME_FIELDS
+    ]
+    chunk = []
+    for row in queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+        values = list(row)
+        for index in datetime_columns:
+            values[index] = format_datetime(values[index])
+        chunk.append(tuple(values))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def export_ndjson(queryset: QuerySet[TodoItem], chunk_size: int) -> Iterator[bytes]:
+    """Stream ``queryset`` as newline-delimited JSON objects."""
+    for chunk in iter_rows(queryset, chunk_size):
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_FIELDS, row))) + "\n" for row in chunk
+        ).encode()
+
+
+def csv_value(value: Any) -> Any:
+    """Write booleans as JSON does; ``csv`` already writes ``None`` as ''."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def export_csv(queryset: QuerySet[TodoItem], chunk_size: int) -> Iterator[bytes]:
+    """Stream ``queryset`` as CSV with a header row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    # Send the header immediately, before the first chunk is fetched.
+    yield buffer.getvalue().encode()
+
+    for chunk in iter_rows(queryset, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(tuple(map(csv_value, row)) for row in chunk)
+        yield buffer.getvalue().encode()
+
+
+EXPORT_FORMATS: dict[
+    str, tuple[str, Callable[[QuerySet[TodoItem], int], Iterator[bytes]]]
+] = {
+    "ndjson": ("application/x-ndjson", export_ndjson),
+    "csv": ("text/csv", export_csv),
+}
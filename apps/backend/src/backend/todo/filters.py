@@ -0,0 +1,66 @@
+"""
+Filter backends for the Todo API.
+"""
+
+from typing import Any
+
+from django.db.models import QuerySet
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .search import get_search_backend
+
+SEARCH_MODE_CONTAINS = "contains"
+SEARCH_MODE_FULLTEXT = "fulltext"
+
+
+def get_search_mode(request: Request) -> str:
+    """Return the validated ``search_mode`` query parameter."""
+    mode = request.query_params.get("search_mode", SEARCH_MODE_CONTAINS)
+    if mode not in (SEARCH_MODE_CONTAINS, SEARCH_MODE_FULLTEXT):
+        raise ValidationError(
+            {
+                "search_mode": [
+                    f"Must be '{SEARCH_MODE_CONTAINS}' or '{SEARCH_MODE_FULLTEXT}'."
+                ]
+            }
+        )
+    return mode
+
+
+def is_fulltext_search(request: Request) -> bool:
+    """Return whether the request runs a ranked full-text search."""
+    return get_search_mode(request) == SEARCH_MODE_FULLTEXT and bool(
+        request.query_params.get(api_settings.SEARCH_PARAM, "").strip()
+    )
+
+
+class TodoSearchFilter(filters.SearchFilter):
+    """
+    ``SearchFilter`` with an opt-in full-text mode.
+
+    ``?search=`` keeps the substring semantics of ``SearchFilter``. Adding
+    ``?search_mode=fulltext`` runs the query through the configured full-text
+    search backend instead, which is index-backed and ranks the results.
+    """
+
+    def filter_queryset(
+        self, request: Request, queryset: QuerySet, view: Any
+    ) -> QuerySet:
+        if not is_fulltext_search(request):
+            return super().filter_queryset(request, queryset, view)
+
+        query = request.query_params[self.search_param].strip()
+        return get_search_backend(queryset.db).search(queryset, query)
+
+
+class TodoOrderingFilter(filters.OrderingFilter):
+    """``OrderingFilter`` that orders full-text results by rank by default."""
+
+    def get_default_ordering(self, view: Any) -> Any:
+        request = getattr(view, "request", None)
+        if request is not None and is_fulltext_search(request):
+            return ["-search_rank", "-id"]
+        return super().get_default_ordering(view)
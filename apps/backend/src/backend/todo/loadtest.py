@@ -0,0 +1,244 @@
+"""
+Load generation for the todo API.
+
+``run_load`` drives a weighted mix of API operations (``OPERATIONS``) against
+a running server and ``build_report`` summarizes throughput and p50/p95/p99
+latency per operation as JSON-serializable data. ``compare_reports`` lines up
+two reports so a change can be checked against a baseline run.
+"""
+
+import asyncio
+import json
+import random
+import urllib.request
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlencode, urlsplit
+
+from .benchmarks import LoadResult, drive_mix, http_request
+from .models import PRIORITY_CHOICES
+
+API_PATH = "/api/todo/items/"
+PRIORITIES = [value for value, _ in PRIORITY_CHOICES]
+SEARCH_TERMS = ["load", "test", "todo", "item", "report"]
+ORDERINGS = ["created_at", "-updated_at", "due_date", "-priority", "title"]
+
+# An operation builds (method, path below API_PATH, JSON body or None) from a
+# client's random generator and the ids of existing items.
+RequestBuilder = Callable[[random.Random, list[int]], tuple[str, str, Any]]
+
+
+@dataclass(frozen=True)
+class Operation:
+    """A kind of request in the load mix, chosen in proportion to ``weight``."""
+
+    name: str
+    weight: int
+    build: RequestBuilder
+
+
+def new_item(rng: random.Random) -> dict[str, Any]:
+    return {
+        "title": f"Load test {rng.choice(SEARCH_TERMS)} {rng.randrange(10**6)}",
+        "priority": rng.choice(PRIORITIES),
+    }
+
+
+OPERATIONS = [
+    Operation("list", 30, lambda rng, ids: ("GET", "", None)),
+    Operation(
+        "list_filtered",
+        10,
+        lambda rng, ids: (
+            "GET",
+            "?"
+            + urlencode(
+                {
+                    "completed": rng.choice(["true", "false"]),
+                    "priority": rng.choice(PRIORITIES),
+                }
+            ),
+            None,
+        ),
+    ),
+    Operation(
+        "list_search",
+        8,
+        lambda rng, ids: ("GET", f"?search={rng.choice(SEARCH_TERMS)}", None),
+    ),
+    Operation(
+        "list_ordered",
+        7,
+        lambda rng, ids: ("GET", f"?ordering={rng.choice(ORDERINGS)}", None),
+    ),
+    Operation("retrieve", 20, lambda rng, ids: ("GET", f"{rng.choice(ids)}/", None)),
+    Operation("create", 5, lambda rng, ids: ("POST", "", new_item(rng))),
+    Operation(
+        "complete", 4, lambda rng, ids: ("POST", f"{rng.choice(ids)}/complete/", None)
+    ),
+    Operation(
+        "uncomplete",
+        4,
+        lambda rng, ids: ("POST", f"{rng.choice(ids)}/uncomplete/", None),
+    ),
+    Operation("stats", 8, lambda rng, ids: ("GET", "stats/", None)),
+    Operation(
+        "bulk_create",
+        2,
+        lambda rng, ids: ("POST", "bulk_create/", [new_item(rng) for _ in range(10)]),
+    ),
+    Operation(
+        "bulk_update",
+        2,
+        lambda rng, ids: (
+            "POST",
+            "bulk_update/",
+            [
+                {"id": pk, "priority": rng.choice(PRIORITIES)}
+                for pk in rng.sample(ids, min(10, len(ids)))
+            ],
+        ),
+    ),
+]
+
+# Percentiles reported for every operation.
+PERCENTILES = (50, 95, 99)
+
+
+def item_ids(base_url: str, count: int = 20) -> list[int]:
+    """
+    Return the ids of up to ``count`` items, creating items if there are none.
+
+    Detail and bulk operations act on these, so the run never requests an
+    item that does not exist.
+    """
+    url = base_url.rstrip("/") + API_PATH
+    with urllib.request.urlopen(f"{url}?pagination=cursor") as response:
+        ids = [item["id"] for item in json.load(response)["results"]]
+    if ids:
+        return ids[:count]
+    rng = random.Random(0)
+    request = urllib.request.Request(
+        f"{url}bulk_create/",
+        data=json.dumps([new_item(rng) for _ in range(count)]).encode(),
+        headers={"Content-Type": "application/json", "Accept": "application/json"},
+    )
+    with urllib.request.urlopen(request) as response:
+        return [item["id"] for item in json.load(response)]
+
+
+def run_load(
+    base_url: str,
+    operations: list[Operation],
+    *,
+    connections: int,
+    duration: float,
+    seed: int = 0,
+) -> dict[str, LoadResult]:
+    """Drive the ``operations`` mix against ``base_url``; return results by name."""
+    parts = urlsplit(base_url)
+    if parts.scheme != "http" or not parts.hostname:
+        raise ValueError(f"Not a plain http:// URL: {base_url}")
+    host, port = parts.hostname, parts.port or 80
+    prefix = parts.path.rstrip("/") + API_PATH
+    ids = item_ids(base_url)
+    weights = [operation.weight for operation in operations]
+
+    def choose(rng: random.Random) -> tuple[str, bytes]:
+        operation = rng.choices(operations, weights)[0]
+        method, path, body = operation.build(rng, ids)
+        return operation.name, http_request(host, port, method, prefix + path, body)
+
+    return asyncio.run(
+        drive_mix(
+            host,
+            port,
+            choose,
+            connections=connections,
+            duration=duration,
+            seed=seed,
+        )
+    )
+
+
+def summarize(result: LoadResult) -> dict[str, Any]:
+    """Return the throughput and latency percentiles of ``result``."""
+    return {
+        "requests": len(result.latencies),
+        "errors": result.errors,
+        "requests_per_second": round(result.requests_per_second, 1),
+        **{
+            f"p{percent}_ms": round(result.percentile(percent) * 1000, 2)
+            for percent in PERCENTILES
+        },
+    }
+
+
+def build_report(results: dict[str, LoadResult], **meta: Any) -> dict[str, Any]:
+    """Return a JSON-serializable report of a run, with ``meta`` at the top."""
+    total = LoadResult(
+        elapsed=max((result.elapsed for result in results.values()), default=0.0),
+        errors=sum(result.errors for result in results.values()),
+        latencies=[
+            latency for result in results.values() for latency in result.latencies
+        ],
+    )
+    return {
+        **meta,
+        "total": summarize(total),
+        "operations": {name: summarize(results[name]) for name in sorted(results)},
+    }
+
+
+# Metrics compared between reports; throughput regresses when it drops,
+# latencies when they rise.
+COMPARED_METRICS = ("requests_per_second", *(f"p{p}_ms" for p in PERCENTILES))
+
+
+@dataclass(frozen=True)
+class Change:
+    """One metric of one operation in a baseline and a current report."""
+
+    operation: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def relative(self) -> float:
+        """Change relative to the baseline, positive when it got worse."""
+        if not self.baseline:
+            return 0.0
+        change = (self.current - self.baseline) / self.baseline
+        return -change if self.metric == "requests_per_second" else change
+
+
+def compare_reports(baseline: dict[str, Any], current: dict[str, Any]) -> list[Change]:
+    """Return the compared metrics of ``total`` and every shared operation."""
+    sections = {"total": (baseline["total"], current["total"])}
+    for name in sorted(baseline["operations"].keys() & current["operations"].keys()):
+        sections[name] = (baseline["operations"][name], current["operations"][name])
+    return [
+        Change(name, metric, before[metric], after[metric])
+        for name, (before, after) in sections.items()
+        for metric in COMPARED_METRICS
+    ]
+
+
+def format_changes(changes: list[Change]) -> list[str]:
+    """Return a table of ``changes``, one line per operation and metric."""
+    lines = [
+        f"{'operation':<16} {'metric':<20} {'baseline':>10} {'current':>10} change"
+    ]
+    for change in changes:
+        lines.append(
+            f"{change.operation:<16} {change.metric:<20} {change.baseline:>10.2f} "
+            f"{change.current:>10.2f} {change.relative * 100:+6.1f}%"
+        )
+    return lines
+
+
+def regressions(changes: list[Change], max_percent: float) -> list[Change]:
+    """Return the changes that got worse by more than ``max_percent``."""
+    return [change for change in changes if change.relative * 100 > max_percent]
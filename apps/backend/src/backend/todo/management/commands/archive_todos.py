@@ -0,0 +1,100 @@
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from backend.todo.archival import process_run, start_run
+from backend.todo.models import TodoArchiveRun
+
+
+class Command(BaseCommand):
+    """Archive or purge completed todo items in small, throttled batches."""
+
+    help = (
+        "Move completed todo items last updated more than --days ago to the "
+        "archive table (or delete them with --delete), a batch at a time. "
+        "--resume continues the last interrupted run."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        scope = parser.add_mutually_exclusive_group()
+        scope.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Only items completed and last updated this many days ago.",
+        )
+        scope.add_argument(
+            "--all", action="store_true", help="Every completed item, whatever its age."
+        )
+        scope.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue the most recent unfinished run with its own options.",
+        )
+        parser.add_argument(
+            "--delete",
+            action="store_true",
+            help="Delete the items instead of archiving them.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TODO_ARCHIVE_BATCH_SIZE,
+            help="Items removed per batch and transaction.",
+        )
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=settings.TODO_ARCHIVE_DELAY,
+            help="Seconds to sleep between batches.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to archive on (default 'default').",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        using = options["database"]
+        if options["resume"]:
+            run = (
+                TodoArchiveRun.objects.using(using)
+                .filter(finished_at__isnull=True)
+                .order_by("-pk")
+                .first()
+            )
+            if run is None:
+                raise CommandError("There is no unfinished run to resume.")
+            self.stdout.write(f"Resuming {run}.")
+        else:
+            cutoff = None
+            if not options["all"]:
+                cutoff = timezone.now() - timedelta(days=options["days"])
+            mode = (
+                TodoArchiveRun.DELETE if options["delete"] else TodoArchiveRun.ARCHIVE
+            )
+            run = start_run(mode, cutoff, using=using)
+
+        run = process_run(
+            run,
+            batch_size=options["batch_size"],
+            delay=options["delay"],
+            progress=self.progress,
+        )
+        verb = "Deleted" if run.mode == TodoArchiveRun.DELETE else "Archived"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {run.processed} completed items (run {run.pk})."
+            )
+        )
+
+    def progress(self, run: TodoArchiveRun) -> None:
+        self.stdout.write(
+            f"{run.processed} {run.mode}d, up to id {run.last_pk} of {run.max_pk}"
+        )
@@ -0,0 +1,58 @@
+from io import BytesIO
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from backend.mysite.renderers import (
+    MessagePackParser,
+    MessagePackRenderer,
+    ORJSONParser,
+    ORJSONRenderer,
+)
+from backend.todo.benchmarks import best_of, sample_items
+from backend.todo.serializers import TodoItemSerializer
+
+FORMATS: dict[str, tuple[BaseRenderer, BaseParser]] = {
+    "json": (JSONRenderer(), JSONParser()),
+    "orjson": (ORJSONRenderer(), ORJSONParser()),
+    "msgpack": (MessagePackRenderer(), MessagePackParser()),
+}
+
+
+class Command(BaseCommand):
+    """Compare encode and decode throughput of the API wire formats."""
+
+    help = "Benchmark the JSON, orjson and MessagePack renderers and parsers."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--items",
+            type=int,
+            nargs="+",
+            default=[100, 1000],
+            help="Page sizes to benchmark.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Timed runs per measurement."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        repeat = options["repeat"]
+        for count in options["items"]:
+            data = {
+                "count": count,
+                "results": TodoItemSerializer(sample_items(count), many=True).data,
+            }
+            self.stdout.write(f"{count} items:")
+            for name, (renderer, parser) in FORMATS.items():
+                body = renderer.render(data)
+                assert isinstance(body, bytes)
+                encode = best_of(lambda: renderer.render(data), repeat)
+                decode = best_of(lambda: parser.parse(BytesIO(body)), repeat)
+                self.stdout.write(
+                    f"  {name:<8} {len(body):>9} bytes  "
+                    f"encode {encode * 1000:7.2f} ms ({count / encode:>10.0f} items/s)  "
+                    f"decode {decode * 1000:7.2f} ms ({count / decode:>10.0f} items/s)"
+                )
@@ -0,0 +1,45 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from rest_framework.renderers import JSONRenderer
+
+from backend.todo.benchmarks import as_rows, best_of, sample_items
+from backend.todo.serializers import TodoItemRowSerializer, TodoItemSerializer
+
+
+class Command(BaseCommand):
+    """Compare TodoItemSerializer with the values()-based row serializer."""
+
+    help = "Benchmark list serialization with and without the fast read path."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--items",
+            type=int,
+            nargs="+",
+            default=[20, 100, 1000],
+            help="Page sizes to benchmark.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Timed runs per measurement."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        renderer = JSONRenderer()
+        for count in options["items"]:
+            items = sample_items(count)
+            rows = as_rows(items)
+            row_serializer = TodoItemRowSerializer()
+            expected = renderer.render(TodoItemSerializer(items, many=True).data)
+            if renderer.render(row_serializer.serialize(rows)) != expected:
+                raise CommandError("The serializers disagree; timings are moot.")
+
+            drf = best_of(
+                lambda: TodoItemSerializer(items, many=True).data, options["repeat"]
+            )
+            fast = best_of(lambda: row_serializer.serialize(rows), options["repeat"])
+            self.stdout.write(
+                f"{count:>6} items: TodoItemSerializer {drf * 1000:8.2f} ms, "
+                f"TodoItemRowSerializer {fast * 1000:8.2f} ms "
+                f"({drf / fast:.1f}x faster)"
+            )
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from backend.todo.benchmarks import LoadResult, drive
+
+
+class Command(BaseCommand):
+    """Compare sync WSGI and async ASGI gunicorn workers under load."""
+
+    help = (
+        "Start gunicorn in each SERVER_MODE with the same CPU and worker "
+        "budget and measure throughput with many concurrent connections."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--modes", nargs="+", default=["wsgi", "asgi"], choices=["wsgi", "asgi"]
+        )
+        parser.add_argument("--path", default="/api/todo/items/")
+        parser.add_argument(
+            "--connections",
+            type=int,
+            default=64,
+            help="Concurrent keep-alive client connections.",
+        )
+        parser.add_argument(
+            "--duration", type=float, default=10.0, help="Seconds per mode."
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Gunicorn workers (WEB_CONCURRENCY) in every mode.",
+        )
+        parser.add_argument(
+            "--cpus",
+            type=int,
+            default=1,
+            help="CPUs the server may use, matching the nopo.yml runtime.",
+        )
+        parser.add_argument("--port", type=int, default=8765)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if settings.DATABASES["default"]["NAME"] == ":memory:":
+            raise CommandError(
+                "Set DATABASE_URL to a database the server processes can share."
+            )
+        for mode in options["modes"]:
+            result = self.run_mode(mode, options)
+            self.stdout.write(
+                f"{mode}: {result.requests_per_second:8.1f} req/s, "
+                f"p50 {result.percentile(50) * 1000:7.1f} ms, "
+                f"p99 {result.percentile(99) * 1000:7.1f} ms, "
+                f"{len(result.latencies)} ok, {result.errors} errors"
+            )
+
+    def run_mode(self, mode: str, options: dict[str, Any]) -> LoadResult:
+        """Serve with ``mode`` workers and drive load against the server."""
+        env = {
+            **os.environ,
+            "SERVER_MODE": mode,
+            "HOST": "127.0.0.1",
+            "PORT": str(options["port"]),
+            "WEB_CONCURRENCY": str(options["workers"]),
+        }
+        cpus = set(range(options["cpus"]))
+        server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py"],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            # Pinned right after the spawn, long before gunicorn has imported
+            # enough to fork its workers, which inherit the mask.
+            os.sched_setaffinity(server.pid, cpus)
+            self.wait_for_port(options["port"], server)
+            return asyncio.run(
+                drive(
+                    "127.0.0.1",
+                    options["port"],
+                    options["path"],
+                    connections=options["connections"],
+                    duration=options["duration"],
+                )
+            )
+        finally:
+            server.terminate()
+            server.wait()
+
+    @staticmethod
+    def wait_for_port(port: int, server: subprocess.Popen, timeout: float = 30) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"gunicorn exited with status {server.returncode}.")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"gunicorn did not listen on port {port} in {timeout}s.")
@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from backend.todo.loadtest import compare_reports, format_changes, regressions
+
+
+class Command(BaseCommand):
+    """Compare two load_test reports operation by operation."""
+
+    help = (
+        "Compare the throughput and latency percentiles of two load_test JSON "
+        "reports; a positive change is a regression."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("baseline", help="Report of the baseline run.")
+        parser.add_argument("current", help="Report of the run to check.")
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            help="Fail if any metric regressed by more than this percentage.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        baseline, current = (
+            self.load(options[name]) for name in ("baseline", "current")
+        )
+        changes = compare_reports(baseline, current)
+        for line in format_changes(changes):
+            self.stdout.write(line)
+
+        limit = options["max_regression"]
+        if limit is None:
+            return
+        regressed = regressions(changes, limit)
+        if regressed:
+            raise CommandError(
+                f"{len(regressed)} metric(s) regressed by more than {limit}%: "
+                + ", ".join(
+                    f"{change.operation} {change.metric}" for change in regressed
+                )
+            )
+        self.stdout.write(self.style.SUCCESS(f"No regression above {limit}%."))
+
+    @staticmethod
+    def load(path: str) -> dict[str, Any]:
+        try:
+            return json.loads(Path(path).read_text())
+        except FileNotFoundError as exc:
+            raise CommandError(f"No such file: {path}") from exc
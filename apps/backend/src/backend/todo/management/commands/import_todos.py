@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from backend.todo.importer import IMPORT_FORMATS, ImportReport, import_items
+
+
+class Command(BaseCommand):
+    """Stream todo items from an NDJSON or CSV file into the database."""
+
+    help = "Import todo items from an NDJSON or CSV file ('-' reads stdin)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="File to import, or '-' for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=sorted(IMPORT_FORMATS),
+            help="Input format. Defaults to the file extension.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TODO_IMPORT_BATCH_SIZE,
+            help="Rows written per batch.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path = options["path"]
+        input_format = options["format"] or Path(path).suffix.lstrip(".").lower()
+        if input_format not in IMPORT_FORMATS:
+            raise CommandError(
+                f"Cannot infer the format of {path!r}; pass --format "
+                f"({', '.join(sorted(IMPORT_FORMATS))})."
+            )
+        read = IMPORT_FORMATS[input_format]
+
+        if path == "-":
+            report = self.run(read(sys.stdin.buffer), options["batch_size"])
+        else:
+            try:
+                with open(path, "rb") as stream:
+                    report = self.run(read(stream), options["batch_size"])
+            except FileNotFoundError as exc:
+                raise CommandError(f"No such file: {path}") from exc
+
+        for error in report.errors:
+            self.stderr.write(f"line {error.line}: {error.errors}")
+        if report.rejected > len(report.errors):
+            self.stderr.write(
+                f"... and {report.rejected - len(report.errors)} more rejected rows"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.created} items, rejected {report.rejected} "
+                f"in {report.elapsed:.1f}s ({report.rows_per_second:.0f} rows/s)."
+            )
+        )
+
+    def run(self, rows: Any, batch_size: int) -> ImportReport:
+        return import_items(
+            rows,
+            batch_size=batch_size,
+            max_errors=settings.TODO_IMPORT_MAX_ERRORS,
+            progress=self.progress,
+        )
+
+    def progress(self, report: ImportReport) -> None:
+        self.stdout.write(
+            f"{report.created} imported, {report.rejected} rejected "
+            f"({report.rows_per_second:.0f} rows/s)"
+        )
@@ -0,0 +1,167 @@
+import json
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.core.servers.basehttp import (
+    ThreadedWSGIServer,
+    WSGIRequestHandler,
+    get_internal_wsgi_application,
+)
+
+from backend.todo.loadtest import OPERATIONS, build_report, run_load
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    # Headers and body are written separately; without TCP_NODELAY the body
+    # waits for the client's delayed ACK of the headers.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@contextmanager
+def in_process_server() -> Iterator[str]:
+    """Serve the WSGI application from a thread; yield its base URL."""
+    server = ThreadedWSGIServer(("127.0.0.1", 0), QuietRequestHandler)
+    server.set_app(get_internal_wsgi_application())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class Command(BaseCommand):
+    """Drive a realistic request mix at the todo API and report latencies."""
+
+    help = (
+        "Load-test the todo API with a weighted mix of list, retrieve, write, "
+        "stats and bulk requests, and report throughput and p50/p95/p99 "
+        "latency per operation as JSON."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        target = parser.add_mutually_exclusive_group()
+        target.add_argument(
+            "--url",
+            default=settings.SITE_URL,
+            help="Base URL of the server to test (default SITE_URL).",
+        )
+        target.add_argument(
+            "--in-process",
+            action="store_true",
+            help="Serve the app from a thread of this process instead.",
+        )
+        parser.add_argument(
+            "--operations",
+            nargs="+",
+            choices=[operation.name for operation in OPERATIONS],
+            help="Only run these operations (default: the whole mix).",
+        )
+        parser.add_argument(
+            "--connections",
+            type=int,
+            default=16,
+            help="Concurrent keep-alive client connections.",
+        )
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds.")
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed of the request mix."
+        )
+        parser.add_argument(
+            "--output", help="Write the JSON report here ('-' for stdout)."
+        )
+        parser.add_argument(
+            "--baseline",
+            help="Compare with the JSON report of an earlier run (needs --output).",
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            help="With --baseline, fail if any metric regressed by more than "
+            "this percentage.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        output = options["output"]
+        if options["baseline"] and output in (None, "-"):
+            raise CommandError("--baseline needs --output to name a file.")
+        operations = [
+            operation
+            for operation in OPERATIONS
+            if not options["operations"] or operation.name in options["operations"]
+        ]
+        if options["in_process"]:
+            if settings.DATABASES["default"]["NAME"] == ":memory:":
+                raise CommandError(
+                    "Set DATABASE_URL to a database the server threads can share."
+                )
+            with in_process_server() as url:
+                report = self.run(url, operations, options)
+        else:
+            report = self.run(options["url"], operations, options)
+
+        if output == "-":
+            json.dump(report, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        else:
+            self.write_summary(report)
+            if output:
+                Path(output).write_text(json.dumps(report, indent=2) + "\n")
+                self.stdout.write(f"Report written to {output}.")
+
+        if options["baseline"]:
+            call_command(
+                "compare_load_reports",
+                options["baseline"],
+                output,
+                max_regression=options["max_regression"],
+                stdout=self.stdout,
+            )
+
+    def run(
+        self, url: str, operations: list[Any], options: dict[str, Any]
+    ) -> dict[str, Any]:
+        started = datetime.now(timezone.utc)
+        try:
+            results = run_load(
+                url,
+                operations,
+                connections=options["connections"],
+                duration=options["duration"],
+                seed=options["seed"],
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot load-test {url}: {exc}") from exc
+        return build_report(
+            results,
+            target="in-process" if options["in_process"] else url,
+            started_at=started.isoformat(),
+            duration=options["duration"],
+            connections=options["connections"],
+            seed=options["seed"],
+        )
+
+    def write_summary(self, report: dict[str, Any]) -> None:
+        self.stdout.write(
+            f"{'operation':<16} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'errors':>7}"
+        )
+        rows = [*report["operations"].items(), ("total", report["total"])]
+        for name, summary in rows:
+            self.stdout.write(
+                f"{name:<16} {summary['requests_per_second']:>8.1f} "
+                f"{summary['p50_ms']:>8.2f} {summary['p95_ms']:>8.2f} "
+                f"{summary['p99_ms']:>8.2f} {summary['errors']:>7}"
+            )
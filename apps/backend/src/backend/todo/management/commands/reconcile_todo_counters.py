@@ -0,0 +1,35 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from backend.todo.models import TodoCounter
+
+
+class Command(BaseCommand):
+    """Recount the TodoCounter buckets from the todo table and repair drift."""
+
+    help = "Recount the todo statistics counters and repair any drift."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Report drift without repairing it and exit non-zero if found.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        drift = TodoCounter.objects.reconcile(dry_run=options["check"])
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Todo counters are in sync."))
+            return
+
+        for (completed, priority), (stored, actual) in sorted(drift.items()):
+            status = "completed" if completed else "incomplete"
+            self.stdout.write(f"{status}/{priority}: stored {stored}, actual {actual}")
+
+        if options["check"]:
+            raise CommandError(f"{len(drift)} todo counter bucket(s) drifted.")
+        self.stdout.write(
+            self.style.SUCCESS(f"Repaired {len(drift)} todo counter bucket(s).")
+        )
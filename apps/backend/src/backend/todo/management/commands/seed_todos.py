@@ -0,0 +1,177 @@
+from datetime import datetime
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from backend.todo.models import PRIORITY_CHOICES
+from backend.todo.seeding import SeedReport, SeedSpec, seed_items
+
+PRIORITIES = [value for value, _ in PRIORITY_CHOICES]
+DUE_KINDS = ["overdue", "upcoming", "none"]
+
+
+def parse_weights(values: list[str], names: list[str], option: str) -> dict[str, float]:
+    """Parse ``name=weight`` pairs; names left out get no weight."""
+    weights = dict.fromkeys(names, 0.0)
+    for value in values:
+        name, _, weight = value.partition("=")
+        if name not in weights:
+            raise CommandError(
+                f"{option}: unknown name {name!r} (choose from {', '.join(names)})."
+            )
+        try:
+            weights[name] = float(weight)
+        except ValueError as exc:
+            raise CommandError(f"{option}: {value!r} is not name=weight.") from exc
+        if weights[name] < 0:
+            raise CommandError(f"{option}: weights cannot be negative.")
+    if not any(weights.values()):
+        raise CommandError(f"{option}: at least one weight must be positive.")
+    return weights
+
+
+def ratio(value: str) -> float:
+    number = float(value)
+    if not 0 <= number <= 1:
+        raise ValueError(value)
+    return number
+
+
+class Command(BaseCommand):
+    """Fill the todo table with deterministic synthetic items."""
+
+    help = (
+        "Generate todo items with controllable distributions of priority, "
+        "completion, due dates, creation history and description length. The "
+        "same options and --seed always produce the same rows."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--count", type=int, default=100_000, help="Items.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+        parser.add_argument(
+            "--priority-weights",
+            nargs="+",
+            default=["low=1", "medium=2", "high=1"],
+            metavar="PRIORITY=WEIGHT",
+            help="Relative weight of each priority (default low=1 medium=2 high=1).",
+        )
+        parser.add_argument(
+            "--completed-ratio",
+            type=ratio,
+            default=0.3,
+            help="Share of completed items, 0 to 1 (default 0.3).",
+        )
+        parser.add_argument(
+            "--due-weights",
+            nargs="+",
+            default=["overdue=1", "upcoming=3", "none=6"],
+            metavar="KIND=WEIGHT",
+            help="Relative weight of overdue, upcoming and no due date "
+            "(default overdue=1 upcoming=3 none=6).",
+        )
+        parser.add_argument(
+            "--due-days",
+            type=int,
+            default=30,
+            help="Due dates fall up to this many days before or after --anchor.",
+        )
+        parser.add_argument(
+            "--history-days",
+            type=int,
+            default=365,
+            help="created_at is spread over this many days before --anchor.",
+        )
+        parser.add_argument(
+            "--description-ratio",
+            type=ratio,
+            default=0.5,
+            help="Share of items with a description, 0 to 1 (default 0.5).",
+        )
+        parser.add_argument(
+            "--description-length",
+            type=int,
+            default=200,
+            help="Maximum description length.",
+        )
+        parser.add_argument(
+            "--anchor",
+            type=datetime.fromisoformat,
+            help="ISO datetime dates are relative to (default now). Fix it for "
+            "identical rows across runs.",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            help="Worker processes generating and writing batches.",
+        )
+        parser.add_argument(
+            "--keep-indexes",
+            action="store_true",
+            help="Maintain indexes row by row instead of rebuilding them after "
+            "the load.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to seed (default 'default').",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["count"] < 1:
+            raise CommandError("--count must be positive.")
+        if options["jobs"] < 1:
+            raise CommandError("--jobs must be positive.")
+        if options["due_days"] < 0 or options["history_days"] < 0:
+            raise CommandError("--due-days and --history-days cannot be negative.")
+        if options["description_length"] < 1:
+            raise CommandError("--description-length must be positive.")
+        using = options["database"]
+        connection = connections[using]
+        if (
+            options["jobs"] > 1
+            and connection.vendor == "sqlite"
+            and connection.is_in_memory_db()  # type: ignore[attr-defined]
+        ):
+            raise CommandError("--jobs needs a database other processes can open.")
+        anchor = options["anchor"] or timezone.now()
+        if timezone.is_naive(anchor):
+            anchor = timezone.make_aware(anchor)
+
+        spec = SeedSpec(
+            count=options["count"],
+            seed=options["seed"],
+            priority_weights=parse_weights(
+                options["priority_weights"], PRIORITIES, "--priority-weights"
+            ),
+            completed_ratio=options["completed_ratio"],
+            due_weights=parse_weights(
+                options["due_weights"], DUE_KINDS, "--due-weights"
+            ),
+            due_days=options["due_days"],
+            history_days=options["history_days"],
+            description_ratio=options["description_ratio"],
+            description_length=options["description_length"],
+            anchor=anchor,
+        )
+        report = seed_items(
+            spec,
+            using=using,
+            jobs=options["jobs"],
+            defer_indexes=not options["keep_indexes"],
+            progress=self.progress,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {report.created} items in {report.elapsed:.1f}s "
+                f"({report.rows_per_second:.0f} rows/s)."
+            )
+        )
+
+    def progress(self, report: SeedReport) -> None:
+        self.stdout.write(
+            f"{report.created} seeded ({report.rows_per_second:.0f} rows/s)"
+        )
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-16 19:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("todo", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(
+                fields=["created_at", "id"], name="todo_todoit_created_dabbf9_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(
+                fields=["updated_at", "id"], name="todo_todoit_updated_ee28db_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(
+                fields=["priority", "id"], name="todo_todoit_priorit_70ed69_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(
+                fields=["title", "id"], name="todo_todoit_title_3b4bc3_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.3 on 2026-10-16 19:50
+
+from django.db import migrations, models
+from django.db.models import Count
+
+PRIORITIES = ["low", "medium", "high"]
+
+
+def seed_counters(apps, schema_editor):
+    """Create every counter bucket with the current number of todo items."""
+    TodoItem = apps.get_model("todo", "TodoItem")
+    TodoCounter = apps.get_model("todo", "TodoCounter")
+    db_alias = schema_editor.connection.alias
+
+    counts = {
+        (completed, priority): 0
+        for completed in (False, True)
+        for priority in PRIORITIES
+    }
+    grouped = (
+        TodoItem.objects.using(db_alias)
+        .filter(priority__in=PRIORITIES)
+        .order_by()
+        .values_list("completed", "priority")
+        .annotate(count=Count("pk"))
+    )
+    for completed, priority, count in grouped:
+        counts[(completed, priority)] = count
+
+    TodoCounter.objects.using(db_alias).bulk_create(
+        TodoCounter(completed=completed, priority=priority, count=count)
+        for (completed, priority), count in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("todo", "0002_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TodoCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("completed", models.BooleanField()),
+                ("priority", models.CharField(max_length=10)),
+                ("count", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("completed", "priority"),
+                        name="todo_counter_bucket_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
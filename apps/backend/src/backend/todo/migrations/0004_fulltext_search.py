@@ -0,0 +1,90 @@
+from django.db import migrations
+
+# PostgreSQL keeps the generated column current on every INSERT/UPDATE
+# (including COPY); 0005_fulltext_search_index indexes it.
+#
+# Adding a STORED generated column rewrites the whole table under an ACCESS
+# EXCLUSIVE lock, blocking reads as well as writes until every row has been
+# rewritten, and temporarily needs disk for a second copy of the table. On a
+# large table run this migration in a maintenance window.
+POSTGRES_FORWARDS = [
+    """
+    ALTER TABLE todo_todoitem ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+]
+
+POSTGRES_BACKWARDS = [
+    "ALTER TABLE todo_todoitem DROP COLUMN IF EXISTS search_vector",
+]
+
+# SQLite mirrors title/description into an external-content FTS5 table kept in
+# sync by triggers. Note that SQLite migrations which rebuild todo_todoitem
+# (e.g. AlterField) drop these triggers and must recreate them.
+SQLITE_FORWARDS = [
+    """
+    CREATE VIRTUAL TABLE todo_todoitem_fts USING fts5(
+        title, description,
+        content='todo_todoitem', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER todo_todoitem_fts_insert AFTER INSERT ON todo_todoitem BEGIN
+        INSERT INTO todo_todoitem_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER todo_todoitem_fts_delete AFTER DELETE ON todo_todoitem BEGIN
+        INSERT INTO todo_todoitem_fts(todo_todoitem_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER todo_todoitem_fts_update
+    AFTER UPDATE OF title, description ON todo_todoitem BEGIN
+        INSERT INTO todo_todoitem_fts(todo_todoitem_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO todo_todoitem_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO todo_todoitem_fts(todo_todoitem_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARDS = [
+    "DROP TRIGGER IF EXISTS todo_todoitem_fts_update",
+    "DROP TRIGGER IF EXISTS todo_todoitem_fts_delete",
+    "DROP TRIGGER IF EXISTS todo_todoitem_fts_insert",
+    "DROP TABLE IF EXISTS todo_todoitem_fts",
+]
+
+STATEMENTS = {
+    "postgresql": (POSTGRES_FORWARDS, POSTGRES_BACKWARDS),
+    "sqlite": (SQLITE_FORWARDS, SQLITE_BACKWARDS),
+}
+
+
+def run_statements(index):
+    def run(apps, schema_editor):
+        statements = STATEMENTS.get(schema_editor.connection.vendor)
+        if statements is None:
+            return
+        for statement in statements[index]:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("todo", "0003_todo_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(run_statements(0), run_statements(1)),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# The GIN index serving `search_vector @@ tsquery` on PostgreSQL. It is built
+# CONCURRENTLY, which keeps the table writable while it builds but cannot run
+# inside a transaction, hence a separate non-atomic migration. A failed
+# concurrent build leaves an INVALID index behind; drop it before retrying.
+POSTGRES_FORWARDS = [
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS todo_todoitem_search_vector_idx
+    ON todo_todoitem USING gin (search_vector)
+    """,
+]
+
+POSTGRES_BACKWARDS = [
+    "DROP INDEX CONCURRENTLY IF EXISTS todo_todoitem_search_vector_idx",
+]
+
+
+def run_statements(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("todo", "0004_fulltext_search"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_statements(POSTGRES_FORWARDS), run_statements(POSTGRES_BACKWARDS)
+        ),
+    ]
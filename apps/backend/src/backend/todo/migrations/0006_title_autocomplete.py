@@ -0,0 +1,55 @@
+from django.db import migrations
+
+# pg_trgm's GIN operator class serves both `title ILIKE 'prefix%'` and the
+# `word <% title` similarity operator used for fuzzy matches. The index is
+# built CONCURRENTLY so the table stays writable while it builds, which
+# cannot run inside a transaction: the migration is not atomic.
+POSTGRES_FORWARDS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS todo_todoitem_title_trgm_idx
+    ON todo_todoitem USING gin (title gin_trgm_ops)
+    """,
+]
+
+POSTGRES_BACKWARDS = [
+    "DROP INDEX CONCURRENTLY IF EXISTS todo_todoitem_title_trgm_idx",
+]
+
+# SQLite has no trigram support; a lower(title) expression index serves
+# case-insensitive prefix lookups as a range scan.
+SQLITE_FORWARDS = [
+    "CREATE INDEX todo_todoitem_title_lower_idx ON todo_todoitem (lower(title))",
+]
+
+SQLITE_BACKWARDS = [
+    "DROP INDEX IF EXISTS todo_todoitem_title_lower_idx",
+]
+
+STATEMENTS = {
+    "postgresql": (POSTGRES_FORWARDS, POSTGRES_BACKWARDS),
+    "sqlite": (SQLITE_FORWARDS, SQLITE_BACKWARDS),
+}
+
+
+def run_statements(index):
+    def run(apps, schema_editor):
+        statements = STATEMENTS.get(schema_editor.connection.vendor)
+        if statements is None:
+            return
+        for statement in statements[index]:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("todo", "0005_fulltext_search_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(run_statements(0), run_statements(1)),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.3 on 2026-10-16 21:10
+
+from django.contrib.postgres import operations
+from django.db import migrations, models
+
+
+class AddIndexConcurrently(operations.AddIndexConcurrently):
+    """``AddIndexConcurrently`` that builds a plain index off PostgreSQL."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+
+class RemoveIndexConcurrently(operations.RemoveIndexConcurrently):
+    """``RemoveIndexConcurrently`` that drops a plain index off PostgreSQL."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.RemoveIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.RemoveIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+
+class Migration(migrations.Migration):
+    # The indexes are built CONCURRENTLY on PostgreSQL so the todo table stays
+    # writable while they build, which cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("todo", "0006_title_autocomplete"),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name="todoitem",
+            name="todo_todoit_complet_1db831_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="todoitem",
+            name="todo_todoit_priorit_24b08a_idx",
+        ),
+        AddIndexConcurrently(
+            model_name="todoitem",
+            index=models.Index(
+                fields=["completed", "-created_at", "-id"],
+                name="todo_completed_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="todoitem",
+            index=models.Index(
+                fields=["priority", "-created_at", "-id"],
+                name="todo_priority_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="todoitem",
+            index=models.Index(
+                condition=models.Q(("completed", False)),
+                fields=["due_date"],
+                name="todo_incomplete_due_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="todoitem",
+            index=models.Index(
+                condition=models.Q(("completed", True)),
+                fields=["updated_at"],
+                name="todo_completed_updated_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-16 20:03
+
+import backend.todo.models
+from django.db import migrations, models
+
+
+def create_version(apps, schema_editor):
+    """Create the single version row."""
+    TodoTableVersion = apps.get_model("todo", "TodoTableVersion")
+    TodoTableVersion.objects.using(schema_editor.connection.alias).create(pk=1)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("todo", "0007_query_shape_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TodoTableVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "version",
+                    models.BigIntegerField(default=backend.todo.models.initial_version),
+                ),
+            ],
+        ),
+        migrations.RunPython(create_version, migrations.RunPython.noop),
+    ]
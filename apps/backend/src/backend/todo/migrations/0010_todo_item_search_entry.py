@@ -0,0 +1,34 @@
+# Generated by Django 6.1.2 on 2026-10-16 22:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("todo", "0009_todo_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TodoItemSearchEntry",
+            fields=[
+                (
+                    "item",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_entry",
+                        serialize=False,
+                        to="todo.todoitem",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "todo_todoitem_fts",
+                "managed": False,
+            },
+        ),
+    ]
@@ -1,9 +1,229 @@
-from django.db import models
+import time
+import weakref
+from collections import Counter
+from collections.abc import Collection, Iterable
+from django.db import IntegrityError, connections, models, router, transaction
 from django.core.validators import MinLengthValidator
 from datetime import datetime
+from typing import Any
 
 from django.db.models.manager import Manager
 
+from .signals import todo_table_changed
+
+# A (completed, priority) bucket of TodoCounter.
+Bucket = tuple[bool, str]
+
+PRIORITY_CHOICES = [
+    ("low", "Low"),
+    ("medium", "Medium"),
+    ("high", "High"),
+]
+
+# Fields whose values decide which TodoCounter bucket an item belongs to.
+COUNTED_FIELDS = frozenset({"completed", "priority"})
+
+
+class Publication:
+    """The post-commit work shared by every write of one transaction."""
+
+    done = False
+
+
+# The publication each connection's current transaction will run on commit.
+_pending_publish: "weakref.WeakKeyDictionary[Any, Publication]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def record_write(deltas: "Counter[Bucket]") -> None:
+    """
+    Propagate a TodoItem write to the state derived from the table.
+
+    Every write path on TodoItem (model save/delete and the queryset
+    update/delete/bulk_create overrides) calls this inside the transaction of
+    the write, with the net change per counter bucket. It updates the
+    counters and bumps the table version in that transaction, so they commit
+    or roll back with the write, and once the transaction commits it sends
+    ``todo_table_changed`` (the response cache subscribes to it). Writes that
+    bypass the ORM must call it too.
+
+    Like the counter rows, the version row stays locked until the writer
+    commits. The signal is sent once per transaction however many writes it
+    made: each write queues a callback, and the first one to run marks the
+    transaction's publication done for the others. Queuing one per write
+    keeps the publication when a savepoint rolls back the callbacks queued
+    inside it.
+    """
+    TodoCounter.objects.apply_deltas(deltas)
+    TodoTableVersion.objects.bump()
+    connection = transaction.get_connection()
+    publication = _pending_publish.setdefault(connection, Publication())
+
+    def publish() -> None:
+        if publication.done:
+            return
+        publication.done = True
+        _pending_publish.pop(connection, None)
+        todo_table_changed.send(sender=TodoItem)
+
+    transaction.on_commit(publish, robust=True)
+
+
+class TodoItemQuerySet(models.QuerySet["TodoItem"]):
+    """
+    QuerySet whose bulk writes keep TodoCounter in sync.
+
+    Bulk ``update()`` and ``delete()`` lock the matching rows, count them per
+    counter bucket and then run a single statement, so every row is written
+    exactly once and the counts tell how many items left (and, for updates,
+    entered) each bucket.
+    """
+
+    def _locked_bucket_counts(self) -> "Counter[Bucket]":
+        """
+        Lock the rows of this queryset and count them per counter bucket.
+
+        PostgreSQL refuses ``FOR UPDATE`` next to ``GROUP BY``, so the rows
+        are locked in a subquery. The outer query repeats this queryset's
+        filters so that both sides are read through the same index, rather
+        than the outer side scanning the whole table to probe the subquery.
+        Rows written outside the ORM may carry a priority outside the field
+        choices; they are counted under it and dropped by ``tracked()``.
+        """
+        locked = self.select_for_update().order_by().values("pk")
+        grouped = (
+            self.filter(pk__in=locked)
+            .order_by()
+            .values_list("completed", "priority")
+            .annotate(count=models.Count("pk"))
+        )
+        return Counter(
+            {(completed, priority): count for completed, priority, count in grouped}
+        )
+
+    def update(self, **kwargs: Any) -> int:
+        if not COUNTED_FIELDS.intersection(kwargs):
+            with transaction.atomic(using=self.db, savepoint=False):
+                updated = super().update(**kwargs)
+                record_write(Counter())
+            return updated
+
+        if any(
+            hasattr(kwargs.get(field), "resolve_expression") for field in COUNTED_FIELDS
+        ):
+            return self._update_expressions(**kwargs)
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            counts = self._locked_bucket_counts()
+            updated = super().update(**kwargs)
+            deltas: Counter[Bucket] = Counter()
+            for (completed, priority), count in counts.items():
+                deltas[(completed, priority)] -= count
+                target = (
+                    kwargs.get("completed", completed),
+                    kwargs.get("priority", priority),
+                )
+                deltas[target] += count
+            record_write(self.model.tracked(deltas))
+        return updated
+
+    def _update_expressions(self, **kwargs: Any) -> int:
+        """
+        Update with row-dependent counted fields (e.g. ``bulk_update`` CASEs).
+
+        The target bucket of each row is only known after the update, so the
+        affected rows are locked and their buckets read before and after.
+        """
+        with transaction.atomic(using=self.db, savepoint=False):
+            before = list(
+                self.select_for_update().values_list("pk", "completed", "priority")
+            )
+            updated = super().update(**kwargs)
+            pks = [pk for pk, _, _ in before]
+            after = self.model._base_manager.using(self.db).filter(pk__in=pks)
+            deltas = Counter(
+                (completed, priority)
+                for completed, priority in after.values_list("completed", "priority")
+            )
+            deltas.subtract((completed, priority) for _, completed, priority in before)
+            record_write(self.model.tracked(deltas))
+        return updated
+
+    def delete(self) -> tuple[int, dict[str, int]]:
+        with transaction.atomic(using=self.db, savepoint=False):
+            counts = self._locked_bucket_counts()
+            result = super().delete()
+            record_write(
+                self.model.tracked(
+                    Counter({bucket: -count for bucket, count in counts.items()})
+                )
+            )
+        return result
+
+    delete.alters_data = True  # type: ignore[attr-defined]
+    delete.queryset_only = True  # type: ignore[attr-defined]
+
+    def bulk_create(
+        self,
+        objs: Iterable[Any],
+        batch_size: int | None = None,
+        ignore_conflicts: bool = False,
+        update_conflicts: bool = False,
+        update_fields: Collection[str] | None = None,
+        unique_fields: Collection[str] | None = None,
+    ) -> list[Any]:
+        if ignore_conflicts or update_conflicts:
+            return self._bulk_create_on_conflict(
+                list(objs),
+                batch_size=batch_size,
+                ignore_conflicts=ignore_conflicts,
+                update_conflicts=update_conflicts,
+                update_fields=update_fields,
+                unique_fields=unique_fields,
+            )
+        with transaction.atomic(using=self.db, savepoint=False):
+            created = super().bulk_create(
+                objs,
+                batch_size=batch_size,
+                update_fields=update_fields,
+                unique_fields=unique_fields,
+            )
+            record_write(
+                self.model.tracked(
+                    Counter((item.completed, item.priority) for item in created)
+                )
+            )
+        return created
+
+    def _bulk_create_on_conflict(self, objs: list[Any], **kwargs: Any) -> list[Any]:
+        """
+        ``bulk_create()`` with ``ignore_conflicts`` or ``update_conflicts``.
+
+        Which rows get inserted, updated or skipped is only known after the
+        insert. The primary key is the only unique constraint of the table, so
+        items without one are always inserted, and the rows of the others are
+        locked and their buckets recounted before and after.
+        """
+        with transaction.atomic(using=self.db, savepoint=False):
+            inserted = Counter(
+                (item.completed, item.priority) for item in objs if item.pk is None
+            )
+            existing = self.model._base_manager.using(self.db).filter(
+                pk__in=[item.pk for item in objs if item.pk is not None]
+            )
+            before = Counter(
+                existing.select_for_update().values_list("completed", "priority")
+            )
+            created = super().bulk_create(objs, **kwargs)
+            deltas = inserted + Counter(existing.values_list("completed", "priority"))
+            deltas.subtract(before)
+            record_write(self.model.tracked(deltas))
+        return created
+
+
+TodoItemManager = Manager.from_queryset(TodoItemQuerySet)
+
 
 class TodoItem(models.Model):
     """A single todo item with title, description, completion status, and timestamps."""
@@ -30,33 +250,351 @@ class TodoItem(models.Model):
     )
     priority = models.CharField(
         max_length=10,
-        choices=[
-            ("low", "Low"),
-            ("medium", "Medium"),
-            ("high", "High"),
-        ],
+        choices=PRIORITY_CHOICES,
         default="medium",
         help_text="Priority level of this todo item",
     )
 
-    objects: Manager["TodoItem"] = Manager()
+    objects: TodoItemQuerySet = TodoItemManager()  # type: ignore[assignment]
     id: int
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["completed"]),
-            models.Index(fields=["priority"]),
             models.Index(fields=["due_date"]),
+            # Filtered list pages in the default newest-first order. These also
+            # serve plain completed/priority filters through their prefix.
+            models.Index(
+                fields=["completed", "-created_at", "-id"],
+                name="todo_completed_created_idx",
+            ),
+            models.Index(
+                fields=["priority", "-created_at", "-id"],
+                name="todo_priority_created_idx",
+            ),
+            # Overdue and upcoming lookups only ever consider incomplete items.
+            models.Index(
+                fields=["due_date"],
+                condition=models.Q(completed=False),
+                name="todo_incomplete_due_idx",
+            ),
+            # Archival of completed items by age.
+            models.Index(
+                fields=["updated_at"],
+                condition=models.Q(completed=True),
+                name="todo_completed_updated_idx",
+            ),
+            # Keyset pagination seeks on (ordering field, id).
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["updated_at", "id"]),
+            models.Index(fields=["priority", "id"]),
+            models.Index(fields=["title", "id"]),
         ]
 
     def __str__(self) -> str:
         status = "✓" if self.completed else "○"
         return f"{status} {self.title}"
 
+    @classmethod
+    def priority_choices(cls) -> list[tuple[str, str]]:
+        """Return the choices of the priority field."""
+        return PRIORITY_CHOICES
+
+    @classmethod
+    def tracked(cls, deltas: "Counter[Bucket]") -> "Counter[Bucket]":
+        """Drop deltas for buckets with a priority outside the field choices."""
+        priorities = {value for value, _ in cls.priority_choices()}
+        return Counter(
+            {
+                bucket: delta
+                for bucket, delta in deltas.items()
+                if bucket[1] in priorities
+            }
+        )
+
+    def _locked_bucket(self, using: str) -> Bucket | None:
+        """Lock this item's row and return its stored counter bucket."""
+        if self.pk is None:
+            return None
+        return (
+            type(self)
+            ._base_manager.using(using)
+            .select_for_update()
+            .filter(pk=self.pk)
+            .values_list("completed", "priority")
+            .first()
+        )
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        update_fields = kwargs.get("update_fields")
+        counted = update_fields is None or COUNTED_FIELDS.intersection(update_fields)
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            previous = self._locked_bucket(using) if counted else None
+            super().save(*args, **kwargs)
+            deltas: Counter[Bucket] = Counter()
+            if counted:
+                if previous is not None:
+                    deltas[previous] -= 1
+                deltas[(self.completed, self.priority)] += 1
+            record_write(self.tracked(deltas))
+
+    def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            previous = self._locked_bucket(using)
+            result = super().delete(*args, **kwargs)
+            deltas: Counter[Bucket] = Counter()
+            if previous is not None and result[0]:
+                deltas[previous] -= 1
+            record_write(self.tracked(deltas))
+        return result
+
     @property
     def is_overdue(self) -> bool:
         """Check if this todo item is overdue."""
         if not self.due_date or self.completed:
             return False
         return self.due_date < datetime.now().replace(tzinfo=self.due_date.tzinfo)
+
+
+class TodoItemSearchEntry(models.Model):
+    """
+    An item's row in the SQLite full-text table.
+
+    The FTS5 table is created by migration 0004 on SQLite only and kept in
+    sync by triggers, so the model is unmanaged. It lets the SQLite search
+    backend join the table to the todo table, which ``bm25()`` ranking needs.
+    """
+
+    item = models.OneToOneField(
+        TodoItem,
+        primary_key=True,
+        db_column="rowid",
+        db_constraint=False,
+        on_delete=models.DO_NOTHING,
+        related_name="search_entry",
+    )
+
+    class Meta:
+        managed = False
+        db_table = "todo_todoitem_fts"
+
+
+class TodoCounterManager(Manager["TodoCounter"]):
+    """Manager with the write and read paths of the counter buckets."""
+
+    def apply_deltas(self, deltas: "Counter[Bucket]") -> None:
+        """
+        Add ``deltas`` to the counter buckets.
+
+        Buckets are updated in a fixed order so concurrent writers always lock
+        counter rows in the same sequence and cannot deadlock each other.
+        """
+        for (completed, priority), delta in sorted(deltas.items()):
+            if not delta:
+                continue
+            updated = self.filter(completed=completed, priority=priority).update(
+                count=models.F("count") + delta
+            )
+            if not updated:
+                try:
+                    with transaction.atomic(using=self.db):
+                        self.create(completed=completed, priority=priority, count=delta)
+                except IntegrityError:
+                    # Another writer created the bucket first.
+                    self.filter(completed=completed, priority=priority).update(
+                        count=models.F("count") + delta
+                    )
+
+    def snapshot(self) -> dict[Bucket, int]:
+        """Return the count of every bucket in one constant-size query."""
+        return {
+            (completed, priority): count
+            for completed, priority, count in self.values_list(
+                "completed", "priority", "count"
+            )
+        }
+
+    async def asnapshot(self) -> dict[Bucket, int]:
+        """Async version of ``snapshot``."""
+        return {
+            (completed, priority): count
+            async for completed, priority, count in self.values_list(
+                "completed", "priority", "count"
+            )
+        }
+
+    def reconcile(self, dry_run: bool = False) -> dict[Bucket, tuple[int, int]]:
+        """
+        Recount every bucket from TodoItem and repair any drift.
+
+        Returns ``{bucket: (stored, actual)}`` for each bucket that was wrong.
+        On PostgreSQL the todo table is locked against writes for the
+        duration of the recount so the result cannot race concurrent writers.
+        """
+        with transaction.atomic(using=self.db):
+            connection = connections[self.db]
+            if connection.vendor == "postgresql" and not dry_run:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"LOCK TABLE {TodoItem._meta.db_table} IN SHARE MODE"
+                    )
+
+            actual: dict[Bucket, int] = {
+                (completed, priority): 0
+                for completed in (False, True)
+                for priority, _ in TodoItem.priority_choices()
+            }
+            grouped = (
+                TodoItem._base_manager.using(self.db)
+                .filter(priority__in=[p for _, p in actual])
+                .order_by()
+                .values_list("completed", "priority")
+                .annotate(count=models.Count("pk"))
+            )
+            for completed, priority, count in grouped:
+                actual[(completed, priority)] = count
+
+            stored = {
+                (completed, priority): count
+                for completed, priority, count in self.select_for_update().values_list(
+                    "completed", "priority", "count"
+                )
+            }
+            drift = {
+                bucket: (stored.get(bucket, 0), count)
+                for bucket, count in actual.items()
+                if stored.get(bucket) != count
+            }
+            if not dry_run:
+                for (completed, priority), (_, count) in drift.items():
+                    self.update_or_create(
+                        completed=completed,
+                        priority=priority,
+                        defaults={"count": count},
+                    )
+        return drift
+
+
+class TodoCounter(models.Model):
+    """
+    Denormalized number of todo items per (completed, priority) bucket.
+
+    Maintained transactionally by every TodoItem write path so statistics can
+    be read from a handful of rows instead of scanning the todo table.
+    """
+
+    completed = models.BooleanField()
+    priority = models.CharField(max_length=10)
+    count = models.BigIntegerField(default=0)
+
+    objects = TodoCounterManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["completed", "priority"], name="todo_counter_bucket_unique"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        status = "completed" if self.completed else "incomplete"
+        return f"{status}/{self.priority}: {self.count}"
+
+
+def initial_version() -> int:
+    """Start from the clock so versions never repeat if the table is recreated."""
+    return time.time_ns() // 1000
+
+
+class TodoTableVersionManager(models.Manager["TodoTableVersion"]):
+    """Manager with the write path of the todo table version."""
+
+    def bump(self) -> None:
+        """
+        Advance the version.
+
+        Called by ``record_write`` in the transaction of every write to the
+        todo table.
+        """
+        if self.filter(pk=1).update(version=models.F("version") + 1):
+            return
+        try:
+            with transaction.atomic(using=self.db):
+                self.create(pk=1)
+        except IntegrityError:
+            # Another writer created the row first.
+            self.filter(pk=1).update(version=models.F("version") + 1)
+
+
+class TodoTableVersion(models.Model):
+    """
+    Single-row version of the todo table, bumped by every TodoItem write.
+
+    Lets readers tell whether anything changed (e.g. to answer conditional
+    requests) with a primary-key lookup instead of scanning the table.
+    """
+
+    version = models.BigIntegerField(default=initial_version)
+
+    objects = TodoTableVersionManager()
+
+    def __str__(self) -> str:
+        return f"todo table version {self.version}"
+
+
+class ArchivedTodoItem(models.Model):
+    """A completed todo item moved out of the todo table by an archive run."""
+
+    # The id the item had in the todo table.
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True, null=True)
+    completed = models.BooleanField(default=True)
+    priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES)
+    due_date = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return f"archived {self.title}"
+
+
+class TodoArchiveRun(models.Model):
+    """
+    Progress of a chunked archive or purge of completed todo items.
+
+    A run covers the completed items (last updated before ``cutoff``, if set)
+    with ids up to ``max_pk``, the highest matching id when it started. It walks them in id
+    order and records in ``last_pk`` the end of the last batch it committed,
+    in the same transaction as the batch, so an interrupted run resumes right
+    after it.
+    """
+
+    ARCHIVE = "archive"
+    DELETE = "delete"
+    MODE_CHOICES = [
+        (ARCHIVE, "Move to the archive table"),
+        (DELETE, "Delete"),
+    ]
+
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES)
+    cutoff = models.DateTimeField(blank=True, null=True)
+    last_pk = models.BigIntegerField(default=0)
+    max_pk = models.BigIntegerField(default=0)
+    processed = models.BigIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self) -> str:
+        state = "finished" if self.finished_at else f"at id {self.last_pk}"
+        return f"{self.mode} run {self.pk}: {self.processed} items, {state}"
+
+    def items_condition(self) -> models.Q:
+        """Return the condition selecting the items this run removes."""
+        condition = models.Q(completed=True)
+        if self.cutoff is not None:
+            condition &= models.Q(updated_at__lt=self.cutoff)
+        return condition
@@ -0,0 +1,289 @@
+"""
+Pagination classes for the Todo application.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Model, Q, QuerySet
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+@dataclass(frozen=True)
+class KeysetCursor:
+    """Decoded position of a keyset cursor."""
+
+    ordering: str
+    value: Any
+    pk: int
+    reverse: bool
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque cursor pagination that seeks on ``(ordering field, id)``.
+
+    Unlike ``PageNumberPagination`` this never issues a ``COUNT(*)`` and never
+    uses ``OFFSET``. Each page is a single
+    ``WHERE (field, id) < (last_field, last_id) ORDER BY field, id LIMIT n``
+    query, which is a range scan on the matching ``(field, id)`` index no
+    matter how deep the page is.
+
+    The ordering is taken from the queryset, so it composes with
+    ``OrderingFilter`` and every other filter backend applied before
+    pagination. Only non-nullable fields listed in ``keyset_fields`` can be
+    used, because a seek predicate cannot order ``NULL`` values consistently.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    keyset_fields: tuple[str, ...] = ()
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(
+        self, queryset: Any, request: Request, view: Any = None
+    ) -> list[Any] | None:
+        page_queryset = self.get_page_queryset(queryset, request)
+        if page_queryset is None:
+            return None
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list[Any] | None:
+        """Like ``paginate_queryset``, fetching the page with the async ORM."""
+        page_queryset = self.get_page_queryset(queryset, request)
+        if page_queryset is None:
+            return None
+        return self.set_page([item async for item in page_queryset])
+
+    def get_page_queryset(
+        self, queryset: QuerySet, request: Request
+    ) -> QuerySet | None:
+        """Return the query for the requested page plus one lookahead row."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        if not self.page_size:
+            return None
+
+        self.model = queryset.model
+        self.ordering = self.get_ordering(queryset)
+        field = self.ordering.lstrip("-")
+        descending = self.ordering.startswith("-")
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor.reverse if self.cursor else False
+
+        # Walking backwards flips the scan direction; the page is re-reversed
+        # in set_page so results are always returned in the requested order.
+        if descending != reverse:
+            queryset = queryset.order_by(f"-{field}", "-pk")
+        else:
+            queryset = queryset.order_by(field, "pk")
+
+        if self.cursor is not None:
+            queryset = queryset.filter(
+                self.seek(
+                    field, descending != reverse, self.cursor.value, self.cursor.pk
+                )
+            )
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results: list[Any]) -> list[Any]:
+        """Trim the lookahead row from ``results`` and record the page links."""
+        cursor = self.cursor
+        reverse = cursor.reverse if cursor else False
+        has_more = len(results) > (self.page_size or 0)
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = results
+        return results
+
+    def get_ordering(self, queryset: QuerySet) -> str:
+        """Return the single keyset ordering applied to the queryset."""
+        ordering = [
+            str(term)
+            for term in (queryset.query.order_by or queryset.model._meta.ordering)
+            if str(term).lstrip("-") not in ("pk", "id")
+        ]
+        if len(ordering) != 1 or ordering[0].lstrip("-") not in self.keyset_fields:
+            raise ValidationError(
+                {
+                    "ordering": [
+                        "Cursor pagination supports ordering by a single field "
+                        f"from: {', '.join(self.keyset_fields)}."
+                    ]
+                }
+            )
+        return ordering[0]
+
+    @staticmethod
+    def seek(field: str, descending: bool, value: Any, pk: int) -> Q:
+        """
+        Build the predicate selecting rows after ``(value, pk)``.
+
+        The leading ``field <= value`` conjunct gives the planner an index
+        range bound; the disjunction resolves ties on ``field`` by ``pk``.
+        """
+        if descending:
+            return Q(**{f"{field}__lte": value}) & (
+                Q(**{f"{field}__lt": value}) | Q(**{field: value, "pk__lt": pk})
+            )
+        return Q(**{f"{field}__gte": value}) & (
+            Q(**{f"{field}__gt": value}) | Q(**{field: value, "pk__gt": pk})
+        )
+
+    def get_position(self, item: Model | dict[str, Any]) -> tuple[Any, int]:
+        """Return the ``(field value, pk)`` seek position of a result row."""
+        field = self.ordering.lstrip("-")
+        if isinstance(item, dict):
+            return item[field], item["id"]
+        return getattr(item, field), item.pk
+
+    def decode_cursor(self, request: Request) -> KeysetCursor | None:
+        """Decode the cursor query parameter, if present."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            ordering = payload["o"]
+            pk = int(payload["pk"])
+            reverse = bool(payload["r"])
+            model_field = self.model._meta.get_field(ordering.lstrip("-"))
+            value = model_field.to_python(payload["v"])
+        except (
+            AttributeError,
+            binascii.Error,
+            DjangoValidationError,
+            FieldDoesNotExist,
+            KeyError,
+            TypeError,
+            ValueError,
+        ) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+        # A cursor is only meaningful for the ordering it was issued under.
+        if ordering != self.ordering or value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return KeysetCursor(ordering=ordering, value=value, pk=pk, reverse=reverse)
+
+    def encode_cursor(self, item: Model | dict[str, Any], reverse: bool) -> str:
+        """Encode the position of ``item`` into an opaque cursor URL."""
+        value, pk = self.get_position(item)
+        payload = {
+            "o": self.ordering,
+            "v": value.isoformat() if hasattr(value, "isoformat") else value,
+            "pk": pk,
+            "r": int(reverse),
+        }
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        ).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Walked backwards past the start; restart from the first page.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view: Any) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            }
+        ]
+
+
+class TodoItemKeysetPagination(KeysetPagination):
+    """Keyset pagination over the orderable, non-nullable TodoItem fields."""
+
+    keyset_fields = ("created_at", "updated_at", "priority", "title")
+
+
+class TodoItemPageNumberPagination(PageNumberPagination):
+    """``PageNumberPagination`` that can also paginate with the async ORM."""
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list[Any] | None:
+        """Like ``paginate_queryset``, counting and fetching asynchronously."""
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        # Paginate a stand-in range of the right length so page validation and
+        # links work as usual, then fetch only the selected slice.
+        paginator = self.django_paginator_class(
+            range(await queryset.acount()), page_size
+        )
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+
+        bottom = (self.page.number - 1) * page_size
+        self.page.object_list = [
+            item async for item in queryset[bottom : bottom + page_size]
+        ]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        return list(self.page)
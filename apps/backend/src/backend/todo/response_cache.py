@@ -0,0 +1,196 @@
+"""
+Write-invalidated response cache for the todo API.
+
+Rendered read responses are stored in Django's cache under a key made of the
+action, the normalized request and a generation number. Every committed todo
+write bumps the generation (``invalidate`` receives the ``todo_table_changed``
+signal), which orphans all earlier entries at once; they are never served
+again and simply expire.
+
+Caching is opt-in per action through ``TODO_RESPONSE_CACHE_TTLS``. Entries
+are only invalidated by writes, so the TTL bounds how stale the
+time-dependent ``is_overdue``/``overdue`` values can get. With more than one
+worker process the cache must be shared (e.g. Redis) for invalidation to
+reach every worker.
+"""
+
+import hashlib
+import time
+from collections.abc import Awaitable, Callable
+from functools import wraps
+from typing import Any
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.http import HttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.utils.cache import get_conditional_response
+
+from backend.mysite.metrics import record_cache_lookup
+
+GENERATION_KEY = "todo:generation"
+COUNTER_KEY = "todo:response-cache:{action}:{outcome}"
+
+
+def get_cache() -> BaseCache:
+    """Return the cache backend holding todo responses."""
+    return caches[settings.TODO_RESPONSE_CACHE_ALIAS]
+
+
+def representation_key(request: Any) -> str:
+    """
+    Return everything that selects the representation of a read response.
+
+    Query parameters are sorted so equivalent URLs share one key.
+    """
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    return "\n".join(
+        [
+            request.get_host(),
+            request.path,
+            query,
+            request.META.get("HTTP_ACCEPT", ""),
+        ]
+    )
+
+
+def current_generation(cache: BaseCache) -> int:
+    """Return the current generation, creating it if it is missing."""
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Start from the clock so an evicted generation never repeats.
+        generation = time.time_ns() // 1000
+        if not cache.add(GENERATION_KEY, generation, timeout=None):
+            generation = cache.get(GENERATION_KEY, generation)
+    return generation
+
+
+def bump_generation() -> None:
+    """Invalidate every cached todo response."""
+    cache = get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns() // 1000, timeout=None)
+
+
+def invalidate(sender: Any, **kwargs: Any) -> None:
+    """``todo_table_changed`` receiver."""
+    bump_generation()
+
+
+def count(cache: BaseCache, action: str, outcome: str) -> None:
+    """Increment the hit or miss counter of ``action``."""
+    record_cache_lookup(action, outcome)
+    key = COUNTER_KEY.format(action=action, outcome=outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def response_cache_stats() -> dict[str, dict[str, int]]:
+    """Return ``{action: {"hits": n, "misses": n}}`` for every cached action."""
+    actions = list(settings.TODO_RESPONSE_CACHE_TTLS)
+    keys = {
+        (action, outcome): COUNTER_KEY.format(action=action, outcome=outcome)
+        for action in actions
+        for outcome in ("hits", "misses")
+    }
+    values = get_cache().get_many(list(keys.values()))
+    return {
+        action: {
+            outcome: values.get(keys[(action, outcome)], 0)
+            for outcome in ("hits", "misses")
+        }
+        for action in actions
+    }
+
+
+def lookup(action: str, request: Any) -> tuple[str, Any]:
+    """Return the cache key of ``request`` and its entry, if any."""
+    cache = get_cache()
+    digest = hashlib.sha256(representation_key(request).encode()).hexdigest()
+    key = f"todo:response:{action}:{current_generation(cache)}:{digest}"
+    entry = cache.get(key)
+    count(cache, action, "misses" if entry is None else "hits")
+    return key, entry
+
+
+def hit_response(request: Any, entry: Any) -> HttpResponse | None:
+    """Rebuild a cached response, honouring ``If-None-Match``."""
+    content, content_type, etag = entry
+    response = HttpResponse(content, content_type=content_type)
+    response["X-Cache"] = "HIT"
+    if etag is None:
+        return response
+    response["ETag"] = etag
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def store_when_rendered(response: Any, key: str, ttl: int) -> Any:
+    """Cache ``response`` under ``key`` once rendered, if it may be stored."""
+    if response.status_code == 200 and isinstance(response, SimpleTemplateResponse):
+
+        def store(rendered: HttpResponse) -> None:
+            if "no-store" in rendered.get("Cache-Control", ""):
+                return
+            get_cache().set(
+                key,
+                (rendered.content, rendered["Content-Type"], rendered.get("ETag")),
+                ttl,
+            )
+
+        response.add_post_render_callback(store)
+    response["X-Cache"] = "MISS"
+    return response
+
+
+def cached_response(method: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Serve a viewset read action from the response cache when it is enabled.
+
+    Hits are answered without running the view, including ``If-None-Match``
+    handling against the ETag stored with the entry. Misses run the view and
+    store the response once it has been rendered, if it is a 200 that is not
+    marked ``no-store``.
+    """
+
+    @wraps(method)
+    def wrapper(view: Any, request: Any, *args: Any, **kwargs: Any) -> Any:
+        ttl = settings.TODO_RESPONSE_CACHE_TTLS.get(view.action, 0)
+        if not ttl or request.method not in ("GET", "HEAD"):
+            return method(view, request, *args, **kwargs)
+
+        key, entry = lookup(view.action, request)
+        if entry is not None:
+            return hit_response(request, entry)
+        return store_when_rendered(method(view, request, *args, **kwargs), key, ttl)
+
+    return wrapper
+
+
+def acached_response(
+    action: str,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Any]]:
+    """``cached_response`` for the async view serving ``action``."""
+
+    def decorator(view: Callable[..., Awaitable[Any]]) -> Callable[..., Any]:
+        @wraps(view)
+        async def wrapper(request: Any, *args: Any, **kwargs: Any) -> Any:
+            ttl = settings.TODO_RESPONSE_CACHE_TTLS.get(action, 0)
+            if not ttl or request.method not in ("GET", "HEAD"):
+                return await view(request, *args, **kwargs)
+
+            # Cache backends are synchronous; Django's own async cache
+            # methods run them in a thread the same way.
+            key, entry = await sync_to_async(lookup)(action, request)
+            if entry is not None:
+                return hit_response(request, entry)
+            return store_when_rendered(await view(request, *args, **kwargs), key, ttl)
+
+        return wrapper
+
+    return decorator
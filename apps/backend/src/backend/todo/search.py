@@ -0,0 +1,136 @@
+"""
+Full-text search backends for todo items.
+
+Each backend filters a TodoItem queryset down to the items matching a query
+and annotates them with a ``search_rank`` (higher is more relevant). The
+backend is chosen from the ``TODO_SEARCH_BACKEND`` setting, or from the
+database vendor when that setting is empty.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import TodoItem, TodoItemSearchEntry
+
+# Name of the FTS5 table mirroring title/description on SQLite.
+SQLITE_FTS_TABLE = TodoItemSearchEntry._meta.db_table
+
+
+class SearchBackend(ABC):
+    """Base class for todo search backends."""
+
+    @abstractmethod
+    def search(self, queryset: QuerySet[TodoItem], query: str) -> QuerySet[TodoItem]:
+        """
+        Return the items of ``queryset`` matching ``query``.
+
+        Every match must be annotated with a float ``search_rank``, higher
+        for more relevant items; callers order by it.
+        """
+
+
+class ContainsSearchBackend(SearchBackend):
+    """
+    Case-insensitive substring search.
+
+    Always available, but compiles to ``ILIKE '%query%'`` and therefore scans
+    every row. Used on databases without a full-text index.
+    """
+
+    def search(self, queryset: QuerySet[TodoItem], query: str) -> QuerySet[TodoItem]:
+        return queryset.filter(
+            Q(title__icontains=query) | Q(description__icontains=query)
+        ).annotate(search_rank=Value(1.0, output_field=FloatField()))
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    PostgreSQL ``tsvector`` search.
+
+    Matches against the generated ``search_vector`` column (title weighted
+    above description), which is kept current by PostgreSQL on every write
+    and served by a GIN index. Every word of the query must match; operators
+    such as ``OR`` or ``-`` are read as plain words, as on SQLite.
+    """
+
+    config = "english"
+
+    def search(self, queryset: QuerySet[TodoItem], query: str) -> QuerySet[TodoItem]:
+        table = TodoItem._meta.db_table
+        tsquery = "plainto_tsquery(%s::regconfig, %s)"
+        params = (self.config, query)
+        matches = RawSQL(
+            f'"{table}"."search_vector" @@ {tsquery}',
+            params,
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f'ts_rank_cd("{table}"."search_vector", {tsquery})',
+            params,
+            output_field=FloatField(),
+        )
+        return queryset.filter(matches).annotate(search_rank=rank)
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    SQLite FTS5 search for local and test databases.
+
+    Matches against an external-content FTS5 table that triggers keep in sync
+    with ``todo_todoitem``. Every whitespace-separated term must match.
+    """
+
+    def search(self, queryset: QuerySet[TodoItem], query: str) -> QuerySet[TodoItem]:
+        match = self.to_match_expression(query)
+        if not match:
+            return queryset.annotate(
+                search_rank=Value(0.0, output_field=FloatField())
+            ).none()
+
+        # Join the FTS table once through ``search_entry``: bm25() is then
+        # computed for each match as part of the full-text query, where a
+        # subquery per row would recompute the query's statistics every time.
+        # It is lower for better matches; negate it so higher ranks first.
+        fts = f'"{SQLITE_FTS_TABLE}"'
+        return (
+            queryset.filter(search_entry__isnull=False)
+            .filter(RawSQL(f"{fts} MATCH %s", (match,), output_field=BooleanField()))
+            .annotate(
+                search_rank=RawSQL(
+                    f"-bm25({fts}, 2.0, 1.0)", (), output_field=FloatField()
+                )
+            )
+        )
+
+    @staticmethod
+    def to_match_expression(query: str) -> str:
+        """Quote each term so user input can never be FTS5 query syntax."""
+        terms = re.findall(r"\w+", query)
+        return " ".join(f'"{term}"' for term in terms)
+
+
+VENDOR_BACKENDS: dict[str, type[SearchBackend]] = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SQLiteSearchBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def _backend_for(path: str | None, vendor: str) -> SearchBackend:
+    if path:
+        return import_string(path)()
+    return VENDOR_BACKENDS.get(vendor, ContainsSearchBackend)()
+
+
+def get_search_backend(using: str = "default") -> SearchBackend:
+    """Return the configured search backend for the ``using`` database."""
+    return _backend_for(
+        getattr(settings, "TODO_SEARCH_BACKEND", None), connections[using].vendor
+    )
@@ -0,0 +1,300 @@
+"""
+Synthetic todo data for benchmarks and query plan checks.
+
+``generate`` yields batches of todo rows drawn from a ``SeedSpec``: the mix
+of priorities, the share of completed items, how due dates split between
+overdue, upcoming and none, how far back ``created_at`` goes, and how long
+descriptions are. Every batch has its own generator seeded from the spec's
+seed and the batch number, so the same spec always produces the same rows.
+
+``seed_items`` writes the batches with ``COPY`` on PostgreSQL (through the
+importer's ``write_copy``) and with a raw ``executemany`` INSERT elsewhere,
+both bypassing model instances. Both keep the counters in sync through
+``record_write``. Maintaining a dozen indexes (and, on SQLite, the full-text
+index trigger) row by row costs far more than the inserts themselves, so by
+default the secondary indexes are dropped for the load and rebuilt in one
+pass afterwards.
+"""
+
+import multiprocessing
+import random
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import cache, partial
+from typing import Any
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .importer import COPY_COLUMNS, BatchWriter, write_copy
+from .models import Bucket, TodoItem, record_write
+
+# Rows per generated batch. Part of the data definition: changing it changes
+# which rows a seed produces.
+BATCH_SIZE = 10_000
+
+WORDS = (
+    "review call email draft plan fix test deploy write read update clean "
+    "book order pay renew check prepare send schedule organise research "
+    "report invoice budget meeting groceries garden car dentist taxes slides "
+    "proposal release backlog roadmap contract newsletter website database"
+).split()
+CAPITALIZED_WORDS = [word.capitalize() for word in WORDS]
+
+
+@dataclass(frozen=True)
+class SeedSpec:
+    """The distributions synthetic todo items are drawn from."""
+
+    count: int
+    seed: int = 0
+    # Relative weight of each priority.
+    priority_weights: dict[str, float] = field(
+        default_factory=lambda: {"low": 1.0, "medium": 2.0, "high": 1.0}
+    )
+    completed_ratio: float = 0.3
+    # Relative weight of overdue, upcoming and no due date. Overdue dates lie
+    # up to ``due_days`` before ``anchor``, upcoming ones up to after it.
+    due_weights: dict[str, float] = field(
+        default_factory=lambda: {"overdue": 1.0, "upcoming": 3.0, "none": 6.0}
+    )
+    due_days: int = 30
+    # ``created_at`` is spread uniformly over this many days before ``anchor``.
+    history_days: int = 365
+    # Share of items with a description, and their maximum length.
+    description_ratio: float = 0.5
+    description_length: int = 200
+    anchor: datetime = field(default_factory=timezone.now)
+
+
+@cache
+def description_text(seed: int) -> str:
+    """Return the text descriptions are cut from."""
+    return " ".join(random.Random(seed).choices(WORDS, k=20_000))
+
+
+def batch_count(spec: SeedSpec) -> int:
+    return -(-spec.count // BATCH_SIZE)
+
+
+def generate_batch(spec: SeedSpec, number: int) -> list[dict[str, Any]]:
+    """Return batch ``number`` of ``spec``'s rows, keyed by ``COPY_COLUMNS``."""
+    start = number * BATCH_SIZE
+    size = min(BATCH_SIZE, spec.count - start)
+    history = spec.history_days * 86400
+    first_created = spec.anchor - timedelta(seconds=history)
+    interval = history / spec.count
+    due_span = spec.due_days * 86400
+    max_length = spec.description_length
+    text = description_text(spec.seed)
+    text_span = len(text) - max_length
+
+    rng = random.Random(f"{spec.seed}:{number}")
+    uniform = rng.random
+    # Categorical columns are drawn for the whole batch at once.
+    priorities = rng.choices(
+        list(spec.priority_weights), list(spec.priority_weights.values()), k=size
+    )
+    dues = rng.choices(list(spec.due_weights), list(spec.due_weights.values()), k=size)
+    first_words = rng.choices(CAPITALIZED_WORDS, k=size)
+    second_words = rng.choices(WORDS, k=size)
+    rows = []
+    for index in range(size):
+        completed = uniform() < spec.completed_ratio
+        # Items are created in id order, evenly over the history.
+        created_at = first_created + timedelta(
+            seconds=(start + index + uniform()) * interval
+        )
+        due = dues[index]
+        if due == "overdue":
+            due_date = spec.anchor - timedelta(seconds=uniform() * due_span)
+        elif due == "upcoming":
+            due_date = spec.anchor + timedelta(seconds=uniform() * due_span)
+        else:
+            due_date = None
+        description = None
+        if uniform() < spec.description_ratio:
+            offset = int(uniform() * text_span)
+            description = text[offset : offset + 1 + int(uniform() * max_length)]
+        rows.append(
+            {
+                "title": f"{first_words[index]} {second_words[index]} #{start + index}",
+                "description": description,
+                "completed": completed,
+                "priority": priorities[index],
+                "due_date": due_date,
+                "created_at": created_at,
+                # Completed items were last touched when completed.
+                "updated_at": created_at + (spec.anchor - created_at) * uniform()
+                if completed
+                else created_at,
+            }
+        )
+    return rows
+
+
+def generate(spec: SeedSpec) -> Iterator[list[dict[str, Any]]]:
+    """Yield all of ``spec``'s rows in batches."""
+    for number in range(batch_count(spec)):
+        yield generate_batch(spec, number)
+
+
+def write_insert(batch: list[dict[str, Any]], using: str) -> None:
+    """Write a batch with one parameterized INSERT per row via ``executemany``."""
+    connection = connections[using]
+    tz = connection.timezone
+
+    # adapt_datetimefield_value() without its per-value checks: generated
+    # datetimes are always aware.
+    def adapt(value: datetime | None) -> str | None:
+        if value is None:
+            return None
+        return str(value.astimezone(tz).replace(tzinfo=None))
+
+    columns = ", ".join(connection.ops.quote_name(name) for name in COPY_COLUMNS)
+    placeholders = ", ".join(["%s"] * len(COPY_COLUMNS))
+    sql = (
+        f"INSERT INTO {connection.ops.quote_name(TodoItem._meta.db_table)} "
+        f"({columns}) VALUES ({placeholders})"
+    )
+    deltas: Counter[Bucket] = Counter()
+    params = []
+    for row in batch:
+        deltas[(row["completed"], row["priority"])] += 1
+        params.append(
+            (
+                row["title"],
+                row["description"],
+                row["completed"],
+                row["priority"],
+                adapt(row["due_date"]),
+                adapt(row["created_at"]),
+                adapt(row["updated_at"]),
+            )
+        )
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+        # The INSERT bypasses the ORM, so propagate the write explicitly.
+        record_write(TodoItem.tracked(deltas))
+
+
+def get_seed_writer(using: str = "default") -> BatchWriter:
+    """Return the fastest writer of generated rows for the ``using`` database."""
+    if connections[using].vendor == "postgresql":
+        return write_copy
+    return write_insert
+
+
+@contextmanager
+def deferred_indexes(using: str = "default") -> Iterator[None]:
+    """
+    Drop the todo table's secondary indexes for the block, then rebuild them.
+
+    Primary keys and constraints stay. On SQLite the full-text insert trigger
+    is dropped too, and the full-text index is rebuilt from the table. The
+    indexes are rebuilt even if the block fails.
+    """
+    connection = connections[using]
+    table = TodoItem._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT indexname, indexdef FROM pg_indexes "
+                "WHERE schemaname = current_schema() AND tablename = %s "
+                "AND indexname NOT IN (SELECT conname FROM pg_constraint "
+                "WHERE conrelid = %s::regclass)",
+                [table, table],
+            )
+            indexes = cursor.fetchall()
+            triggers = []
+        elif connection.vendor == "sqlite":
+            cursor.execute(
+                "SELECT type, name, sql FROM sqlite_master WHERE tbl_name = %s "
+                "AND sql IS NOT NULL AND (type = 'index' OR name = %s)",
+                [table, f"{table}_fts_insert"],
+            )
+            rows = cursor.fetchall()
+            indexes = [(name, sql) for kind, name, sql in rows if kind == "index"]
+            triggers = [(name, sql) for kind, name, sql in rows if kind == "trigger"]
+        else:
+            indexes = triggers = []
+
+        for name, _ in triggers:
+            cursor.execute(f"DROP TRIGGER {connection.ops.quote_name(name)}")
+        for name, _ in indexes:
+            cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for _, sql in indexes + triggers:
+                cursor.execute(sql)
+            if triggers:
+                cursor.execute(
+                    f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')"
+                )
+
+
+@dataclass
+class SeedReport:
+    """Rows written so far and the time it took."""
+
+    created: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.created / self.elapsed if self.elapsed else 0.0
+
+
+def write_batch(spec: SeedSpec, number: int, using: str) -> int:
+    """Generate and write batch ``number`` of ``spec``; return its size."""
+    batch = generate_batch(spec, number)
+    get_seed_writer(using)(batch, using)
+    return len(batch)
+
+
+def write_batches(spec: SeedSpec, using: str, jobs: int) -> Iterator[int]:
+    """Write every batch, in ``jobs`` processes; yield each batch's size."""
+    numbers = range(batch_count(spec))
+    if jobs == 1:
+        for number in numbers:
+            yield write_batch(spec, number, using)
+        return
+    # Forked workers open their own connections; they must not inherit ours.
+    connections[using].close()
+    with multiprocessing.get_context("fork").Pool(jobs) as pool:
+        yield from pool.imap_unordered(partial(write_batch, spec, using=using), numbers)
+
+
+def seed_items(
+    spec: SeedSpec,
+    *,
+    using: str = "default",
+    jobs: int = 1,
+    defer_indexes: bool = True,
+    progress: Callable[[SeedReport], None] | None = None,
+) -> SeedReport:
+    """
+    Write the rows of ``spec``, one transaction per batch.
+
+    With ``jobs`` above 1, batches are generated and written by that many
+    worker processes over their own connections. They finish in any order,
+    but every batch holds the same rows as in a serial run. ``progress`` is
+    called after every batch. The elapsed time includes rebuilding the
+    deferred indexes.
+    """
+    report = SeedReport()
+    started = time.monotonic()
+    with deferred_indexes(using) if defer_indexes else nullcontext():
+        for size in write_batches(spec, using, jobs):
+            report.created += size
+            report.elapsed = time.monotonic() - started
+            if progress is not None:
+                progress(report)
+    report.elapsed = time.monotonic() - started
+    return report
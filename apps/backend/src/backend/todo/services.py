@@ -3,11 +3,14 @@ Business logic services for the Todo application.
 """
 
 from typing import Dict, Any, List, Optional
-from django.db.models import QuerySet, Q
+from django.db.models import Q, QuerySet
 from django.utils import timezone
 from datetime import datetime, timedelta
 
-from .models import TodoItem
+from .archival import archive_completed
+from .models import TodoArchiveRun, TodoItem
+from .search import get_search_backend
+from .stats import get_stats
 
 
 class TodoService:
@@ -32,38 +35,29 @@ class TodoService:
         return TodoItem.objects.filter(priority=priority)
 
     @staticmethod
-    def search_items(query: str) -> QuerySet[TodoItem]:
-        """Search todo items by title and description."""
-        return TodoItem.objects.filter(
-            Q(title__icontains=query) | Q(description__icontains=query)
-        )
+    def search_items(query: str, fulltext: bool = False) -> QuerySet[TodoItem]:
+        """
+        Search todo items by title and description.
+
+        Matches case-insensitive substrings by default. With ``fulltext`` the
+        query goes through the configured full-text search backend instead,
+        which matches whole words and returns the best matches first.
+        """
+        if not fulltext:
+            return TodoItem.objects.filter(
+                Q(title__icontains=query) | Q(description__icontains=query)
+            )
+        results = get_search_backend().search(TodoItem.objects.all(), query)
+        return results.order_by("-search_rank", "-id")
 
     @staticmethod
     def get_completion_stats() -> Dict[str, Any]:
         """Get comprehensive statistics about todo completion."""
-        total = TodoItem.objects.count()
-        completed = TodoItem.objects.filter(completed=True).count()
-        incomplete = total - completed
-
-        # Get overdue count
-        overdue = TodoService.get_overdue_items().count()
-
-        # Get priority breakdown
-        priority_stats = {}
-        priority_field = TodoItem._meta.get_field("priority")
-        if hasattr(priority_field, "choices") and priority_field.choices:
-            for priority, _ in priority_field.choices:
-                priority_stats[priority] = TodoItem.objects.filter(
-                    priority=priority
-                ).count()
-
+        stats = get_stats()
+        total = stats["total"]
         return {
-            "total": total,
-            "completed": completed,
-            "incomplete": incomplete,
-            "overdue": overdue,
-            "completion_rate": (completed / total * 100) if total > 0 else 0,
-            "by_priority": priority_stats,
+            **stats,
+            "completion_rate": (stats["completed"] / total * 100) if total > 0 else 0,
         }
 
     @staticmethod
@@ -75,9 +69,8 @@ class TodoService:
 
     @staticmethod
     def bulk_delete_completed() -> int:
-        """Delete all completed todo items."""
-        deleted_count, _ = TodoItem.objects.filter(completed=True).delete()
-        return deleted_count
+        """Delete all completed todo items, in batches."""
+        return archive_completed(TodoArchiveRun.DELETE, persist=False).processed
 
     @staticmethod
     def create_todo_item(
@@ -116,9 +109,8 @@ class TodoService:
 
     @staticmethod
     def archive_old_completed_items(days_old: int = 30) -> int:
-        """Archive (delete) completed items older than specified days."""
+        """Move completed items older than specified days to the archive table."""
         cutoff_date = timezone.now() - timedelta(days=days_old)
-        deleted_count, _ = TodoItem.objects.filter(
-            completed=True, updated_at__lt=cutoff_date
-        ).delete()
-        return deleted_count
+        return archive_completed(
+            TodoArchiveRun.ARCHIVE, cutoff_date, persist=False
+        ).processed
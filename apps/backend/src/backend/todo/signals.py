@@ -0,0 +1,8 @@
+"""Signals sent by the todo app."""
+
+from django.dispatch import Signal
+
+# Sent by ``record_write`` once a transaction that wrote to the todo table has
+# committed and the table version was bumped, once per transaction. ``sender``
+# is the TodoItem model; there are no other arguments.
+todo_table_changed = Signal()
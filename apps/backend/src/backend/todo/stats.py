@@ -0,0 +1,119 @@
+"""
+Aggregate statistics for todo items.
+"""
+
+from typing import Any
+
+from django.db.models import Count, Q, QuerySet
+from django.utils import timezone
+
+from .models import Bucket, TodoCounter, TodoItem
+
+
+def priority_choices() -> list[str]:
+    """Return the priority values defined on the TodoItem model."""
+    return [value for value, _ in TodoItem.priority_choices()]
+
+
+def get_stats(queryset: QuerySet[TodoItem] | None = None) -> dict[str, Any]:
+    """
+    Compute completion statistics for ``queryset``.
+
+    Unfiltered statistics are read from the maintained counters; anything
+    narrower falls back to a single aggregate query over the matching rows.
+    """
+    if queryset is None or not queryset.query.where:
+        return counter_stats()
+    return aggregate_stats(queryset)
+
+
+def counter_stats() -> dict[str, Any]:
+    """
+    Compute statistics for all todo items from the TodoCounter buckets.
+
+    Totals are a constant-size read of the counter rows. ``overdue`` depends
+    on the current time and cannot be maintained incrementally, so it is
+    still counted from the todo table with an index-backed query.
+    """
+    return build_counter_stats(
+        TodoCounter.objects.snapshot(), overdue_queryset().count()
+    )
+
+
+def aggregate_stats(queryset: QuerySet[TodoItem] | None = None) -> dict[str, Any]:
+    """
+    Compute completion statistics for ``queryset`` in a single query.
+
+    Every figure is a conditional ``COUNT`` in the same ``SELECT``, so the cost
+    is one round trip regardless of how many rows match, and no rows are
+    loaded into Python. ``overdue`` matches ``TodoItem.is_overdue``: incomplete
+    items whose due date has passed.
+    """
+    if queryset is None:
+        queryset = TodoItem.objects.all()
+    return build_aggregate_stats(queryset.order_by().aggregate(**stats_aggregates()))
+
+
+async def aget_stats(queryset: QuerySet[TodoItem] | None = None) -> dict[str, Any]:
+    """Async version of ``get_stats``."""
+    if queryset is None or not queryset.query.where:
+        return build_counter_stats(
+            await TodoCounter.objects.asnapshot(), await overdue_queryset().acount()
+        )
+    return build_aggregate_stats(
+        await queryset.order_by().aaggregate(**stats_aggregates())
+    )
+
+
+def overdue_queryset() -> QuerySet[TodoItem]:
+    """Return the incomplete items whose due date has passed."""
+    return TodoItem.objects.filter(completed=False, due_date__lt=timezone.now())
+
+
+def build_counter_stats(counts: dict[Bucket, int], overdue: int) -> dict[str, Any]:
+    """Build the statistics from counter buckets and the overdue count."""
+    priorities = priority_choices()
+    by_priority = {
+        priority: counts.get((False, priority), 0) + counts.get((True, priority), 0)
+        for priority in priorities
+    }
+    total = sum(by_priority.values())
+    completed = sum(counts.get((True, priority), 0) for priority in priorities)
+
+    return {
+        "total": total,
+        "completed": completed,
+        "incomplete": total - completed,
+        "overdue": overdue,
+        "by_priority": by_priority,
+    }
+
+
+def stats_aggregates() -> dict[str, Count]:
+    """Return the conditional counts computed by ``aggregate_stats``."""
+    priorities = priority_choices()
+    # Aliases must not shadow model fields referenced by the filters.
+    return {
+        "total_count": Count("pk"),
+        "completed_count": Count("pk", filter=Q(completed=True)),
+        "overdue_count": Count(
+            "pk", filter=Q(completed=False, due_date__lt=timezone.now())
+        ),
+        **{
+            f"{priority}_count": Count("pk", filter=Q(priority=priority))
+            for priority in priorities
+        },
+    }
+
+
+def build_aggregate_stats(row: dict[str, Any]) -> dict[str, Any]:
+    """Build the statistics from the row computed by ``stats_aggregates``."""
+    return {
+        "total": row["total_count"],
+        "completed": row["completed_count"],
+        "incomplete": row["total_count"] - row["completed_count"],
+        "overdue": row["overdue_count"],
+        "by_priority": {
+            priority: row[f"{priority}_count"] for priority in priority_choices()
+        },
+    }
@@ -1,12 +1,61 @@
-from django.test import TestCase
+import csv
+import json
+import math
+import re
+import tempfile
+from io import StringIO
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.http import StreamingHttpResponse
+from django.test import LiveServerTestCase, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
 from rest_framework.test import APITestCase
 from rest_framework import status
-from datetime import timedelta
-
-from backend.todo.models import TodoItem
+from datetime import UTC, datetime, timedelta
+from collections.abc import Callable
+from typing import Any
+
+from backend.mysite.querycount import Budget, QueryBudgetMixin
+from backend.todo import async_views
+from backend.todo.archival import archive_completed, process_run, start_run
+from backend.todo.autocomplete import (
+    PrefixAutocompleteBackend,
+    QueryBudgetExceeded,
+    is_query_canceled,
+    query_budget,
+)
+from backend.todo.benchmarks import LoadResult
+from backend.todo.importer import copy_value
+from backend.todo.loadtest import (
+    OPERATIONS,
+    build_report,
+    compare_reports,
+    regressions,
+)
+from backend.todo.models import (
+    ArchivedTodoItem,
+    TodoArchiveRun,
+    TodoCounter,
+    TodoItem,
+    TodoTableVersion,
+)
+from backend.todo.response_cache import response_cache_stats
+from backend.todo.seeding import BATCH_SIZE, SeedSpec, generate
+from backend.todo.services import TodoService
+from backend.todo.signals import todo_table_changed
+from backend.todo.views import TodoItemViewSet
 from backend.todo.serializers import (
+    TodoItemRowSerializer,
     TodoItemSerializer,
     TodoItemCreateSerializer,
     TodoItemUpdateSerializer,
@@ -156,6 +205,44 @@ class TodoItemSerializerTests(TestCase):
         self.assertIn("due_date", serializer.errors)
 
 
+class TodoServiceTests(TestCase):
+    """Test cases for TodoService business logic."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        TodoItem.objects.create(title="Low", priority="low")
+        TodoItem.objects.create(title="High", priority="high", completed=True)
+        TodoItem.objects.create(
+            title="Overdue",
+            priority="high",
+            due_date=timezone.now() - timedelta(days=1),
+        )
+
+    def test_get_completion_stats(self) -> None:
+        """Test that completion stats read the counters plus an overdue count."""
+        with self.assertNumQueries(2):
+            stats = TodoService.get_completion_stats()
+
+        self.assertEqual(
+            stats,
+            {
+                "total": 3,
+                "completed": 1,
+                "incomplete": 2,
+                "overdue": 1,
+                "completion_rate": 1 / 3 * 100,
+                "by_priority": {"low": 1, "medium": 0, "high": 2},
+            },
+        )
+
+    def test_get_completion_stats_empty(self) -> None:
+        """Test completion stats with no todo items."""
+        TodoItem.objects.all().delete()
+        stats = TodoService.get_completion_stats()
+        self.assertEqual(stats["total"], 0)
+        self.assertEqual(stats["completion_rate"], 0)
+
+
 class TodoItemAPITests(APITestCase):
     """Test cases for TodoItem API endpoints."""
 
@@ -285,6 +372,53 @@ class TodoItemAPITests(APITestCase):
         }
         self.assertEqual(data, expected_stats)
 
+    def test_stats_action_constant_queries(self) -> None:
+        """Test that stats runs a fixed number of queries regardless of rows."""
+        TodoItem.objects.create(
+            title="Overdue", due_date=timezone.now() - timedelta(days=1)
+        )
+        TodoItem.objects.create(
+            title="Overdue but done",
+            due_date=timezone.now() - timedelta(days=1),
+            completed=True,
+        )
+        url = reverse("todo:todoitem-stats")
+        # The ETag fingerprint, the counter snapshot and the overdue count.
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        data = response.json()
+        self.assertEqual(data["total"], 4)
+        self.assertEqual(data["completed"], 2)
+        self.assertEqual(data["overdue"], 1)
+
+        # Filtered stats fall back to a single aggregate query (after the ETag
+        # fingerprint).
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"completed": "false"})
+        self.assertEqual(response.json()["overdue"], 1)
+
+    def test_stats_action_respects_filters(self) -> None:
+        """Test that stats only counts items matching the active filters."""
+        url = reverse("todo:todoitem-stats")
+        response = self.client.get(url, {"priority": "high"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "total": 1,
+                "completed": 0,
+                "incomplete": 1,
+                "overdue": 0,
+                "by_priority": {"low": 0, "medium": 0, "high": 1},
+            },
+        )
+
+        response = self.client.get(url, {"search": "Todo 2"})
+        self.assertEqual(response.json()["total"], 1)
+        self.assertEqual(response.json()["completed"], 1)
+
     def test_complete_all_action(self) -> None:
         """Test POST /api/todo/items/complete_all/"""
         url = reverse("todo:todoitem-complete-all")
@@ -370,3 +504,1991 @@ class TodoItemAPITests(APITestCase):
         url = reverse("todo:todoitem-detail", kwargs={"pk": 99999})
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TodoItemCursorPaginationTests(APITestCase):
+    """Test cases for keyset (cursor) pagination on the list endpoint."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        self.url = reverse("todo:todoitem-list")
+        for index in range(45):
+            TodoItem.objects.create(
+                title=f"Todo {index:02d}",
+                priority=["low", "medium", "high"][index % 3],
+                completed=index % 2 == 0,
+            )
+
+    def walk(self, params: dict[str, str]) -> list[dict]:
+        """Follow next links from the first page and collect all results."""
+        response = self.client.get(self.url, {"pagination": "cursor", **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = []
+        while True:
+            data = response.json()
+            self.assertNotIn("count", data)
+            results.extend(data["results"])
+            if not data["next"]:
+                return results
+            response = self.client.get(data["next"])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_walks_every_item_once_in_order(self) -> None:
+        """Test that following next links visits every item in list order."""
+        results = self.walk({})
+        expected = list(TodoItem.objects.order_by("-created_at", "-id"))
+        self.assertEqual([item["id"] for item in results], [t.id for t in expected])
+
+    def test_first_page_has_no_count_query(self) -> None:
+        """Test that a cursor page is a single query with no COUNT."""
+        # The ETag fingerprint, then the page itself.
+        with self.assertNumQueries(2) as queries:
+            response = self.client.get(self.url, {"pagination": "cursor"})
+        self.assertNotIn("COUNT", queries.captured_queries[1]["sql"].upper())
+        self.assertEqual(len(response.json()["results"]), 20)
+        self.assertIsNone(response.json()["previous"])
+
+    def test_next_page_seeks_instead_of_offset(self) -> None:
+        """Test that following a cursor does not use OFFSET."""
+        first = self.client.get(self.url, {"pagination": "cursor"}).json()
+        with self.assertNumQueries(2) as queries:
+            self.client.get(first["next"])
+        self.assertNotIn("OFFSET", queries.captured_queries[1]["sql"].upper())
+
+    def test_ordering_by_title(self) -> None:
+        """Test that cursor pagination honours the ordering parameter."""
+        results = self.walk({"ordering": "title"})
+        titles = [item["title"] for item in results]
+        self.assertEqual(titles, sorted(titles))
+        self.assertEqual(len(titles), 45)
+
+    def test_filters_and_search(self) -> None:
+        """Test that cursor pagination composes with filter backends."""
+        results = self.walk({"completed": "true", "priority": "high"})
+        expected = TodoItem.objects.filter(completed=True, priority="high")
+        self.assertEqual({item["id"] for item in results}, {t.id for t in expected})
+
+        results = self.walk({"search": "Todo 1"})
+        self.assertEqual(
+            len(results), TodoItem.objects.filter(title__contains="1").count()
+        )
+
+    def test_previous_link(self) -> None:
+        """Test that previous links walk back to the same pages."""
+        first = self.client.get(self.url, {"pagination": "cursor"}).json()
+        second = self.client.get(first["next"]).json()
+        back = self.client.get(second["previous"]).json()
+        self.assertEqual(back["results"], first["results"])
+        self.assertIsNone(back["previous"])
+
+    def test_unsupported_ordering(self) -> None:
+        """Test that nullable ordering fields are rejected in cursor mode."""
+        response = self.client.get(
+            self.url, {"pagination": "cursor", "ordering": "due_date"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_cursor(self) -> None:
+        """Test that a malformed or mismatched cursor returns 404."""
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        first = self.client.get(self.url, {"pagination": "cursor"}).json()
+        response = self.client.get(f"{first['next']}&ordering=title")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_pagination_is_default(self) -> None:
+        """Test that page number pagination remains the default mode."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["count"], 45)
+
+
+class TodoCounterTests(APITestCase):
+    """Test cases for the incrementally maintained TodoCounter buckets."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        self.todo1 = TodoItem.objects.create(title="Todo 1", priority="high")
+        self.todo2 = TodoItem.objects.create(
+            title="Todo 2", priority="low", completed=True
+        )
+        self.todo3 = TodoItem.objects.create(title="Todo 3", priority="medium")
+
+    def assertCountersInSync(self) -> None:
+        """Assert the stored counters match a fresh recount of the table."""
+        self.assertEqual(TodoCounter.objects.reconcile(dry_run=True), {})
+
+    def test_create_and_update(self) -> None:
+        """Test that API create, update, complete and uncomplete are counted."""
+        response = self.client.post(
+            reverse("todo:todoitem-list"),
+            {"title": "New", "priority": "low"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertCountersInSync()
+
+        self.client.patch(
+            reverse("todo:todoitem-detail", kwargs={"pk": self.todo1.pk}),
+            {"priority": "low", "completed": True},
+            format="json",
+        )
+        self.assertCountersInSync()
+
+        self.client.post(
+            reverse("todo:todoitem-uncomplete", kwargs={"pk": self.todo2.pk})
+        )
+        self.assertCountersInSync()
+        self.client.post(
+            reverse("todo:todoitem-complete", kwargs={"pk": self.todo3.pk})
+        )
+        self.assertCountersInSync()
+        self.assertEqual(
+            TodoCounter.objects.snapshot()[(True, "low")], 1
+        )  # todo1 moved from incomplete/high
+
+    def test_destroy(self) -> None:
+        """Test that deleting an item decrements its bucket."""
+        self.client.delete(
+            reverse("todo:todoitem-detail", kwargs={"pk": self.todo2.pk})
+        )
+        self.assertCountersInSync()
+        self.assertEqual(TodoCounter.objects.snapshot()[(True, "low")], 0)
+
+    def test_bulk_actions(self) -> None:
+        """Test that complete_all and clear_completed are counted."""
+        self.client.post(reverse("todo:todoitem-complete-all"))
+        self.assertCountersInSync()
+        self.client.delete(reverse("todo:todoitem-clear-completed"))
+        self.assertCountersInSync()
+        self.assertEqual(sum(TodoCounter.objects.snapshot().values()), 0)
+
+    def test_service_paths(self) -> None:
+        """Test that the TodoService write paths are counted."""
+        TodoService.create_todo_item("Service", priority="high")
+        self.assertCountersInSync()
+        TodoService.update_todo_item(self.todo1.id, priority="medium")
+        self.assertCountersInSync()
+        TodoService.bulk_complete([self.todo1.id, self.todo3.id])
+        self.assertCountersInSync()
+        TodoItem.objects.filter(pk=self.todo1.pk).update(
+            updated_at=timezone.now() - timedelta(days=60)
+        )
+        self.assertEqual(TodoService.archive_old_completed_items(), 1)
+        self.assertCountersInSync()
+        self.assertEqual(TodoService.bulk_delete_completed(), 2)
+        self.assertCountersInSync()
+
+    def test_bulk_create_with_conflicts(self) -> None:
+        """Test that conflicting bulk_create inserts, skips and updates are counted."""
+        TodoItem.objects.bulk_create(
+            [
+                TodoItem(pk=self.todo1.pk, title="Skipped", priority="low"),
+                TodoItem(title="Inserted", priority="low"),
+            ],
+            ignore_conflicts=True,
+        )
+        self.assertCountersInSync()
+        self.assertEqual(TodoItem.objects.get(pk=self.todo1.pk).title, "Todo 1")
+
+        TodoItem.objects.bulk_create(
+            [
+                TodoItem(pk=self.todo1.pk, title="Todo 1", priority="low"),
+                TodoItem(title="Inserted", priority="high"),
+            ],
+            update_conflicts=True,
+            update_fields=["priority"],
+            unique_fields=["id"],
+        )
+        self.assertCountersInSync()
+        self.assertEqual(TodoItem.objects.get(pk=self.todo1.pk).priority, "low")
+
+    def test_bulk_update_writes_each_row_once(self) -> None:
+        """Test that a queryset update moving rows between buckets hits each once."""
+        self.assertEqual(TodoItem.objects.all().update(priority="high"), 3)
+        self.assertCountersInSync()
+        TodoItem.objects.all().update(
+            completed=True, title=Concat(F("title"), Value("!"))
+        )
+        self.assertEqual(
+            sorted(TodoItem.objects.values_list("title", flat=True)),
+            ["Todo 1!", "Todo 2!", "Todo 3!"],
+        )
+        self.assertCountersInSync()
+        self.assertEqual(TodoCounter.objects.snapshot()[(True, "high")], 3)
+
+    def test_bulk_create_and_bulk_update(self) -> None:
+        """Test that bulk_create and CASE-based bulk_update are counted."""
+        items = TodoItem.objects.bulk_create(
+            [TodoItem(title=f"Bulk {i}", priority="low") for i in range(5)]
+        )
+        self.assertCountersInSync()
+        for item in items:
+            item.priority = "high"
+            item.completed = True
+        TodoItem.objects.bulk_update(items, ["priority", "completed"])
+        self.assertCountersInSync()
+        self.assertEqual(TodoCounter.objects.snapshot()[(True, "high")], 5)
+
+    def test_stats_match_aggregate(self) -> None:
+        """Test that counter-backed stats equal the aggregate query."""
+        from backend.todo.stats import aggregate_stats, counter_stats
+
+        self.assertEqual(counter_stats(), aggregate_stats())
+
+    def test_reconcile_command(self) -> None:
+        """Test that the reconcile command detects and repairs drift."""
+        TodoCounter.objects.filter(completed=False, priority="high").update(count=42)
+
+        with self.assertRaises(CommandError):
+            call_command("reconcile_todo_counters", "--check", stdout=StringIO())
+
+        out = StringIO()
+        call_command("reconcile_todo_counters", stdout=out)
+        self.assertIn("incomplete/high: stored 42, actual 1", out.getvalue())
+        self.assertCountersInSync()
+
+        out = StringIO()
+        call_command("reconcile_todo_counters", "--check", stdout=out)
+        self.assertIn("in sync", out.getvalue())
+
+
+class TodoFullTextSearchTests(APITestCase):
+    """Test cases for the full-text search backend and list search mode."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        self.url = reverse("todo:todoitem-list")
+        self.groceries = TodoItem.objects.create(
+            title="Buy groceries", description="Milk, eggs and bread"
+        )
+        self.bread = TodoItem.objects.create(
+            title="Bake", description="Sourdough bread for the weekend"
+        )
+        self.taxes = TodoItem.objects.create(
+            title="File taxes", description="Before the deadline"
+        )
+
+    def test_search_items_matches_substrings_by_default(self) -> None:
+        """Test that search_items keeps its case-insensitive substring match."""
+        self.assertEqual(list(TodoService.search_items("ax")), [self.taxes])
+        self.assertEqual(list(TodoService.search_items("BUY GRO")), [self.groceries])
+        self.assertEqual(
+            {item.pk for item in TodoService.search_items("bread")},
+            {self.groceries.pk, self.bread.pk},
+        )
+
+    def test_search_items_ranks_title_matches_first(self) -> None:
+        """Test that search_items matches words and ranks title hits higher."""
+        self.taxes.title = "Bread budget"
+        self.taxes.save()
+
+        results = list(TodoService.search_items("bread", fulltext=True))
+        self.assertEqual(results[0], self.taxes)
+        self.assertEqual(
+            {item.pk for item in results},
+            {self.groceries.pk, self.bread.pk, self.taxes.pk},
+        )
+
+    def test_search_items_stems_words(self) -> None:
+        """Test that search_items matches word forms rather than substrings."""
+        self.assertEqual(
+            list(TodoService.search_items("baking", fulltext=True)), [self.bread]
+        )
+        self.assertEqual(
+            list(TodoService.search_items("taxed", fulltext=True)), [self.taxes]
+        )
+        self.assertEqual(list(TodoService.search_items("ax", fulltext=True)), [])
+
+    def test_index_follows_writes(self) -> None:
+        """Test that updates and deletes are reflected in search results."""
+        self.groceries.description = "Apples"
+        self.groceries.save()
+        self.assertEqual(list(TodoService.search_items("milk", fulltext=True)), [])
+        self.assertEqual(
+            list(TodoService.search_items("apples", fulltext=True)), [self.groceries]
+        )
+
+        self.groceries.delete()
+        self.assertEqual(list(TodoService.search_items("apples", fulltext=True)), [])
+
+    def test_search_items_ignores_query_syntax(self) -> None:
+        """Test that user input cannot inject full-text query syntax."""
+        self.assertEqual(
+            list(TodoService.search_items('"bread" OR NEAR(', fulltext=True)), []
+        )
+        # Operators are plain words that must match too.
+        self.assertEqual(
+            list(TodoService.search_items("bread OR nowhere", fulltext=True)), []
+        )
+        self.assertEqual(list(TodoService.search_items("", fulltext=True)), [])
+
+    def test_list_fulltext_mode(self) -> None:
+        """Test ?search_mode=fulltext on the list endpoint."""
+        response = self.client.get(
+            self.url, {"search": "bread", "search_mode": "fulltext"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(
+            {item["id"] for item in data["results"]},
+            {self.groceries.pk, self.bread.pk},
+        )
+
+    def test_list_fulltext_mode_with_filters_and_ordering(self) -> None:
+        """Test that full-text search composes with filters and ordering."""
+        self.bread.completed = True
+        self.bread.save()
+        response = self.client.get(
+            self.url,
+            {
+                "search": "bread",
+                "search_mode": "fulltext",
+                "completed": "false",
+                "ordering": "title",
+            },
+        )
+        self.assertEqual(
+            [item["id"] for item in response.json()["results"]], [self.groceries.pk]
+        )
+
+    def test_list_invalid_search_mode(self) -> None:
+        """Test that an unknown search mode is rejected."""
+        response = self.client.get(self.url, {"search": "x", "search_mode": "regex"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TodoAutocompleteTests(APITestCase):
+    """Test cases for the title autocomplete action."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        self.url = reverse("todo:todoitem-autocomplete")
+        self.groceries = TodoItem.objects.create(title="Buy groceries")
+        self.bulbs = TodoItem.objects.create(title="buy light bulbs")
+        self.taxes = TodoItem.objects.create(title="File taxes")
+
+    def test_prefix_matches_are_case_insensitive(self) -> None:
+        """Test that suggestions match the start of the title in any case."""
+        response = self.client.get(self.url, {"q": "BUY"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "results": [
+                    {"id": self.groceries.pk, "title": "Buy groceries"},
+                    {"id": self.bulbs.pk, "title": "buy light bulbs"},
+                ],
+                "timed_out": False,
+            },
+        )
+
+    def test_prefix_backend_folds_like_the_database(self) -> None:
+        """Test that prefixes are lowered the way the indexed titles are."""
+        school = TodoItem.objects.create(title="École supplies")
+        self.assertEqual(
+            PrefixAutocompleteBackend().suggest("ÉCOLE", 10),
+            [{"id": school.pk, "title": "École supplies"}],
+        )
+
+    def test_single_query(self) -> None:
+        """Test that a lookup costs one query and no count."""
+        # PostgreSQL sets the statement timeout in a savepoint around it.
+        queries = 5 if connection.vendor == "postgresql" else 1
+        with self.assertNumQueries(queries):
+            self.client.get(self.url, {"q": "buy"})
+
+    def test_limit(self) -> None:
+        """Test that limit caps the suggestions and is validated."""
+        response = self.client.get(self.url, {"q": "buy", "limit": "1"})
+        self.assertEqual(
+            [item["id"] for item in response.json()["results"]], [self.groceries.pk]
+        )
+
+        for limit in ("0", "26", "many"):
+            response = self.client.get(self.url, {"q": "buy", "limit": limit})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TODO_AUTOCOMPLETE_MIN_LENGTH=3)
+    def test_short_query_skips_database(self) -> None:
+        """Test that queries below the minimum length return nothing."""
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {"q": "bu"})
+        self.assertEqual(response.json(), {"results": [], "timed_out": False})
+
+    def test_query_budget_cancels_slow_queries(self) -> None:
+        """Test that a query running past its budget is interrupted."""
+        slow_query = (
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+            "SELECT count(*) FROM (SELECT i FROM n LIMIT 100000000)"
+        )
+        with self.assertRaises(QueryBudgetExceeded):
+            with query_budget(10), connection.cursor() as cursor:
+                cursor.execute(slow_query)
+
+        # The connection is usable again once the budget is lifted.
+        self.assertEqual(TodoItem.objects.count(), 3)
+
+    def test_only_cancellations_exceed_the_budget(self) -> None:
+        """Test that other PostgreSQL errors are not taken for a timeout."""
+        from django.db import OperationalError
+
+        class DriverError(Exception):
+            def __init__(self, sqlstate: str) -> None:
+                self.sqlstate = sqlstate
+
+        for sqlstate, canceled in (("57014", True), ("40P01", False), ("57P01", False)):
+            with self.subTest(sqlstate=sqlstate):
+                try:
+                    raise OperationalError() from DriverError(sqlstate)
+                except OperationalError as exc:
+                    self.assertEqual(is_query_canceled(exc), canceled)
+        self.assertFalse(is_query_canceled(OperationalError()))
+
+
+class TodoQueryPlanTests(APITestCase):
+    """
+    Test that hot queries are index-backed on a large table.
+
+    Every query a scenario runs against the todo table is re-run under
+    ``EXPLAIN`` and must not plan a sequential scan of it. The seeded data
+    keeps each scenario selective (few incomplete, due or high-priority
+    items), so a full scan would only be chosen for want of an index.
+    """
+
+    size = 10_000
+    table = TodoItem._meta.db_table
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Set up test data."""
+        now = timezone.now()
+        TodoItem.objects.bulk_create(
+            TodoItem(
+                title=f"Task {i:05d}",
+                completed=i % 20 != 0,
+                priority="high" if i % 100 == 0 else "low",
+                due_date=now + timedelta(days=i % 60 - 30) if i % 20 == 0 else None,
+            )
+            for i in range(cls.size)
+        )
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Rows inserted in this transaction sit in the GIN indexes'
+                # pending lists until a vacuum, which makes the planner shy
+                # away from the indexes; flush them as a vacuum would.
+                cursor.execute(
+                    """
+                    SELECT gin_clean_pending_list(i.indexrelid)
+                    FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    JOIN pg_am a ON a.oid = c.relam
+                    WHERE i.indrelid = %s::regclass AND a.amname = 'gin'
+                    """,
+                    [cls.table],
+                )
+            cursor.execute(f"ANALYZE {cls.table}")
+
+    def full_scans(self, sql: str) -> list[str]:
+        """Return the sequential scans of the todo table planned for ``sql``."""
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+                nodes = [cursor.fetchone()[0][0]["Plan"]]
+                scans = []
+                while nodes:
+                    node = nodes.pop()
+                    nodes.extend(node.get("Plans", []))
+                    if (
+                        node["Node Type"] == "Seq Scan"
+                        and node.get("Relation Name") == self.table
+                    ):
+                        scans.append(node["Node Type"])
+                return scans
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            details = [detail for *_, detail in cursor.fetchall()]
+        # SQLite names a scan after the alias (``U0``) when there is one. A
+        # scan is full unless it searches a range of an index; walking an
+        # index in order is only bounded when a LIMIT stops it early.
+        names = {self.table, *re.findall(rf'"{self.table}" "?(U\d+)"?', sql)}
+        limited = re.search(r"\bLIMIT \d+\s*$", sql) is not None
+        return [
+            detail
+            for detail in details
+            if detail.startswith("SCAN ")
+            and detail.split()[1] in names
+            and not (limited and " USING " in detail)
+        ]
+
+    def assertIndexed(self, run: Any) -> None:
+        """Assert that no query issued by ``run`` scans the whole todo table."""
+        with CaptureQueriesContext(connection) as context:
+            run()
+        statements = [
+            query["sql"]
+            for query in context.captured_queries
+            if self.table in query["sql"]
+            and query["sql"].lstrip().split()[0].upper()
+            in ("SELECT", "UPDATE", "DELETE")
+        ]
+        self.assertTrue(statements)
+        for sql in statements:
+            self.assertEqual(self.full_scans(sql), [], sql)
+
+    def test_service_queries(self) -> None:
+        """Test the TodoService read and write paths."""
+        now = timezone.now()
+        scenarios = {
+            "overdue": lambda: list(TodoService.get_overdue_items()),
+            "upcoming": lambda: list(TodoService.get_upcoming_items()),
+            "priority": lambda: list(TodoService.get_priority_items("high")),
+            # The default substring match is not indexed; full-text is.
+            "search": lambda: list(
+                TodoService.search_items("Task 00100", fulltext=True)
+            ),
+            "date_range": lambda: list(
+                TodoService.get_items_by_date_range(
+                    now - timedelta(days=2), now - timedelta(days=1)
+                )
+            ),
+            "bulk_complete": lambda: TodoService.bulk_complete([1, 21, 41]),
+            "archive": lambda: TodoService.archive_old_completed_items(),
+        }
+        for name, run in scenarios.items():
+            with self.subTest(name):
+                self.assertIndexed(run)
+
+    def test_viewset_queries(self) -> None:
+        """Test the list, retrieve and collection actions."""
+        list_url = reverse("todo:todoitem-list")
+        item = TodoItem.objects.get(title="Task 00100")
+        scenarios = {
+            "list_incomplete": (list_url, {"completed": "false"}),
+            "list_priority": (list_url, {"priority": "high"}),
+            "list_cursor": (list_url, {"pagination": "cursor"}),
+            "retrieve": (reverse("todo:todoitem-detail", args=[item.pk]), {}),
+            "stats": (reverse("todo:todoitem-stats"), {}),
+            "stats_incomplete": (
+                reverse("todo:todoitem-stats"),
+                {"completed": "false"},
+            ),
+            # Every title is similar to "Task ...", so only the number is
+            # selective enough for the trigram index to be worth using.
+            "autocomplete": (
+                reverse("todo:todoitem-autocomplete"),
+                {"q": "00100"},
+            ),
+        }
+        for name, (url, params) in scenarios.items():
+            with self.subTest(name):
+                self.assertIndexed(lambda: self.client.get(url, params))
+
+        with self.subTest("complete_all"):
+            self.assertIndexed(
+                lambda: self.client.post(reverse("todo:todoitem-complete-all"))
+            )
+
+
+class TodoBulkCreateTests(APITestCase):
+    """Test cases for the bulk_create action."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        self.url = reverse("todo:todoitem-bulk-create")
+
+    @override_settings(TODO_BULK_BATCH_SIZE=100)
+    def test_bulk_create_batches_inserts(self) -> None:
+        """Test that items are inserted with one statement per batch."""
+        payload = [{"title": f"Item {i}", "priority": "high"} for i in range(250)]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = response.json()
+        self.assertEqual(len(data), 250)
+        self.assertEqual(data[0]["title"], "Item 0")
+        self.assertEqual(
+            [item["id"] for item in data],
+            list(TodoItem.objects.order_by("id").values_list("id", flat=True)),
+        )
+        inserts = [
+            query
+            for query in context.captured_queries
+            if query["sql"].startswith('INSERT INTO "todo_todoitem"')
+        ]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(TodoService.get_completion_stats()["by_priority"]["high"], 250)
+
+    def test_bulk_create_reports_errors_per_item(self) -> None:
+        """Test that one invalid item rejects the request with indexed errors."""
+        payload = [
+            {"title": "Valid"},
+            {"title": "   "},
+            {"title": "Bad priority", "priority": "urgent"},
+        ]
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.json()
+        self.assertEqual(set(errors), {"1", "2"})
+        self.assertIn("title", errors["1"])
+        self.assertIn("priority", errors["2"])
+        self.assertFalse(TodoItem.objects.exists())
+
+    @override_settings(TODO_BULK_MAX_ITEMS=2)
+    def test_bulk_create_rejects_invalid_payloads(self) -> None:
+        """Test that non-list and oversized payloads are rejected."""
+        for payload in ({"title": "Not a list"}, [{"title": "x"}] * 3):
+            response = self.client.post(self.url, payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(TodoItem.objects.exists())
+
+
+class TodoBulkUpdateTests(APITestCase):
+    """Test cases for the bulk_update action."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        self.url = reverse("todo:todoitem-bulk-update")
+        TodoItem.objects.bulk_create(
+            TodoItem(title=f"Item {i}", priority="low") for i in range(5)
+        )
+        self.items = list(TodoItem.objects.order_by("id"))
+        TodoItem.objects.update(updated_at=timezone.now() - timedelta(days=1))
+
+    def test_bulk_update_applies_changes(self) -> None:
+        """Test that each entry updates its own item in a single UPDATE."""
+        payload = [
+            {"id": self.items[0].pk, "priority": "high"},
+            {"id": self.items[1].pk, "priority": "medium", "completed": True},
+            {"id": self.items[2].pk, "title": "  Renamed  "},
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.json()], [p["id"] for p in payload]
+        )
+        first, second, third, untouched, _ = TodoItem.objects.order_by("id")
+        self.assertEqual((first.priority, first.completed), ("high", False))
+        self.assertEqual((second.priority, second.completed), ("medium", True))
+        self.assertEqual((third.title, third.priority), ("Renamed", "low"))
+        self.assertEqual(first.updated_at, third.updated_at)
+        self.assertGreater(first.updated_at, untouched.updated_at)
+
+        updates = [
+            query
+            for query in context.captured_queries
+            if query["sql"].startswith('UPDATE "todo_todoitem"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn("CASE", updates[0]["sql"])
+
+        stats = TodoService.get_completion_stats()
+        self.assertEqual(stats["completed"], 1)
+        self.assertEqual(stats["by_priority"], {"low": 3, "medium": 1, "high": 1})
+
+    def test_bulk_update_allows_past_due_dates(self) -> None:
+        """Test that entries are validated as updates of existing items."""
+        past = (timezone.now() - timedelta(days=3)).isoformat()
+        response = self.client.post(
+            self.url, [{"id": self.items[0].pk, "due_date": past}], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bulk_update_reports_errors_per_item(self) -> None:
+        """Test that invalid entries reject the request with indexed errors."""
+        payload = [
+            {"id": self.items[0].pk, "priority": "high"},
+            {"id": 99999, "priority": "high"},
+            {"priority": "high"},
+            {"id": self.items[1].pk, "priority": "urgent"},
+            {"id": self.items[2].pk, "title": " "},
+        ]
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.json()
+        self.assertEqual(set(errors), {"1", "2", "3", "4"})
+        self.assertIn("id", errors["1"])
+        self.assertIn("id", errors["2"])
+        self.assertIn("priority", errors["3"])
+        self.assertIn("title", errors["4"])
+        self.assertFalse(TodoItem.objects.filter(priority="high").exists())
+
+    def test_bulk_update_rejects_duplicate_ids(self) -> None:
+        """Test that an item cannot be updated twice in one request."""
+        payload = [
+            {"id": self.items[0].pk, "priority": "high"},
+            {"id": self.items[0].pk, "priority": "medium"},
+        ]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(TodoItem.objects.exclude(priority="low").exists())
+
+    @override_settings(TODO_BULK_MAX_ITEMS=2)
+    def test_bulk_update_rejects_invalid_payloads_before_locking(self) -> None:
+        """Test that non-list and oversized payloads are rejected unqueried."""
+        oversized = [{"id": item.pk, "priority": "high"} for item in self.items]
+        for payload in ({"id": self.items[0].pk}, oversized):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(self.url, payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("non_field_errors", response.json())
+            self.assertFalse(
+                [q for q in context.captured_queries if "todo_todoitem" in q["sql"]]
+            )
+        self.assertFalse(TodoItem.objects.filter(priority="high").exists())
+
+
+class TodoExportTests(APITestCase):
+    """Test cases for the streaming export action."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        self.url = reverse("todo:todoitem-export")
+        self.todo1 = TodoItem.objects.create(
+            title="Todo, with comma",
+            description='Quote "this"',
+            priority="high",
+            due_date=timezone.now() + timedelta(days=1),
+        )
+        self.todo2 = TodoItem.objects.create(title="Todo 2", completed=True)
+
+    def export(self, params: dict[str, str]) -> Any:
+        """Request an export and return the response and its full body."""
+        response = self.client.get(self.url, params)
+        assert isinstance(response, StreamingHttpResponse)
+        body = b"".join(response.streaming_content).decode()
+        return response, body
+
+    def test_export_ndjson_matches_api_representation(self) -> None:
+        """Test that NDJSON rows match the fields returned by the API."""
+        response, body = self.export({})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn("todo-items.ndjson", response["Content-Disposition"])
+
+        rows = [json.loads(line) for line in body.splitlines()]
+        expected = TodoItemSerializer(
+            TodoItem.objects.order_by("-created_at"), many=True
+        ).data
+        self.assertEqual(
+            rows,
+            [
+                {key: value for key, value in item.items() if key != "is_overdue"}
+                for item in expected
+            ],
+        )
+
+    def test_export_applies_filters(self) -> None:
+        """Test that exports honour the list filters in a single query."""
+        with self.assertNumQueries(1):
+            _, body = self.export({"completed": "true"})
+        self.assertEqual(
+            [json.loads(line)["id"] for line in body.splitlines()], [self.todo2.pk]
+        )
+
+    def test_export_csv(self) -> None:
+        """Test that CSV exports have a header and round-trip values."""
+        response, body = self.export({"export_format": "csv", "ordering": "created_at"})
+        self.assertEqual(response["Content-Type"], "text/csv")
+
+        rows = list(csv.DictReader(StringIO(body)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["title"], "Todo, with comma")
+        self.assertEqual(rows[0]["description"], 'Quote "this"')
+        self.assertEqual(rows[0]["completed"], "false")
+        self.assertEqual(rows[1]["completed"], "true")
+        self.assertEqual(rows[1]["due_date"], "")
+
+    @override_settings(TODO_EXPORT_CHUNK_SIZE=2)
+    def test_export_streams_in_chunks(self) -> None:
+        """Test that rows are streamed one chunk at a time."""
+        TodoItem.objects.bulk_create(TodoItem(title=f"Item {i}") for i in range(4))
+        response = self.client.get(self.url)
+        assert isinstance(response, StreamingHttpResponse)
+        chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(sum(chunk.count(b"\n") for chunk in chunks), 6)
+
+    def test_export_invalid_format(self) -> None:
+        """Test that an unknown export format is rejected."""
+        response = self.client.get(self.url, {"export_format": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TodoImportTests(APITestCase):
+    """Test cases for the streaming import action and command."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        self.url = reverse("todo:todoitem-import-items")
+
+    def post(self, body: str, content_type: str) -> Any:
+        """POST a raw import body."""
+        return self.client.generic("POST", self.url, body, content_type=content_type)
+
+    def test_import_ndjson(self) -> None:
+        """Test that valid rows are validated like the API and imported."""
+        body = "\n".join(
+            [
+                json.dumps({"title": "  First  ", "priority": "high"}),
+                "",
+                json.dumps({"title": "Second", "completed": True}),
+            ]
+        )
+        response = self.post(body, "application/x-ndjson")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        report = response.json()
+        self.assertEqual((report["created"], report["rejected"]), (2, 0))
+        self.assertIn("rows_per_second", report)
+        first, second = TodoItem.objects.order_by("id")
+        self.assertEqual((first.title, first.priority), ("First", "high"))
+        self.assertEqual((second.priority, second.completed), ("medium", True))
+        self.assertIsNotNone(second.created_at)
+
+        stats = TodoService.get_completion_stats()
+        self.assertEqual((stats["total"], stats["completed"]), (2, 1))
+
+    def test_import_reports_rejected_rows(self) -> None:
+        """Test that invalid rows are skipped and reported by line number."""
+        body = "\n".join(
+            [
+                json.dumps({"title": "Good"}),
+                json.dumps({"title": "   "}),
+                "{not json",
+                json.dumps(["not", "an", "object"]),
+                json.dumps({"title": "Bad", "priority": "urgent"}),
+                json.dumps({"title": "Also good"}),
+            ]
+        )
+        report = self.post(body, "application/x-ndjson").json()
+
+        self.assertEqual((report["created"], report["rejected"]), (2, 4))
+        self.assertEqual([error["line"] for error in report["errors"]], [2, 3, 4, 5])
+        self.assertIn("title", report["errors"][0]["errors"])
+        self.assertIn("priority", report["errors"][3]["errors"])
+        self.assertEqual(
+            set(TodoItem.objects.values_list("title", flat=True)), {"Good", "Also good"}
+        )
+
+    @override_settings(TODO_IMPORT_MAX_ERRORS=1)
+    def test_import_caps_reported_errors(self) -> None:
+        """Test that only the first rejects are reported in detail."""
+        body = "\n".join(json.dumps({"title": ""}) for _ in range(3))
+        report = self.post(body, "application/x-ndjson").json()
+        self.assertEqual(report["rejected"], 3)
+        self.assertEqual(len(report["errors"]), 1)
+
+    def test_import_csv_round_trips_export(self) -> None:
+        """Test that a CSV export can be imported back."""
+        TodoItem.objects.create(title="Exported, once", priority="low", completed=True)
+        TodoItem.objects.create(
+            title="Due",
+            description="Multi\nline",
+            due_date=timezone.now() + timedelta(1),
+        )
+        response = self.client.get(
+            reverse("todo:todoitem-export"), {"export_format": "csv"}
+        )
+        assert isinstance(response, StreamingHttpResponse)
+        body = b"".join(response.streaming_content).decode()
+        TodoItem.objects.all().delete()
+
+        report = self.post(body, "text/csv").json()
+        self.assertEqual((report["created"], report["rejected"]), (2, 0))
+        exported = TodoItem.objects.get(title="Exported, once")
+        self.assertEqual((exported.priority, exported.completed), ("low", True))
+        self.assertIsNone(exported.description)
+        self.assertEqual(TodoItem.objects.get(title="Due").description, "Multi\nline")
+
+    def test_import_round_trips_overdue_items(self) -> None:
+        """Test that exported items with past due dates are imported back."""
+        due = timezone.now() - timedelta(days=3)
+        TodoItem.objects.create(title="Overdue", due_date=due)
+        TodoItem.objects.create(title="Done late", completed=True, due_date=due)
+        for export_format, content_type in (
+            ("ndjson", "application/x-ndjson"),
+            ("csv", "text/csv"),
+        ):
+            with self.subTest(export_format):
+                response = self.client.get(
+                    reverse("todo:todoitem-export"), {"export_format": export_format}
+                )
+                assert isinstance(response, StreamingHttpResponse)
+                body = b"".join(response.streaming_content).decode()
+                TodoItem.objects.all().delete()
+
+                report = self.post(body, content_type).json()
+                self.assertEqual((report["created"], report["rejected"]), (2, 0))
+                self.assertEqual(
+                    set(TodoItem.objects.values_list("title", "due_date")),
+                    {("Overdue", due), ("Done late", due)},
+                )
+
+    @override_settings(TODO_IMPORT_BATCH_SIZE=2)
+    def test_import_writes_in_batches(self) -> None:
+        """Test that rows are written one multi-row statement per batch."""
+        body = "\n".join(json.dumps({"title": f"Item {i}"}) for i in range(5))
+        with CaptureQueriesContext(connection) as context:
+            self.post(body, "application/x-ndjson")
+        statements = [query["sql"] for query in context.captured_queries]
+        # Every batch is one write, which bumps the table version once.
+        self.assertEqual(
+            sum(sql.startswith('UPDATE "todo_todotableversion"') for sql in statements),
+            3,
+        )
+        if connection.vendor != "postgresql":
+            # PostgreSQL writes with COPY, which bypasses the query log.
+            self.assertEqual(
+                sum(
+                    sql.startswith('INSERT INTO "todo_todoitem"') for sql in statements
+                ),
+                3,
+            )
+        self.assertEqual(TodoItem.objects.count(), 5)
+
+    def test_import_unsupported_content_type(self) -> None:
+        """Test that bodies other than NDJSON and CSV are rejected."""
+        response = self.post("[]", "application/json")
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_import_command(self) -> None:
+        """Test the import_todos management command."""
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as upload:
+            upload.write("title,priority\nFrom file,high\n,low\n")
+            upload.flush()
+            out, err = StringIO(), StringIO()
+            call_command("import_todos", upload.name, stdout=out, stderr=err)
+
+        self.assertIn("Imported 1 items, rejected 1", out.getvalue())
+        self.assertIn("line 3", err.getvalue())
+        self.assertEqual(TodoItem.objects.get().title, "From file")
+
+        with self.assertRaises(CommandError):
+            call_command("import_todos", "todos.txt")
+
+    def test_copy_value_escaping(self) -> None:
+        """Test the COPY text encoding used on PostgreSQL."""
+        self.assertEqual(copy_value(None), r"\N")
+        self.assertEqual(copy_value(True), "t")
+        self.assertEqual(copy_value("a\tb\\c\nd"), "a\\tb\\\\c\\nd")
+
+
+class TodoConditionalGetTests(APITestCase):
+    """Test cases for ETag and If-None-Match handling."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.todo = TodoItem.objects.create(title="Todo 1")
+        self.urls = [
+            reverse("todo:todoitem-list"),
+            reverse("todo:todoitem-detail", args=[self.todo.pk]),
+            reverse("todo:todoitem-stats"),
+        ]
+
+    def test_unchanged_poll_is_not_modified(self) -> None:
+        """Test that a matching If-None-Match costs one query and no body."""
+        for url in self.urls:
+            with self.subTest(url):
+                etag = self.client.get(url)["ETag"]
+                self.assertTrue(etag.startswith('"'))
+
+                with self.assertNumQueries(1):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response.content, b"")
+
+    def test_writes_change_the_etag(self) -> None:
+        """Test that every kind of write invalidates previous ETags."""
+        url = self.urls[0]
+        writes = [
+            lambda: TodoItem.objects.create(title="Todo 2"),
+            lambda: TodoItem.objects.filter(pk=self.todo.pk).update(title="Renamed"),
+            lambda: self.client.post(
+                reverse("todo:todoitem-complete", args=[self.todo.pk])
+            ),
+            lambda: TodoItem.objects.filter(title="Todo 2").delete(),
+        ]
+        for write in writes:
+            etag = self.client.get(url)["ETag"]
+            with self.captureOnCommitCallbacks(execute=True):
+                write()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_version_is_bumped_with_the_write(self) -> None:
+        """Test that the version commits or rolls back with the write."""
+        version = TodoTableVersion.objects.get().version
+        with transaction.atomic():
+            TodoItem.objects.create(title="Todo 2")
+            self.assertGreater(TodoTableVersion.objects.get().version, version)
+            transaction.set_rollback(True)
+        self.assertEqual(TodoTableVersion.objects.get().version, version)
+
+        sent: list[Any] = []
+
+        def receiver(sender: Any, **kwargs: Any) -> None:
+            sent.append(sender)
+
+        todo_table_changed.connect(receiver)
+        self.addCleanup(todo_table_changed.disconnect, receiver)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                with transaction.atomic():
+                    TodoItem.objects.create(title="Rolled back")
+                    transaction.set_rollback(True)
+                TodoItem.objects.create(title="Todo 2")
+                TodoItem.objects.filter(pk=self.todo.pk).update(title="Renamed")
+        self.assertGreater(TodoTableVersion.objects.get().version, version)
+        # The signal is sent once per transaction.
+        self.assertEqual(sent, [TodoItem])
+
+    def test_etag_depends_on_query_but_not_parameter_order(self) -> None:
+        """Test that ETags are per representation."""
+        url = self.urls[0]
+        etag = self.client.get(f"{url}?completed=false&priority=medium")["ETag"]
+        self.assertEqual(
+            self.client.get(f"{url}?priority=medium&completed=false")["ETag"], etag
+        )
+        self.assertNotEqual(self.client.get(f"{url}?completed=true")["ETag"], etag)
+
+    def test_item_becoming_overdue_changes_the_etag(self) -> None:
+        """Test that time-dependent fields are covered without a write."""
+        self.todo.due_date = timezone.now() + timedelta(hours=1)
+        self.todo.save()
+        etag = self.client.get(self.urls[1])["ETag"]
+
+        TodoItem.objects.filter(pk=self.todo.pk).update(
+            due_date=timezone.now() - timedelta(hours=1)
+        )
+        TodoTableVersion.objects.filter(pk=1).update(version=0)
+        response = self.client.get(self.urls[1], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.json()["is_overdue"])
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "todo-response-cache-tests",
+        }
+    },
+    TODO_RESPONSE_CACHE_TTLS={"list": 60, "retrieve": 0, "stats": 60},
+)
+class TodoResponseCacheTests(APITestCase):
+    """Test cases for the write-invalidated response cache."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        caches["default"].clear()
+        self.url = reverse("todo:todoitem-list")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.todo = TodoItem.objects.create(title="Todo 1")
+
+    def test_hit_skips_the_database(self) -> None:
+        """Test that a repeated read is served from the cache."""
+        first = self.client.get(self.url, {"completed": "false"})
+        self.assertEqual(first["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, {"completed": "false"})
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.url, {"completed": "false"}, HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_key_is_normalized_query(self) -> None:
+        """Test that parameter order is ignored but values are not."""
+        self.client.get(f"{self.url}?completed=false&priority=medium")
+        response = self.client.get(f"{self.url}?priority=medium&completed=false")
+        self.assertEqual(response["X-Cache"], "HIT")
+        response = self.client.get(f"{self.url}?priority=high&completed=false")
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_writes_invalidate_all_entries(self) -> None:
+        """Test that any committed write invalidates cached responses."""
+        stats_url = reverse("todo:todoitem-stats")
+        self.client.get(self.url)
+        self.client.get(stats_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, {"title": "Todo 2"}, format="json")
+
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["count"], 2)
+        response = self.client.get(stats_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["total"], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TodoService.bulk_complete([self.todo.pk])
+        self.assertEqual(self.client.get(stats_url).json()["completed"], 1)
+
+    def test_disabled_action_is_not_cached(self) -> None:
+        """Test that caching is opt-in per action."""
+        url = reverse("todo:todoitem-detail", args=[self.todo.pk])
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertNotIn("X-Cache", response)
+
+    def test_hit_and_miss_counters(self) -> None:
+        """Test that hits and misses are counted per action."""
+        for _ in range(3):
+            self.client.get(self.url)
+        stats = response_cache_stats()
+        self.assertEqual(stats["list"], {"hits": 2, "misses": 1})
+        self.assertEqual(stats["stats"], {"hits": 0, "misses": 0})
+
+
+class TodoRowSerializerTests(APITestCase):
+    """Test cases for the values()-based fast read path."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        caches["default"].clear()
+        self.url = reverse("todo:todoitem-list")
+        now = timezone.now()
+        TodoItem.objects.create(title="No due date", description="")
+        TodoItem.objects.create(
+            title="Overdue", description="Late", due_date=now - timedelta(days=1)
+        )
+        TodoItem.objects.create(
+            title="Done late",
+            completed=True,
+            priority="high",
+            due_date=now - timedelta(hours=1),
+        )
+        TodoItem.objects.create(
+            title="Upcoming", priority="low", due_date=now + timedelta(days=3)
+        )
+
+    def test_matches_model_serializer(self) -> None:
+        """Test that rows render to exactly the bytes of TodoItemSerializer."""
+        queryset = TodoItem.objects.order_by("id")
+        expected = JSONRenderer().render(TodoItemSerializer(queryset, many=True).data)
+        rows = TodoItemRowSerializer().serialize(
+            queryset.values(*TodoItemRowSerializer.fields)
+        )
+        self.assertEqual(JSONRenderer().render(rows), expected)
+        self.assertEqual(
+            [row["is_overdue"] for row in rows], [False, True, False, False]
+        )
+
+    def assertSameResponse(self, url: str, params: dict[str, str]) -> None:
+        """Assert the fast path returns the same body as the default path."""
+        with override_settings(TODO_FAST_SERIALIZER=False):
+            expected = self.client.get(url, params)
+        with override_settings(TODO_FAST_SERIALIZER=True):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response.get("ETag"), expected.get("ETag"))
+
+    def test_list_responses_are_identical(self) -> None:
+        """Test that every list mode is unchanged by the fast path."""
+        self.assertSameResponse(self.url, {})
+        self.assertSameResponse(self.url, {"ordering": "due_date"})
+        self.assertSameResponse(self.url, {"completed": "false", "page_size": "2"})
+        self.assertSameResponse(self.url, {"pagination": "cursor", "page_size": "2"})
+        self.assertSameResponse(self.url, {"search": "late"})
+
+    def test_retrieve_responses_are_identical(self) -> None:
+        """Test that retrieve, including 404s, is unchanged by the fast path."""
+        for todo in TodoItem.objects.all():
+            url = reverse("todo:todoitem-detail", args=[todo.pk])
+            self.assertSameResponse(url, {})
+        self.assertSameResponse(reverse("todo:todoitem-detail", args=[0]), {})
+
+    @override_settings(TODO_FAST_SERIALIZER=True)
+    def test_retrieve_non_numeric_pk_is_not_found(self) -> None:
+        """Test that the fast path answers 404, not 500, to a malformed pk."""
+        response = self.client.get(reverse("todo:todoitem-detail", args=["abc"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(TODO_FAST_SERIALIZER=True)
+    def test_list_query_count(self) -> None:
+        """Test that the fast path runs the same queries as the default."""
+        # The ETag fingerprint, the page count and the page itself.
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+
+
+class TodoAsyncViewTests(APITestCase):
+    """Test cases for the async list, retrieve and stats views."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        caches["default"].clear()
+        self.factory = RequestFactory()
+        self.url = reverse("todo:todoitem-list")
+        now = timezone.now()
+        for index in range(25):
+            TodoItem.objects.create(
+                title=f"Todo {index:02d}",
+                priority=["low", "medium", "high"][index % 3],
+                completed=index % 4 == 0,
+                due_date=now + timedelta(days=index - 10) if index % 2 else None,
+            )
+
+    def call(self, view: Any, request: Any, **kwargs: Any) -> Any:
+        """Run an async view and render its response."""
+        response = async_to_sync(view)(request, **kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    def assertSameResponse(
+        self, view: Any, path: str, params: dict[str, str], **kwargs: Any
+    ) -> None:
+        """Assert the async view answers exactly like the synchronous one."""
+        expected = self.client.get(path, params)
+        response = self.call(view, self.factory.get(path, params), **kwargs)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response.get("ETag"), expected.get("ETag"))
+        self.assertEqual(response["Content-Type"], expected["Content-Type"])
+
+    def test_list_matches_sync_view(self) -> None:
+        """Test that every list mode returns the synchronous view's response."""
+        for params in [
+            {},
+            {"page": "2"},
+            {"page": "last"},
+            {"page": "9"},
+            {"completed": "false", "ordering": "due_date"},
+            {"priority": "urgent"},
+            {"search": "Todo 1"},
+            {"pagination": "cursor"},
+            {"pagination": "cursor", "ordering": "title"},
+            {"cursor": "garbage"},
+        ]:
+            with self.subTest(params=params):
+                self.assertSameResponse(async_views.item_list, self.url, params)
+
+    def test_cursor_walk_matches_sync_view(self) -> None:
+        """Test that following async next links matches the sync pages."""
+        data = self.client.get(self.url, {"pagination": "cursor"}).json()
+        self.assertSameResponse(async_views.item_list, data["next"], {})
+
+    @override_settings(TODO_FAST_SERIALIZER=True)
+    def test_fast_serializer_matches_sync_view(self) -> None:
+        """Test that the async path also honours TODO_FAST_SERIALIZER."""
+        self.assertSameResponse(async_views.item_list, self.url, {})
+        todo = TodoItem.objects.first()
+        assert todo is not None
+        url = reverse("todo:todoitem-detail", args=[todo.pk])
+        self.assertSameResponse(async_views.item_detail, url, {}, pk=str(todo.pk))
+
+    def test_retrieve_matches_sync_view(self) -> None:
+        """Test that retrieve, including 404s, matches the sync view."""
+        todo = TodoItem.objects.first()
+        assert todo is not None
+        for pk in [str(todo.pk), "0"]:
+            url = reverse("todo:todoitem-detail", args=[pk])
+            self.assertSameResponse(async_views.item_detail, url, {}, pk=pk)
+
+    def test_stats_matches_sync_view(self) -> None:
+        """Test that counter-backed and filtered stats match the sync view."""
+        url = reverse("todo:todoitem-stats")
+        self.assertSameResponse(async_views.item_stats, url, {})
+        self.assertSameResponse(async_views.item_stats, url, {"priority": "high"})
+
+    def test_list_query_count(self) -> None:
+        """Test that the async list runs the same queries as the sync one."""
+        # The ETag fingerprint, the page count and the page itself.
+        with self.assertNumQueries(3):
+            self.call(async_views.item_list, self.factory.get(self.url))
+
+    def test_not_modified(self) -> None:
+        """Test that a matching If-None-Match is answered with 304."""
+        etag = self.client.get(self.url)["ETag"]
+        request = self.factory.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        response = self.call(async_views.item_list, request)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(TODO_RESPONSE_CACHE_TTLS={"list": 60})
+    def test_response_cache(self) -> None:
+        """Test that the async view shares the response cache."""
+        expected = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.call(async_views.item_list, self.factory.get(self.url))
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(response.content, expected.content)
+
+    def test_writes_are_delegated(self) -> None:
+        """Test that other methods are served by the synchronous viewset."""
+        request = self.factory.post(
+            self.url, {"title": "Async"}, content_type="application/json"
+        )
+        response = self.call(async_views.item_list, request)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        pk = response.data["id"]
+
+        url = reverse("todo:todoitem-detail", args=[pk])
+        request = self.factory.delete(url)
+        response = self.call(async_views.item_detail, request, pk=str(pk))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(TodoItem.objects.filter(pk=pk).exists())
+
+        request = self.factory.post(reverse("todo:todoitem-stats"))
+        response = self.call(async_views.item_stats, request)
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class TodoServerTimingTests(APITestCase):
+    """Test cases for the Server-Timing breakdown of todo requests."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        caches["default"].clear()
+        for index in range(5):
+            TodoItem.objects.create(title=f"Todo {index}", completed=index % 2 == 0)
+
+    def timings(self, response: Any) -> dict[str, str]:
+        """Parse the Server-Timing header into {metric: parameters}."""
+        metrics = {}
+        for metric in response["Server-Timing"].split(", "):
+            name, _, parameters = metric.partition(";")
+            metrics[name] = parameters
+        return metrics
+
+    @override_settings(SERVER_TIMING=False)
+    def test_disabled(self) -> None:
+        """Test that no header is added unless SERVER_TIMING is on."""
+        response = self.client.get(reverse("todo:todoitem-list"))
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(SERVER_TIMING=True)
+    def test_list_breakdown(self) -> None:
+        """Test that list reports view, db, serialize and render times."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("todo:todoitem-list"))
+        metrics = self.timings(response)
+        self.assertEqual(list(metrics), ["total", "view", "db", "serialize", "render"])
+        self.assertIn('desc="list"', metrics["view"])
+        self.assertIn(f'desc="{len(queries)} queries"', metrics["db"])
+
+    @override_settings(SERVER_TIMING=True)
+    def test_custom_actions(self) -> None:
+        """Test that custom actions are named in the breakdown."""
+        for method, name in [("get", "stats"), ("post", "complete_all")]:
+            with self.subTest(action=name):
+                response = getattr(self.client, method)(
+                    reverse(f"todo:todoitem-{name.replace('_', '-')}")
+                )
+                self.assertIn(f'desc="{name}"', self.timings(response)["view"])
+
+    @override_settings(SERVER_TIMING=True)
+    def test_log_line(self) -> None:
+        """Test that the breakdown is logged with structured fields."""
+        with self.assertLogs("backend.mysite.timing", "INFO") as logs:
+            self.client.get(reverse("todo:todoitem-stats"))
+        record = logs.records[0]
+        self.assertIn("action=stats", record.getMessage())
+        self.assertEqual(record.server_timing["action"], "stats")  # type: ignore[attr-defined]
+        self.assertEqual(record.server_timing["status"], 200)  # type: ignore[attr-defined]
+
+    def test_async_view_reports_action(self) -> None:
+        """Test that the async views report their action and view time."""
+        from backend.mysite.timing import (
+            RequestTiming,
+            current_timing,
+            install_query_timer,
+        )
+
+        # Normally done by ServerTimingMiddleware on startup.
+        install_query_timer(connection=connection)
+
+        async def serve() -> RequestTiming:
+            timing = RequestTiming()
+            current_timing.set(timing)
+            request = RequestFactory().get(reverse("todo:todoitem-list"))
+            await async_views.item_list(request)
+            return timing
+
+        timing = async_to_sync(serve)()
+        self.assertEqual(timing.action, "list")
+        self.assertIn("view", timing.durations)
+        self.assertGreater(timing.queries, 0)
+
+
+def call_api(
+    method: str, name: str, detail: bool = False, status_code: int = 200, **kwargs: Any
+) -> Any:
+    """Return a budget scenario requesting the ``todo:todoitem-<name>`` URL."""
+
+    def run(test: Any) -> Any:
+        url = reverse(f"todo:todoitem-{name}", args=[test.pk] if detail else [])
+        response = getattr(test.client, method)(url, **kwargs)
+        test.assertEqual(response.status_code, status_code, name)
+        if isinstance(response, StreamingHttpResponse):
+            response.getvalue()
+        return response
+
+    return run
+
+
+def archive_batches(days_old: int | None = None) -> Callable[[Any], int]:
+    """
+    Return how many archive batches a run over the completed items will take.
+
+    ``days_old`` limits the run to the items last updated before that many
+    days ago, as ``TodoService.archive_old_completed_items`` does.
+    """
+
+    def batches(test: Any) -> int:
+        items = TodoItem.objects.filter(completed=True)
+        if days_old is not None:
+            items = items.filter(
+                updated_at__lt=timezone.now() - timedelta(days=days_old)
+            )
+        return math.ceil(items.count() / settings.TODO_ARCHIVE_BATCH_SIZE)
+
+    return batches
+
+
+# Queries per archive batch by mode. PostgreSQL moves a batch with a single
+# DELETE ... RETURNING; SQLite copies it first in archive mode and locks and
+# counts it before deleting.
+BATCH_QUERIES = {
+    "delete": {"sqlite": 7, "postgresql": 6},
+    "archive": {"sqlite": 8, "postgresql": 6},
+}
+
+
+def first_page(queryset: Any) -> list[Any]:
+    """Evaluate ``queryset`` the way the API pages it."""
+    return list(queryset[: api_settings.PAGE_SIZE])
+
+
+@override_settings(TODO_ARCHIVE_BATCH_SIZE=50)
+class TodoQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """
+    Test the query budget of every viewset action and service method.
+
+    Every scenario must run a fixed number of queries and fetch a fixed
+    number of rows whatever the size of the table, apart from a fixed cost
+    per batch for the archive and purge scenarios; the batch size is small
+    enough that every seeded size takes a different number of batches. Add a
+    budget here for every new action or service method;
+    ``test_every_endpoint_has_budget`` fails until there is one.
+    """
+
+    budgets = {
+        "list": Budget(call_api("get", "list"), queries=3, rows=22),
+        "list:filtered": Budget(
+            call_api("get", "list", data={"completed": "false", "priority": "high"}),
+            queries=3,
+            rows=22,
+        ),
+        "list:search": Budget(
+            call_api("get", "list", data={"search": "Task 0001"}),
+            queries=3,
+            rows=13,
+        ),
+        "list:cursor": Budget(
+            call_api("get", "list", data={"pagination": "cursor"}),
+            queries=2,
+            rows=22,
+        ),
+        "retrieve": Budget(call_api("get", "detail", detail=True), queries=2, rows=2),
+        "create": Budget(
+            call_api(
+                "post", "list", status_code=201, data={"title": "New"}, format="json"
+            ),
+            queries=3,
+            rows=1,
+        ),
+        "update": Budget(
+            call_api(
+                "put", "detail", detail=True, data={"title": "Renamed"}, format="json"
+            ),
+            queries=4,
+            rows=2,
+        ),
+        "partial_update": Budget(
+            call_api(
+                "patch", "detail", detail=True, data={"completed": True}, format="json"
+            ),
+            queries=4,
+            rows=2,
+        ),
+        "destroy": Budget(
+            call_api("delete", "detail", detail=True, status_code=204),
+            queries=5,
+            rows=2,
+        ),
+        "bulk_create": Budget(
+            call_api(
+                "post",
+                "bulk-create",
+                status_code=201,
+                data=[{"title": f"New {i}"} for i in range(10)],
+                format="json",
+            ),
+            queries=3,
+            rows=10,
+        ),
+        "bulk_update": Budget(
+            lambda test: call_api(
+                "post",
+                "bulk-update",
+                data=[{"id": pk, "completed": True} for pk in test.ids],
+                format="json",
+            )(test),
+            queries=11,
+            rows=30,
+        ),
+        "complete": Budget(
+            call_api("post", "complete", detail=True), queries=4, rows=2
+        ),
+        "uncomplete": Budget(
+            call_api("post", "uncomplete", detail=True), queries=6, rows=2
+        ),
+        "stats": Budget(call_api("get", "stats"), queries=3, rows=8),
+        "stats:filtered": Budget(
+            call_api("get", "stats", data={"priority": "high"}), queries=2, rows=2
+        ),
+        "autocomplete": Budget(
+            call_api("get", "autocomplete", data={"q": "Task 00"}),
+            # PostgreSQL sets the statement timeout in a savepoint around it.
+            queries={"sqlite": 1, "postgresql": 5},
+            rows={"sqlite": 10, "postgresql": 11},
+        ),
+        "export": Budget(call_api("get", "export"), queries=1, rows=None),
+        "import_items": Budget(
+            call_api(
+                "post",
+                "import-items",
+                data="\n".join(json.dumps({"title": f"Row {i}"}) for i in range(10)),
+                content_type="application/x-ndjson",
+            ),
+            # PostgreSQL loads the rows with COPY, which returns no ids.
+            queries={"sqlite": 3, "postgresql": 4},
+            rows={"sqlite": 10, "postgresql": 0},
+        ),
+        "complete_all": Budget(call_api("post", "complete-all"), queries=7, rows=2),
+        "clear_completed": Budget(
+            call_api("delete", "clear-completed"),
+            queries=1,
+            rows=1,
+            batches=archive_batches(),
+            batch_queries=BATCH_QUERIES["delete"],
+            batch_rows=2,
+        ),
+        "TodoService.get_overdue_items": Budget(
+            lambda test: first_page(TodoService.get_overdue_items()),
+            queries=1,
+            rows=20,
+        ),
+        "TodoService.get_upcoming_items": Budget(
+            lambda test: first_page(TodoService.get_upcoming_items()),
+            queries=1,
+            rows=20,
+        ),
+        "TodoService.get_priority_items": Budget(
+            lambda test: first_page(TodoService.get_priority_items("high")),
+            queries=1,
+            rows=20,
+        ),
+        "TodoService.search_items": Budget(
+            lambda test: first_page(TodoService.search_items("Task")),
+            queries=1,
+            rows=20,
+        ),
+        "TodoService.search_items:fulltext": Budget(
+            lambda test: first_page(TodoService.search_items("Task", fulltext=True)),
+            queries=1,
+            rows=20,
+        ),
+        "TodoService.get_completion_stats": Budget(
+            lambda test: TodoService.get_completion_stats(), queries=2, rows=7
+        ),
+        "TodoService.bulk_complete": Budget(
+            lambda test: TodoService.bulk_complete(test.ids), queries=7, rows=2
+        ),
+        "TodoService.bulk_delete_completed": Budget(
+            lambda test: TodoService.bulk_delete_completed(),
+            queries=1,
+            rows=1,
+            batches=archive_batches(),
+            batch_queries=BATCH_QUERIES["delete"],
+            batch_rows=2,
+        ),
+        "TodoService.create_todo_item": Budget(
+            lambda test: TodoService.create_todo_item("New"), queries=3, rows=1
+        ),
+        "TodoService.update_todo_item": Budget(
+            lambda test: TodoService.update_todo_item(test.pk, completed=True),
+            queries=4,
+            rows=2,
+        ),
+        "TodoService.get_items_by_date_range": Budget(
+            lambda test: first_page(
+                TodoService.get_items_by_date_range(
+                    timezone.now() - timedelta(days=1), timezone.now()
+                )
+            ),
+            queries=1,
+            rows=20,
+        ),
+        "TodoService.archive_old_completed_items": Budget(
+            lambda test: TodoService.archive_old_completed_items(),
+            queries=1,
+            rows=1,
+            batches=archive_batches(days_old=30),
+            batch_queries=BATCH_QUERIES["archive"],
+            batch_rows=2,
+        ),
+    }
+
+    def seed(self, count: int) -> None:
+        """Add ``count`` items mixing every priority, state and due date."""
+        start = TodoItem.objects.count()
+        now = timezone.now()
+        priorities = [value for value, _ in TodoItem.priority_choices()]
+        created = TodoItem.objects.bulk_create(
+            TodoItem(
+                title=f"Task {i:05d}",
+                description=f"Description {i}" if i % 2 else "",
+                completed=i % 3 == 0,
+                priority=priorities[i % len(priorities)],
+                due_date=now + timedelta(days=i % 10 - 4) if i % 4 else None,
+            )
+            for i in range(start, start + count)
+        )
+        # Half the completed items are old enough to be archived.
+        TodoItem.objects.filter(
+            pk__in=[item.pk for item in created[::2] if item.completed]
+        ).update(updated_at=now - timedelta(days=60))
+
+    def prepare(self) -> None:
+        """Pick the items the detail and bulk scenarios act on."""
+        self.ids = list(
+            TodoItem.objects.order_by("pk").values_list("pk", flat=True)[:10]
+        )
+        self.pk = self.ids[0]
+
+    def test_every_endpoint_has_budget(self) -> None:
+        """Test that every viewset action and service method is budgeted."""
+        actions = {"list", "retrieve", "create", "update", "partial_update", "destroy"}
+        actions.update(
+            action.__name__ for action in TodoItemViewSet.get_extra_actions()
+        )
+        methods = {
+            f"TodoService.{name}"
+            for name in vars(TodoService)
+            if not name.startswith("_")
+        }
+        budgeted = {name.split(":")[0] for name in self.budgets}
+        self.assertEqual((actions | methods) - budgeted, set())
+
+
+class TodoLoadReportTests(TestCase):
+    """Test cases for load test reports and their comparison."""
+
+    def test_build_and_compare_reports(self) -> None:
+        """Test per-operation summaries and regressions between two runs."""
+        baseline = build_report(
+            {
+                "list": LoadResult(elapsed=2.0, latencies=[0.01] * 99 + [0.1]),
+                "stats": LoadResult(elapsed=2.0, errors=1, latencies=[0.02] * 10),
+            },
+            target="test",
+        )
+        self.assertEqual(baseline["target"], "test")
+        self.assertEqual(
+            baseline["operations"]["list"],
+            {
+                "requests": 100,
+                "errors": 0,
+                "requests_per_second": 50.0,
+                "p50_ms": 10.0,
+                "p95_ms": 10.0,
+                "p99_ms": 99.1,
+            },
+        )
+        self.assertEqual(baseline["total"]["requests"], 110)
+        self.assertEqual(baseline["total"]["errors"], 1)
+
+        current = json.loads(json.dumps(baseline))
+        current["operations"]["stats"]["p95_ms"] = 30.0
+        current["operations"]["stats"]["requests_per_second"] = 4.0
+        changes = {
+            (change.operation, change.metric): change
+            for change in compare_reports(baseline, current)
+        }
+        self.assertAlmostEqual(changes[("stats", "p95_ms")].relative, 0.5)
+        self.assertAlmostEqual(changes[("stats", "requests_per_second")].relative, 0.2)
+        self.assertEqual(
+            [
+                (change.operation, change.metric)
+                for change in regressions(list(changes.values()), 10)
+            ],
+            [("stats", "requests_per_second"), ("stats", "p95_ms")],
+        )
+
+    def test_compare_command(self) -> None:
+        """Test that compare_load_reports fails past --max-regression."""
+        report = build_report({"list": LoadResult(elapsed=1.0, latencies=[0.01] * 10)})
+        slower = json.loads(json.dumps(report))
+        slower["operations"]["list"]["p99_ms"] *= 2
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for name, data in (("baseline", report), ("current", slower)):
+                path = f"{directory}/{name}.json"
+                with open(path, "w") as output:
+                    json.dump(data, output)
+                paths.append(path)
+
+            stdout = StringIO()
+            call_command("compare_load_reports", *paths, stdout=stdout)
+            self.assertIn("+100.0%", stdout.getvalue())
+            with self.assertRaisesMessage(CommandError, "list p99_ms"):
+                call_command(
+                    "compare_load_reports", *paths, max_regression=50, stdout=StringIO()
+                )
+
+
+class TodoLoadTestCommandTests(LiveServerTestCase):
+    """Test the load_test command against a live server."""
+
+    def test_load_test(self) -> None:
+        """Test that every operation of the mix runs without errors."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/report.json"
+            call_command(
+                "load_test",
+                url=self.live_server_url,
+                duration=1.0,
+                connections=1,
+                output=path,
+                stdout=StringIO(),
+            )
+            with open(path) as report_file:
+                report = json.load(report_file)
+
+        self.assertEqual(report["target"], self.live_server_url)
+        self.assertEqual(report["total"]["errors"], 0)
+        self.assertGreater(report["total"]["requests"], 0)
+        self.assertLessEqual(
+            report["operations"].keys(), {op.name for op in OPERATIONS}
+        )
+        # The run found no items, so it created the ones it acts on.
+        self.assertGreaterEqual(TodoItem.objects.count(), 20)
+
+
+class TodoSeedTests(TestCase):
+    """Test cases for synthetic data generation and the seed_todos command."""
+
+    anchor = datetime(2026, 1, 1, tzinfo=UTC)
+
+    def test_generate_is_deterministic(self) -> None:
+        """Test that a spec always yields the same rows, and a seed changes them."""
+        spec = SeedSpec(count=BATCH_SIZE + 5, anchor=self.anchor)
+        rows = [row for batch in generate(spec) for row in batch]
+        self.assertEqual(len(rows), BATCH_SIZE + 5)
+        self.assertEqual(rows, [row for batch in generate(spec) for row in batch])
+        other = SeedSpec(count=BATCH_SIZE + 5, seed=1, anchor=self.anchor)
+        self.assertNotEqual(rows[:10], next(generate(other))[:10])
+
+    def test_generate_follows_distributions(self) -> None:
+        """Test that generated rows follow the spec's distributions."""
+        spec = SeedSpec(
+            count=BATCH_SIZE,
+            priority_weights={"low": 0.0, "medium": 1.0, "high": 3.0},
+            completed_ratio=0.2,
+            due_weights={"overdue": 1.0, "upcoming": 0.0, "none": 1.0},
+            due_days=10,
+            history_days=100,
+            description_ratio=0.5,
+            description_length=50,
+            anchor=self.anchor,
+        )
+        (rows,) = generate(spec)
+
+        def share(predicate: Any) -> float:
+            return sum(1 for row in rows if predicate(row)) / len(rows)
+
+        self.assertEqual(share(lambda row: row["priority"] == "low"), 0)
+        self.assertAlmostEqual(share(lambda row: row["priority"] == "high"), 0.75, 1)
+        self.assertAlmostEqual(share(lambda row: row["completed"]), 0.2, 1)
+        self.assertAlmostEqual(share(lambda row: row["due_date"] is None), 0.5, 1)
+        self.assertAlmostEqual(share(lambda row: row["description"]), 0.5, 1)
+        for row in rows:
+            if row["due_date"] is not None:
+                self.assertLessEqual(row["due_date"], self.anchor)
+                self.assertGreaterEqual(row["due_date"], self.anchor - timedelta(10))
+            self.assertLessEqual(len(row["description"] or ""), 50)
+            self.assertGreaterEqual(row["updated_at"], row["created_at"])
+        created = [row["created_at"] for row in rows]
+        self.assertEqual(created, sorted(created))
+        self.assertGreaterEqual(created[0], self.anchor - timedelta(100))
+        self.assertLessEqual(created[-1], self.anchor)
+
+    def test_seed_command(self) -> None:
+        """Test that seeded items keep counters, indexes and search working."""
+        indexes = self.schema()
+        out = StringIO()
+        call_command(
+            "seed_todos",
+            "--anchor",
+            self.anchor.isoformat(),
+            count=500,
+            completed_ratio=0.4,
+            priority_weights=["low=1", "high=1"],
+            stdout=out,
+        )
+        self.assertIn("Seeded 500 items", out.getvalue())
+
+        self.assertEqual(self.schema(), indexes)
+        self.assertEqual(TodoCounter.objects.reconcile(dry_run=True), {})
+        stats = TodoService.get_completion_stats()
+        self.assertEqual(stats["total"], 500)
+        self.assertEqual(
+            stats["completed"], TodoItem.objects.filter(completed=True).count()
+        )
+        self.assertEqual(TodoItem.objects.filter(priority="medium").count(), 0)
+        self.assertEqual(
+            TodoItem.objects.earliest("created_at").pk,
+            TodoItem.objects.earliest("pk").pk,
+        )
+        # Seeded items are indexed, and so are items written afterwards (the
+        # SQLite full-text trigger is back).
+        for item in (
+            TodoItem.objects.get(title__endswith=" #42"),
+            TodoItem.objects.create(title="Written after seeding"),
+        ):
+            response = self.client.get(
+                reverse("todo:todoitem-list"),
+                {"search": item.title, "search_mode": "fulltext"},
+            )
+            self.assertIn(
+                item.pk, [result["id"] for result in response.json()["results"]]
+            )
+
+    def test_seed_command_validates_weights(self) -> None:
+        """Test that unknown names and all-zero weights are rejected."""
+        with self.assertRaisesMessage(CommandError, "unknown name 'urgent'"):
+            call_command("seed_todos", count=1, priority_weights=["urgent=1"])
+        with self.assertRaisesMessage(CommandError, "at least one weight"):
+            call_command("seed_todos", count=1, due_weights=["none=0"])
+
+    def schema(self) -> dict[str, Any]:
+        """Return the todo table's columns and constraints, indexes included."""
+        table = TodoItem._meta.db_table
+        with connection.cursor() as cursor:
+            return {
+                "columns": connection.introspection.get_table_description(
+                    cursor, table
+                ),
+                "constraints": connection.introspection.get_constraints(cursor, table),
+            }
+
+
+class TodoArchivalTests(TestCase):
+    """Test cases for chunked archival and purge of completed items."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+        old = timezone.now() - timedelta(days=60)
+        self.items = TodoItem.objects.bulk_create(
+            TodoItem(title=f"Item {i}", completed=i % 4 != 3, priority="high")
+            for i in range(8)
+        )
+        # Items 0-5 are old; 3 of them (and 7) are incomplete.
+        TodoItem.objects.filter(pk__lte=self.items[5].pk).update(updated_at=old)
+
+    def assertCountersInSync(self) -> None:
+        """Assert that the counters match the todo table."""
+        self.assertEqual(TodoCounter.objects.reconcile(dry_run=True), {})
+
+    def test_archive_in_batches(self) -> None:
+        """Test that old completed items move to the archive batch by batch."""
+        batches: list[tuple[int, int]] = []
+        run = archive_completed(
+            TodoArchiveRun.ARCHIVE,
+            timezone.now() - timedelta(days=30),
+            batch_size=2,
+            progress=lambda run: batches.append((run.processed, run.last_pk)),
+        )
+
+        archived = [self.items[i] for i in (0, 1, 2, 4, 5)]
+        self.assertEqual(run.processed, 5)
+        self.assertIsNotNone(run.finished_at)
+        self.assertEqual(
+            batches,
+            [(2, archived[1].pk), (4, archived[3].pk), (5, archived[4].pk)],
+        )
+        self.assertEqual(
+            list(ArchivedTodoItem.objects.order_by("pk").values_list("pk", "title")),
+            [(item.pk, item.title) for item in archived],
+        )
+        self.assertEqual(
+            set(TodoItem.objects.values_list("pk", flat=True)),
+            {self.items[i].pk for i in (3, 6, 7)},
+        )
+        self.assertCountersInSync()
+
+    def test_api_runs_are_not_recorded(self) -> None:
+        """Test that the endpoint and services leave no run rows behind."""
+        response = self.client.delete(reverse("todo:todoitem-clear-completed"))
+        self.assertEqual(response.json()["deleted_count"], 6)
+        TodoItem.objects.filter(pk=self.items[3].pk).update(completed=True)
+        self.assertEqual(TodoService.bulk_delete_completed(), 1)
+        self.assertEqual(TodoService.archive_old_completed_items(), 0)
+        self.assertFalse(TodoArchiveRun.objects.exists())
+        self.assertCountersInSync()
+
+    def test_resume_interrupted_run(self) -> None:
+        """Test that a run stopped between batches resumes after the last one."""
+        run = start_run(TodoArchiveRun.ARCHIVE)
+
+        def interrupt(run: TodoArchiveRun) -> None:
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            process_run(run, batch_size=2, progress=interrupt)
+        run.refresh_from_db()
+        self.assertEqual((run.processed, run.finished_at), (2, None))
+        self.assertEqual(run.last_pk, self.items[1].pk)
+        # Completed after the run started: beyond its range.
+        TodoItem.objects.filter(pk=self.items[7].pk).update(completed=True)
+
+        out = StringIO()
+        call_command("archive_todos", "--resume", delay=0, stdout=out)
+        self.assertIn("Archived 6 completed items", out.getvalue())
+        self.assertEqual(ArchivedTodoItem.objects.count(), 6)
+        self.assertEqual(
+            set(TodoItem.objects.values_list("pk", flat=True)),
+            {self.items[3].pk, self.items[7].pk},
+        )
+        self.assertCountersInSync()
+
+        with self.assertRaisesMessage(CommandError, "no unfinished run"):
+            call_command("archive_todos", "--resume")
+
+    def test_purge_command(self) -> None:
+        """Test that --delete --all deletes every completed item without archiving."""
+        out = StringIO()
+        call_command(
+            "archive_todos", "--all", "--delete", batch_size=4, delay=0, stdout=out
+        )
+        self.assertIn("Deleted 6 completed items", out.getvalue())
+        self.assertFalse(TodoItem.objects.filter(completed=True).exists())
+        self.assertEqual(TodoItem.objects.count(), 2)
+        self.assertFalse(ArchivedTodoItem.objects.exists())
+        self.assertCountersInSync()
@@ -1,5 +1,7 @@
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
+from . import async_views
 from .views import TodoItemViewSet
 
 app_name = "todo"
@@ -8,6 +10,16 @@ app_name = "todo"
 router = DefaultRouter()
 router.register(r"items", TodoItemViewSet, basename="todoitem")
 
+# Async list/retrieve/stats, matched before the router's synchronous routes.
+async_urlpatterns = [
+    path("items/", async_views.item_list, name="todoitem-list"),
+    path("items/stats/", async_views.item_stats, name="todoitem-stats"),
+    re_path(
+        r"^items/(?P<pk>[0-9]+)/$", async_views.item_detail, name="todoitem-detail"
+    ),
+]
+
 urlpatterns = [
+    *(async_urlpatterns if settings.TODO_ASYNC_VIEWS else []),
     path("", include(router.urls)),
 ]
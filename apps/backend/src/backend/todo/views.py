@@ -1,43 +1,97 @@
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.request import Request
+from rest_framework.exceptions import UnsupportedMediaType, ValidationError
+from rest_framework.generics import get_object_or_404
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils.cache import add_never_cache_headers
+from django.utils.decorators import method_decorator
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
-from typing import Dict, Any, Optional
+from typing import Optional
 
-from .models import TodoItem
+from backend.mysite.timing import ServerTimingMixin
+
+from .archival import archive_completed
+from .autocomplete import autocomplete
+from .conditional import conditional_get
+from .export import EXPORT_FORMATS
+from .importer import IMPORT_FORMATS, import_items
+from .filters import TodoOrderingFilter, TodoSearchFilter
+from .models import TodoArchiveRun, TodoItem
+from .response_cache import cached_response
+from .pagination import TodoItemKeysetPagination, TodoItemPageNumberPagination
+from .stats import get_stats
 from .serializers import (
+    TodoItemRowSerializer,
+    TodoItemBulkCreateSerializer,
+    TodoItemBulkUpdateItemSerializer,
+    TodoItemBulkUpdateSerializer,
     TodoItemSerializer,
     TodoItemCreateSerializer,
     TodoItemUpdateSerializer,
 )
 
+IMPORT_CONTENT_TYPES = {
+    "application/x-ndjson": IMPORT_FORMATS["ndjson"],
+    "text/csv": IMPORT_FORMATS["csv"],
+}
+
+FILTER_PARAMETERS = [
+    OpenApiParameter(
+        name="completed",
+        type=OpenApiTypes.BOOL,
+        description="Filter by completion status",
+    ),
+    OpenApiParameter(
+        name="priority",
+        type=OpenApiTypes.STR,
+        description="Filter by priority (low, medium, high)",
+    ),
+    OpenApiParameter(
+        name="search",
+        type=OpenApiTypes.STR,
+        description="Search in title and description",
+    ),
+    OpenApiParameter(
+        name="search_mode",
+        type=OpenApiTypes.STR,
+        enum=["contains", "fulltext"],
+        description=(
+            "How to apply search. 'contains' matches substrings; 'fulltext' "
+            "uses the full-text index and orders results by relevance"
+        ),
+    ),
+]
+
 
 @extend_schema_view(
     list=extend_schema(
         description="List all todo items with filtering and search capabilities",
         parameters=[
+            *FILTER_PARAMETERS,
             OpenApiParameter(
-                name="completed",
-                type=OpenApiTypes.BOOL,
-                description="Filter by completion status",
-            ),
-            OpenApiParameter(
-                name="priority",
+                name="ordering",
                 type=OpenApiTypes.STR,
-                description="Filter by priority (low, medium, high)",
+                description="Order by field (prefix with - for descending)",
             ),
             OpenApiParameter(
-                name="search",
+                name="pagination",
                 type=OpenApiTypes.STR,
-                description="Search in title and description",
+                enum=["page", "cursor"],
+                description=(
+                    "Pagination mode. 'cursor' uses keyset pagination with "
+                    "opaque cursors and no count query"
+                ),
             ),
             OpenApiParameter(
-                name="ordering",
+                name="cursor",
                 type=OpenApiTypes.STR,
-                description="Order by field (prefix with - for descending)",
+                description="Opaque cursor returned by cursor pagination",
             ),
         ],
     ),
@@ -59,7 +113,7 @@ from .serializers import (
     ),
     destroy=extend_schema(description="Delete a todo item"),
 )
-class TodoItemViewSet(viewsets.ModelViewSet):
+class TodoItemViewSet(ServerTimingMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing TodoItem instances.
 
@@ -70,13 +124,30 @@ class TodoItemViewSet(viewsets.ModelViewSet):
     serializer_class = TodoItemSerializer
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        TodoSearchFilter,
+        TodoOrderingFilter,
     ]
     filterset_fields = ["completed", "priority"]
     search_fields = ["title", "description"]
     ordering_fields = ["created_at", "updated_at", "due_date", "priority", "title"]
     ordering = ["-created_at"]
+    pagination_class = TodoItemPageNumberPagination
+    cursor_pagination_class = TodoItemKeysetPagination
+
+    @property
+    def paginator(self):
+        """Use keyset pagination when the client opts into cursor mode."""
+        if not hasattr(self, "_paginator"):
+            request = getattr(self, "request", None)
+            query_params = request.query_params if request is not None else {}
+            if (
+                query_params.get("pagination") == "cursor"
+                or self.cursor_pagination_class.cursor_query_param in query_params
+            ):
+                self._paginator = self.cursor_pagination_class()
+            else:
+                return super().paginator
+        return self._paginator
 
     def get_serializer_class(self):
         """Return appropriate serializer class based on action."""
@@ -86,6 +157,36 @@ class TodoItemViewSet(viewsets.ModelViewSet):
             return TodoItemUpdateSerializer
         return TodoItemSerializer
 
+    @cached_response
+    @method_decorator(conditional_get)
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        """List todo items, or 304 if the client's copy is still current."""
+        if not settings.TODO_FAST_SERIALIZER:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *TodoItemRowSerializer.fields
+        )
+        page = self.paginate_queryset(queryset)
+        rows = TodoItemRowSerializer().serialize(page if page is not None else queryset)
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
+
+    @cached_response
+    @method_decorator(conditional_get)
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        """Get a todo item, or 304 if the client's copy is still current."""
+        if not settings.TODO_FAST_SERIALIZER:
+            return super().retrieve(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *TodoItemRowSerializer.fields
+        )
+        row = get_object_or_404(queryset, pk=kwargs[self.lookup_field])
+        self.check_object_permissions(request, row)
+        return Response(TodoItemRowSerializer().serialize([row])[0])
+
     def create(self, request: Request, *args, **kwargs) -> Response:
         """Create a new todo item and return full representation."""
         serializer = self.get_serializer(data=request.data)
@@ -96,6 +197,59 @@ class TodoItemViewSet(viewsets.ModelViewSet):
         response_serializer = TodoItemSerializer(instance)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
+    @extend_schema(
+        description=(
+            "Create many todo items in one request. The whole list is "
+            "validated first; if any item is invalid nothing is created and "
+            "the errors are returned keyed by the index of each invalid item"
+        ),
+        request=TodoItemCreateSerializer(many=True),
+        responses={201: TodoItemSerializer(many=True)},
+    )
+    @action(detail=False, methods=["post"])
+    def bulk_create(self, request: Request) -> Response:
+        """Validate and insert a list of todo items with batched INSERTs."""
+        serializer = TodoItemBulkCreateSerializer(
+            child=TodoItemCreateSerializer(),
+            data=request.data,
+            max_length=settings.TODO_BULK_MAX_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        instances = serializer.save()
+
+        response_serializer = TodoItemSerializer(instances, many=True)
+        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        description=(
+            "Partially update many todo items in one request. Each entry holds "
+            "the id of an item and the fields to change. The whole list is "
+            "validated first; if any entry is invalid nothing is updated and "
+            "the errors are returned keyed by the index of each invalid entry"
+        ),
+        request=TodoItemBulkUpdateItemSerializer(many=True),
+        responses={200: TodoItemSerializer(many=True)},
+    )
+    @action(detail=False, methods=["post"])
+    def bulk_update(self, request: Request) -> Response:
+        """Validate and apply a list of partial updates with CASE updates."""
+        ids = TodoItemBulkUpdateSerializer.requested_ids(
+            request.data, settings.TODO_BULK_MAX_ITEMS
+        )
+        with transaction.atomic():
+            instances = TodoItem.objects.select_for_update().in_bulk(ids)
+            serializer = TodoItemBulkUpdateSerializer(
+                instances,
+                child=TodoItemBulkUpdateItemSerializer(),
+                data=request.data,
+                partial=True,
+                max_length=settings.TODO_BULK_MAX_ITEMS,
+            )
+            serializer.is_valid(raise_exception=True)
+            items = serializer.save()
+
+        return Response(TodoItemSerializer(items, many=True).data)
+
     @extend_schema(
         description="Mark a todo item as completed",
         request=None,
@@ -125,7 +279,8 @@ class TodoItemViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @extend_schema(
-        description="Get statistics about todo items",
+        description="Get statistics about the todo items matching the filters",
+        parameters=FILTER_PARAMETERS,
         request=None,
         responses={
             200: {
@@ -148,25 +303,175 @@ class TodoItemViewSet(viewsets.ModelViewSet):
         },
     )
     @action(detail=False, methods=["get"])
+    @cached_response
+    @method_decorator(conditional_get)
     def stats(self, request: Request) -> Response:
-        """Get statistics about todo items."""
-        queryset = self.get_queryset()
-
-        stats_data: Dict[str, Any] = {
-            "total": queryset.count(),
-            "completed": queryset.filter(completed=True).count(),
-            "incomplete": queryset.filter(completed=False).count(),
-            "overdue": sum(
-                1 for item in queryset.filter(completed=False) if item.is_overdue
+        """Get statistics about the todo items matching the active filters."""
+        return Response(get_stats(self.filter_queryset(self.get_queryset())))
+
+    @extend_schema(
+        description=(
+            "Suggest todo titles matching the start of, or resembling, the "
+            "query. Returns only ids and titles and never paginates"
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                type=OpenApiTypes.STR,
+                description="Text typed so far",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                description="Maximum number of suggestions",
+            ),
+        ],
+        request=None,
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "results": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "integer"},
+                                "title": {"type": "string"},
+                            },
+                        },
+                    },
+                    "timed_out": {"type": "boolean"},
+                },
+            }
+        },
+    )
+    @action(detail=False, methods=["get"], filter_backends=[], pagination_class=None)
+    @cached_response
+    def autocomplete(self, request: Request) -> Response:
+        """Suggest titles for the query within the autocomplete time budget."""
+        query = request.query_params.get("q", "").strip()
+        limit = self.get_autocomplete_limit(request)
+        if len(query) < settings.TODO_AUTOCOMPLETE_MIN_LENGTH:
+            return Response({"results": [], "timed_out": False})
+
+        results = autocomplete(query, limit, settings.TODO_AUTOCOMPLETE_TIMEOUT_MS)
+        response = Response({"results": results or [], "timed_out": results is None})
+        if results is None:
+            # Never cache a lookup that was cut short.
+            add_never_cache_headers(response)
+        return response
+
+    @staticmethod
+    def get_autocomplete_limit(request: Request) -> int:
+        """Return the validated ``limit`` query parameter."""
+        raw_limit = request.query_params.get("limit")
+        if raw_limit is None:
+            return settings.TODO_AUTOCOMPLETE_LIMIT
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= settings.TODO_AUTOCOMPLETE_MAX_LIMIT:
+            raise ValidationError(
+                {
+                    "limit": [
+                        "Must be an integer between 1 and "
+                        f"{settings.TODO_AUTOCOMPLETE_MAX_LIMIT}."
+                    ]
+                }
+            )
+        return limit
+
+    @extend_schema(
+        description=(
+            "Stream every todo item matching the filters as NDJSON or CSV. "
+            "Results are not paginated"
+        ),
+        parameters=[
+            *FILTER_PARAMETERS,
+            OpenApiParameter(
+                name="ordering",
+                type=OpenApiTypes.STR,
+                description="Order by field (prefix with - for descending)",
             ),
-            "by_priority": {
-                "low": queryset.filter(priority="low").count(),
-                "medium": queryset.filter(priority="medium").count(),
-                "high": queryset.filter(priority="high").count(),
-            },
-        }
+            OpenApiParameter(
+                name="export_format",
+                type=OpenApiTypes.STR,
+                enum=[*EXPORT_FORMATS],
+                description="Output format (default ndjson)",
+            ),
+        ],
+        request=None,
+        responses={(200, "application/x-ndjson"): OpenApiTypes.STR},
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def export(self, request: Request) -> StreamingHttpResponse:
+        """Stream the filtered todo items without loading them into memory."""
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {"export_format": [f"Must be one of: {', '.join(EXPORT_FORMATS)}."]}
+            )
+        content_type, export = EXPORT_FORMATS[export_format]
+        queryset = self.filter_queryset(self.get_queryset())
 
-        return Response(stats_data)
+        response = StreamingHttpResponse(
+            export(queryset, settings.TODO_EXPORT_CHUNK_SIZE),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="todo-items.{export_format}"'
+        )
+        return response
+
+    @extend_schema(
+        description=(
+            "Import todo items from an NDJSON or CSV body, chosen by the "
+            "Content-Type. The body is parsed and written incrementally; "
+            "invalid rows are skipped and reported by line number"
+        ),
+        request={
+            "application/x-ndjson": OpenApiTypes.STR,
+            "text/csv": OpenApiTypes.STR,
+        },
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "created": {"type": "integer"},
+                    "rejected": {"type": "integer"},
+                    "errors": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "line": {"type": "integer"},
+                                "errors": {},
+                            },
+                        },
+                    },
+                    "elapsed_seconds": {"type": "number"},
+                    "rows_per_second": {"type": "number"},
+                },
+            }
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_items(self, request: Request) -> Response:
+        """Stream the request body into the todo table in batches."""
+        # The body is read directly rather than through request.data, so it is
+        # never buffered whole by a parser.
+        read = IMPORT_CONTENT_TYPES.get(request.content_type.split(";")[0].strip())
+        if read is None:
+            raise UnsupportedMediaType(request.content_type)
+
+        report = import_items(
+            read(request.stream or []),
+            batch_size=settings.TODO_IMPORT_BATCH_SIZE,
+            max_errors=settings.TODO_IMPORT_MAX_ERRORS,
+        )
+        return Response(report.as_dict())
 
     @extend_schema(
         description="Mark all incomplete todo items as completed",
@@ -207,8 +512,10 @@ class TodoItemViewSet(viewsets.ModelViewSet):
     )
     @action(detail=False, methods=["delete"])
     def clear_completed(self, request: Request) -> Response:
-        """Delete all completed todo items."""
-        deleted_count, _ = TodoItem.objects.filter(completed=True).delete()
+        """Delete all completed todo items, in batches."""
+        deleted_count = archive_completed(
+            TodoArchiveRun.DELETE, persist=False
+        ).processed
         return Response(
             {
                 "deleted_count": deleted_count,